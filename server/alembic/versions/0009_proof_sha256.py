@@ -0,0 +1,26 @@
+"""proof sha256
+
+Revision ID: 0009
+Revises: 0008
+Create Date: 2026-10-18
+
+Adds proofs.sha256 (hex digest computed while streaming direct uploads).
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "0009"
+down_revision = "0008"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column("proofs", sa.Column("sha256", sa.String(length=64), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column("proofs", "sha256")
@@ -0,0 +1,56 @@
+"""notification outbox
+
+Revision ID: 0010
+Revises: 0009
+Create Date: 2026-10-18
+
+Adds notification_outbox: durable delivery queue consumed by the
+notification worker (SELECT ... FOR UPDATE SKIP LOCKED).
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "0010"
+down_revision = "0009"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "notification_outbox",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("notification_id", sa.Integer(), nullable=False),
+        sa.Column("order_id", sa.Integer(), nullable=False),
+        sa.Column("is_fallback", sa.Boolean(), nullable=False, server_default=sa.false()),
+        sa.Column(
+            "status",
+            sa.Enum("PENDING", "PROCESSING", "DONE", "DEAD", name="outbox_status"),
+            nullable=False,
+            server_default="PENDING",
+        ),
+        sa.Column("attempts", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("max_attempts", sa.Integer(), nullable=False, server_default="4"),
+        sa.Column("next_attempt_at", sa.DateTime(timezone=True), nullable=False, server_default=sa.text("now()")),
+        sa.Column("locked_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("locked_by", sa.String(length=100), nullable=True),
+        sa.Column("last_error", sa.Text(), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=False, server_default=sa.text("now()")),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=True),
+        sa.ForeignKeyConstraint(["notification_id"], ["notifications.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["order_id"], ["orders.id"], ondelete="CASCADE"),
+    )
+    op.create_index("ix_notification_outbox_notification_id", "notification_outbox", ["notification_id"])
+    op.create_index("ix_notification_outbox_order_id", "notification_outbox", ["order_id"])
+    op.create_index("ix_notification_outbox_status_next", "notification_outbox", ["status", "next_attempt_at"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_notification_outbox_status_next", table_name="notification_outbox")
+    op.drop_index("ix_notification_outbox_order_id", table_name="notification_outbox")
+    op.drop_index("ix_notification_outbox_notification_id", table_name="notification_outbox")
+    op.drop_table("notification_outbox")
+    sa.Enum(name="outbox_status").drop(op.get_bind(), checkfirst=True)
@@ -0,0 +1,48 @@
+"""org daily stats rollup
+
+Revision ID: 0011
+Revises: 0010
+Create Date: 2026-10-18
+
+Adds org_daily_stats (per org, per KST day counters for dashboards).
+The table starts empty; populate it after upgrading with:
+
+    python scripts/rebuild_daily_stats.py
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "0011"
+down_revision = "0010"
+branch_labels = None
+depends_on = None
+
+_COUNTERS = (
+    "orders_created",
+    "orders_completed",
+    "proofs_uploaded",
+    "notifications_total",
+    "alimtalk_sent",
+    "alimtalk_failed",
+    "sms_sent",
+    "sms_failed",
+)
+
+
+def upgrade() -> None:
+    op.create_table(
+        "org_daily_stats",
+        sa.Column("organization_id", sa.Integer(), nullable=False),
+        sa.Column("day", sa.Date(), nullable=False),
+        *[sa.Column(name, sa.Integer(), nullable=False, server_default="0") for name in _COUNTERS],
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=True, server_default=sa.text("now()")),
+        sa.ForeignKeyConstraint(["organization_id"], ["organizations.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("organization_id", "day"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("org_daily_stats")
@@ -0,0 +1,28 @@
+"""keyset pagination indexes
+
+Revision ID: 0012
+Revises: 0011
+Create Date: 2026-10-18
+
+Composite indexes backing (created_at, id) keyset pagination of the admin
+order and notification listings.
+"""
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = "0012"
+down_revision = "0011"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index("ix_orders_org_created_id", "orders", ["organization_id", "created_at", "id"])
+    op.create_index("ix_notifications_created_id", "notifications", ["created_at", "id"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_notifications_created_id", table_name="notifications")
+    op.drop_index("ix_orders_org_created_id", table_name="orders")
@@ -0,0 +1,39 @@
+"""order search trigram index
+
+Revision ID: 0013
+Revises: 0012
+Create Date: 2026-10-18
+
+Enables pg_trgm and adds a GIN trigram index over the admin search document
+(see src/services/order_search.py; the expression must stay identical).
+"""
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = "0013"
+down_revision = "0012"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    op.execute(
+        """
+        CREATE INDEX ix_orders_search_trgm ON orders USING gin (
+            lower(
+                coalesce(order_number, '') || ' ' ||
+                coalesce(sender_name, '') || ' ' ||
+                coalesce(recipient_name, '') || ' ' ||
+                coalesce(context, '')
+            ) gin_trgm_ops
+        )
+        """
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS ix_orders_search_trgm")
+    # pg_trgm is left installed; other objects may depend on it.
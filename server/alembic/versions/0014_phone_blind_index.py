@@ -0,0 +1,38 @@
+"""phone blind index
+
+Revision ID: 0014
+Revises: 0013
+Create Date: 2026-10-18
+
+Adds HMAC blind-index columns for order phones and indexes
+notifications.phone_hash (new rows store the same keyed index there).
+Existing rows are populated after upgrading with:
+
+    python scripts/backfill_phone_index.py
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "0014"
+down_revision = "0013"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column("orders", sa.Column("sender_phone_index", sa.String(length=64), nullable=True))
+    op.add_column("orders", sa.Column("recipient_phone_index", sa.String(length=64), nullable=True))
+    op.create_index("ix_orders_sender_phone_index", "orders", ["sender_phone_index"])
+    op.create_index("ix_orders_recipient_phone_index", "orders", ["recipient_phone_index"])
+    op.create_index("ix_notifications_phone_hash", "notifications", ["phone_hash"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_notifications_phone_hash", table_name="notifications")
+    op.drop_index("ix_orders_recipient_phone_index", table_name="orders")
+    op.drop_index("ix_orders_sender_phone_index", table_name="orders")
+    op.drop_column("orders", "recipient_phone_index")
+    op.drop_column("orders", "sender_phone_index")
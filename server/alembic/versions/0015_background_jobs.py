@@ -0,0 +1,60 @@
+"""background jobs
+
+Revision ID: 0015
+Revises: 0014
+Create Date: 2026-10-18
+
+Adds background_jobs: long-running admin jobs (order CSV exports) processed
+by the job worker (SELECT ... FOR UPDATE SKIP LOCKED).
+"""
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = "0015"
+down_revision = "0014"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "background_jobs",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("organization_id", sa.Integer(), nullable=False),
+        sa.Column("kind", sa.Enum("ORDER_EXPORT", name="job_kind"), nullable=False),
+        sa.Column(
+            "status",
+            sa.Enum("PENDING", "RUNNING", "DONE", "FAILED", name="job_status"),
+            nullable=False,
+            server_default="PENDING",
+        ),
+        sa.Column("params", postgresql.JSONB(), nullable=True),
+        sa.Column("created_by", sa.String(length=200), nullable=True),
+        sa.Column("processed_rows", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("total_rows", sa.Integer(), nullable=True),
+        sa.Column("result", postgresql.JSONB(), nullable=True),
+        sa.Column("file_key", sa.String(length=500), nullable=True),
+        sa.Column("error", sa.Text(), nullable=True),
+        sa.Column("attempts", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("locked_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("locked_by", sa.String(length=100), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=False, server_default=sa.text("now()")),
+        sa.Column("started_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("finished_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=True),
+        sa.ForeignKeyConstraint(["organization_id"], ["organizations.id"], ondelete="CASCADE"),
+    )
+    op.create_index("ix_background_jobs_organization_id", "background_jobs", ["organization_id"])
+    op.create_index("ix_background_jobs_status_created", "background_jobs", ["status", "created_at"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_background_jobs_status_created", table_name="background_jobs")
+    op.drop_index("ix_background_jobs_organization_id", table_name="background_jobs")
+    op.drop_table("background_jobs")
+    sa.Enum(name="job_status").drop(op.get_bind(), checkfirst=True)
+    sa.Enum(name="job_kind").drop(op.get_bind(), checkfirst=True)
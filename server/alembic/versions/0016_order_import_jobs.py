@@ -0,0 +1,29 @@
+"""order import jobs
+
+Revision ID: 0016
+Revises: 0015
+Create Date: 2026-10-18
+
+Adds ORDER_IMPORT to job_kind: CSV uploads staged in storage and imported in
+committed batches by the job worker.
+"""
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = "0016"
+down_revision = "0015"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # ALTER TYPE ... ADD VALUE cannot run inside a transaction block on PG < 12
+    with op.get_context().autocommit_block():
+        op.execute("ALTER TYPE job_kind ADD VALUE IF NOT EXISTS 'ORDER_IMPORT'")
+
+
+def downgrade() -> None:
+    # PostgreSQL cannot drop enum values; just remove the jobs that use it
+    op.execute("DELETE FROM background_jobs WHERE kind = 'ORDER_IMPORT'")
@@ -0,0 +1,43 @@
+"""unique order number per organization
+
+Revision ID: 0017
+Revises: 0016
+Create Date: 2026-10-18
+
+Unique index on orders (organization_id, order_number): the conflict target
+of upsert CSV imports, and a guard against duplicate orders from re-run
+imports. Existing duplicates must be resolved first; the upgrade refuses to
+run (and lists a few) rather than guessing which order to keep.
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "0017"
+down_revision = "0016"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    duplicates = op.get_bind().execute(sa.text(
+        "SELECT organization_id, order_number, count(*) AS n FROM orders "
+        "GROUP BY organization_id, order_number HAVING count(*) > 1 "
+        "ORDER BY n DESC LIMIT 10"
+    )).all()
+    if duplicates:
+        sample = ", ".join(f"org {r.organization_id} #{r.order_number} x{r.n}" for r in duplicates)
+        raise RuntimeError(f"Duplicate order numbers must be merged or renumbered first: {sample}")
+
+    op.create_index(
+        "uq_orders_org_order_number",
+        "orders",
+        ["organization_id", "order_number"],
+        unique=True,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("uq_orders_org_order_number", table_name="orders")
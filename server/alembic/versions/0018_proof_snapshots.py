@@ -0,0 +1,33 @@
+"""public proof snapshots
+
+Revision ID: 0018
+Revises: 0017
+Create Date: 2026-10-18
+
+Adds qr_tokens.proof_snapshot_key (storage key of the published public proof
+JSON) and the PROOF_SNAPSHOTS job kind that republishes them after a
+branding change.
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "0018"
+down_revision = "0017"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column("qr_tokens", sa.Column("proof_snapshot_key", sa.String(length=500), nullable=True))
+    # ALTER TYPE ... ADD VALUE cannot run inside a transaction block on PG < 12
+    with op.get_context().autocommit_block():
+        op.execute("ALTER TYPE job_kind ADD VALUE IF NOT EXISTS 'PROOF_SNAPSHOTS'")
+
+
+def downgrade() -> None:
+    # PostgreSQL cannot drop enum values; just remove the jobs that use it
+    op.execute("DELETE FROM background_jobs WHERE kind = 'PROOF_SNAPSHOTS'")
+    op.drop_column("qr_tokens", "proof_snapshot_key")
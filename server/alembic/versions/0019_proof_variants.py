@@ -0,0 +1,33 @@
+"""proof image variants
+
+Revision ID: 0019
+Revises: 0018
+Create Date: 2026-10-18
+
+Adds proofs.variants (storage keys of the thumbnail / medium copies) and the
+PROOF_VARIANTS job kind that renders them after an upload.
+"""
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = "0019"
+down_revision = "0018"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column("proofs", sa.Column("variants", postgresql.JSONB(), nullable=True))
+    # ALTER TYPE ... ADD VALUE cannot run inside a transaction block on PG < 12
+    with op.get_context().autocommit_block():
+        op.execute("ALTER TYPE job_kind ADD VALUE IF NOT EXISTS 'PROOF_VARIANTS'")
+
+
+def downgrade() -> None:
+    # PostgreSQL cannot drop enum values; just remove the jobs that use it
+    op.execute("DELETE FROM background_jobs WHERE kind = 'PROOF_VARIANTS'")
+    op.drop_column("proofs", "variants")
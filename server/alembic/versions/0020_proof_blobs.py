@@ -0,0 +1,39 @@
+"""content-addressed proof blobs
+
+Revision ID: 0020
+Revises: 0019
+Create Date: 2026-10-18
+
+Adds proof_blobs: one row per distinct proof file (SHA-256), with the
+number of proofs referencing it. Proofs uploaded before this revision keep
+their own files and have no blob row. Indexes proofs.sha256 for the
+variant job, which reuses the variants of an identical earlier upload.
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "0020"
+down_revision = "0019"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "proof_blobs",
+        sa.Column("sha256", sa.String(length=64), primary_key=True),
+        sa.Column("file_key", sa.String(length=500), nullable=False),
+        sa.Column("file_size", sa.Integer(), nullable=False),
+        sa.Column("mime_type", sa.String(length=50), nullable=True),
+        sa.Column("ref_count", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=True),
+    )
+    op.create_index("ix_proofs_sha256", "proofs", ["sha256"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_proofs_sha256", table_name="proofs")
+    op.drop_table("proof_blobs")
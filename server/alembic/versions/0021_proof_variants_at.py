@@ -0,0 +1,29 @@
+"""proof variants timestamp
+
+Revision ID: 0021
+Revises: 0020
+Create Date: 2026-10-18
+
+Adds proofs.variants_at, set whenever the variant job stores a proof's
+variants, so the public pages' Last-Modified moves when thumbnail / medium
+URLs appear. Existing rows stay NULL (their variants predate any cached
+response that could still be revalidated against them).
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "0021"
+down_revision = "0020"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column("proofs", sa.Column("variants_at", sa.DateTime(timezone=True), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column("proofs", "variants_at")
@@ -0,0 +1,43 @@
+#!/usr/bin/env python3
+"""
+Backfill phone blind indexes (orders.*_phone_index, notifications.phone_hash).
+
+Run once after applying migration 0014. Safe to re-run: only rows without an
+index are touched, one commit per batch.
+
+Usage:
+    cd server
+    python scripts/backfill_phone_index.py                  # everything
+    python scripts/backfill_phone_index.py --org 3          # one organization
+    python scripts/backfill_phone_index.py --batch-size 1000
+"""
+import argparse
+import sys
+from pathlib import Path
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.core.database import SessionLocal
+from src.services.phone_index_service import PhoneIndexService
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Backfill phone blind indexes")
+    parser.add_argument("--org", type=int, default=None, help="organization id (default: all)")
+    parser.add_argument("--batch-size", type=int, default=500, help="orders per transaction")
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        stats = PhoneIndexService(db).backfill(batch_size=args.batch_size, organization_id=args.org)
+        print(f"phone index backfilled: {stats['orders']} order(s), {stats['notifications']} notification(s)")
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,38 @@
+#!/usr/bin/env python3
+"""
+Delete proof blobs (and their variant images) no longer referenced by any proof.
+
+Deleting an order only decrements proof_blobs.ref_count; run this
+periodically (e.g. nightly cron) to reclaim the storage.
+
+Usage:
+    cd server
+    python scripts/gc_proof_blobs.py
+    python scripts/gc_proof_blobs.py --batch-size 500
+"""
+import argparse
+import sys
+from pathlib import Path
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.core.database import SessionLocal
+from src.services.proof_blob_service import collect_garbage
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Garbage-collect unreferenced proof blobs")
+    parser.add_argument("--batch-size", type=int, default=100, help="blobs deleted per transaction")
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        removed = collect_garbage(db, batch_size=args.batch_size)
+        print(f"proof blobs removed: {removed}")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
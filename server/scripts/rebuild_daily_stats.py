@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+"""
+Backfill / rebuild the org_daily_stats rollup from raw tables.
+
+Run once after applying migration 0011, and any time the rollup is suspected
+to have drifted (e.g. after manual SQL edits).
+
+Usage:
+    cd server
+    python scripts/rebuild_daily_stats.py                      # everything
+    python scripts/rebuild_daily_stats.py --org 3              # one organization
+    python scripts/rebuild_daily_stats.py --start 2026-01-01 --end 2026-01-31
+"""
+import argparse
+import sys
+from datetime import date
+from pathlib import Path
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.core.database import SessionLocal
+from src.services.daily_stats_service import DailyStatsService
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Rebuild org_daily_stats")
+    parser.add_argument("--org", type=int, default=None, help="organization id (default: all)")
+    parser.add_argument("--start", type=date.fromisoformat, default=None, help="first KST day (YYYY-MM-DD)")
+    parser.add_argument("--end", type=date.fromisoformat, default=None, help="last KST day (YYYY-MM-DD)")
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        written = DailyStatsService(db).rebuild(
+            organization_id=args.org,
+            start_date=args.start,
+            end_date=args.end,
+        )
+        db.commit()
+        print(f"org_daily_stats rebuilt: {written} row(s)")
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
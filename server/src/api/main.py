@@ -1,3 +1,4 @@
+import asyncio
 import logging
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
@@ -8,6 +9,10 @@ from slowapi.errors import RateLimitExceeded
 import os
 
 from src.core.config import settings
+from src.core.database import AsyncSessionLocal, async_engine
+from src.integrations.messaging.factory import close_providers, init_providers
+from src.services.lookup_guard import build_lookup_guards
+from src.services.short_link_service import flush_clicks, run_click_flusher
 from src.utils.rate_limiter import limiter
 from src.api.routes import public_router, admin_router
 
@@ -106,6 +111,50 @@ app.include_router(public_router, prefix=API_PREFIX)
 app.include_router(admin_router, prefix=API_PREFIX)
 
 
+@app.on_event("startup")
+async def _init_messaging_providers() -> None:
+    init_providers()
+
+
+@app.on_event("startup")
+async def _build_lookup_guards() -> None:
+    await build_lookup_guards(AsyncSessionLocal)
+
+
+@app.on_event("startup")
+async def _start_click_flusher() -> None:
+    app.state.click_flusher = asyncio.create_task(
+        run_click_flusher(AsyncSessionLocal, settings.SHORT_LINK_CLICK_FLUSH_SECONDS)
+    )
+
+
+@app.on_event("shutdown")
+async def _stop_click_flusher() -> None:
+    # Registered before engine disposal: the final flush still needs the pool
+    task = getattr(app.state, "click_flusher", None)
+    if task is not None:
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+    try:
+        async with AsyncSessionLocal() as db:
+            await flush_clicks(db)
+    except Exception as e:
+        logger.warning(f"Final short link click flush failed: {e}")
+
+
+@app.on_event("shutdown")
+async def _dispose_async_engine() -> None:
+    await async_engine.dispose()
+
+
+@app.on_event("shutdown")
+async def _close_messaging_providers() -> None:
+    await close_providers()
+
+
 @app.get("/")
 def read_root():
     """Root endpoint - health check."""
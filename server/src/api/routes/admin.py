@@ -1,13 +1,17 @@
 from datetime import date
-from fastapi import APIRouter, BackgroundTasks, Depends, Query, HTTPException, UploadFile, File
+from fastapi import APIRouter, Depends, Query, HTTPException, UploadFile, File
 from fastapi.responses import StreamingResponse
-import csv
-import io
 from sqlalchemy.orm import Session
 from typing import List
 
 from src.api.deps import AuthContext, get_auth_context, get_db
 from src.services.admin_service import AdminService
+from src.services.export_service import ExportService
+from src.services.import_service import ImportService
+from src.services.job_service import JobService
+from src.services.order_import import IMPORT_MODES, iter_csv_rows
+from src.services.phone_index_service import PhoneIndexService
+from src.services.storage_service import FileTooLargeError
 from src.schemas.admin import (
     OrganizationCreate,
     OrganizationUpdate,
@@ -21,6 +25,9 @@ from src.schemas.admin import (
     OrderUpdate,
     NotificationListOut,
     NotificationStats,
+    PhoneLookupIn,
+    PhoneLookupOut,
+    JobOut,
     BulkTokenRequest,
     BulkTokenResponse,
     AnalyticsOut,
@@ -123,6 +130,10 @@ def list_orders(
     end_date: date | None = Query(default=None, description="End date (YYYY-MM-DD)"),
     page: int = Query(default=1, ge=1),
     limit: int = Query(default=50, ge=1, le=100),
+    mode: str = Query(default="offset", pattern="^(offset|cursor)$", description="offset: page-based, cursor: keyset (use next_cursor)"),
+    cursor: str | None = Query(default=None, description="next_cursor from the previous page (mode=cursor)"),
+    total: str = Query(default="exact", pattern="^(exact|cached|estimate|none)$", description="How to compute total"),
+    sort: str = Query(default="recent", pattern="^(recent|relevance)$", description="relevance: rank q matches (mode=offset only)"),
     db: Session = Depends(get_db),
     ctx: AuthContext = Depends(get_auth_context),
 ):
@@ -138,6 +149,10 @@ def list_orders(
         end_date=end_date,
         page=page,
         limit=limit,
+        pagination=mode,
+        cursor=cursor,
+        total_mode=total,
+        sort=sort,
     )
 
 
@@ -145,6 +160,7 @@ def list_orders(
 def import_orders_csv(
     file: UploadFile = File(...),
     strict: bool = Query(default=False),
+    mode: str = Query(default="insert", description="insert | upsert | skip (existing order numbers)"),
     db: Session = Depends(get_db),
     ctx: AuthContext = Depends(get_auth_context),
 ):
@@ -157,6 +173,10 @@ def import_orders_csv(
       - sender_phone (or buyer_phone)
       - recipient_name (or receiver_name) (optional)
       - recipient_phone (or receiver_phone) (optional)
+
+    Order numbers are unique per organization. mode=upsert updates existing
+    orders whose fields changed, mode=skip leaves them alone; either way
+    re-running the same file creates no duplicates.
     """
 
     if ctx.organization_id is None:
@@ -165,28 +185,58 @@ def import_orders_csv(
     if not file.filename or not file.filename.lower().endswith(".csv"):
         raise HTTPException(status_code=400, detail="CSV_FILE_REQUIRED")
 
-    raw = file.file.read()
-    try:
-        text = raw.decode("utf-8-sig")
-    except Exception:
-        # allow cp949 in KR field ops
-        text = raw.decode("cp949", errors="replace")
-
-    reader = csv.DictReader(io.StringIO(text))
-    rows: list[dict] = []
-    for r in reader:
-        # normalize keys to snake_lower
-        nr = {str(k).strip().lower(): (v.strip() if isinstance(v, str) else v) for k, v in (r or {}).items()}
-        rows.append(nr)
-
-    created_ids, errors = AdminService(db).import_orders_csv(rows=rows, organization_id=ctx.organization_id, strict=strict)
+    # Parsed incrementally (UTF-8, or CP949 for KR field ops) and inserted in batches
+    rows = iter_csv_rows(file.file)
+    result = AdminService(db).import_orders_csv(
+        rows=rows, organization_id=ctx.organization_id, strict=strict, mode=mode
+    )
     return {
-        "created_count": len(created_ids),
-        "created_order_ids": created_ids,
-        "errors": errors,
+        "created_count": len(result.created_ids),
+        "created_order_ids": result.created_ids,
+        "updated_count": len(result.updated_ids),
+        "updated_order_ids": result.updated_ids,
+        "unchanged_count": result.unchanged,
+        "errors": result.errors,
     }
 
 
+@router.post("/orders/import/jobs", response_model=JobOut, status_code=202)
+def enqueue_orders_import(
+    file: UploadFile = File(...),
+    strict: bool = Query(default=False),
+    mode: str = Query(default="insert", description="insert | upsert | skip (existing order numbers)"),
+    db: Session = Depends(get_db),
+    ctx: AuthContext = Depends(get_auth_context),
+):
+    """Queue a CSV import (same columns as /orders/import/csv) for the job worker.
+
+    Poll GET /admin/jobs/{id}: processed_rows / total_rows, and result holds
+    created / updated / unchanged / error counts and the row error report.
+    Strict imports insert nothing unless every row is valid.
+    """
+    if ctx.organization_id is None:
+        raise HTTPException(status_code=403, detail="ORG_REQUIRED")
+
+    if not file.filename or not file.filename.lower().endswith(".csv"):
+        raise HTTPException(status_code=400, detail="CSV_FILE_REQUIRED")
+
+    if mode not in IMPORT_MODES:
+        raise HTTPException(status_code=400, detail="INVALID_IMPORT_MODE")
+
+    try:
+        job = ImportService(db).enqueue_order_import(
+            organization_id=ctx.organization_id,
+            file=file.file,
+            filename=file.filename,
+            strict=strict,
+            mode=mode,
+            created_by=ctx.sub,
+        )
+    except FileTooLargeError as e:
+        raise HTTPException(status_code=413, detail=f"CSV_FILE_TOO_LARGE: max {e.max_size} bytes")
+    return JobService.to_out(job)
+
+
 @router.post("/orders", response_model=OrderOut)
 def create_order(
     payload: OrderCreate,
@@ -218,13 +268,12 @@ def issue_order_token(
 
 
 @router.post("/orders/{order_id}/notify")
-async def resend_notification(
+def resend_notification(
     order_id: int,
-    background_tasks: BackgroundTasks,
     db: Session = Depends(get_db),
     ctx: AuthContext = Depends(get_auth_context),
 ):
-    return await AdminService(db).resend_notification(order_id, background_tasks, scope_org_id=ctx.organization_id)
+    return AdminService(db).resend_notification(order_id, scope_org_id=ctx.organization_id)
 
 
 @router.post("/orders/labels", response_model=list[LabelOut])
@@ -289,6 +338,9 @@ def list_notifications(
     channel: str | None = Query(default=None, description="ALIMTALK, SMS"),
     start_date: date | None = Query(default=None, description="Start date (YYYY-MM-DD)"),
     end_date: date | None = Query(default=None, description="End date (YYYY-MM-DD)"),
+    mode: str = Query(default="offset", pattern="^(offset|cursor)$", description="offset: page-based, cursor: keyset (use next_cursor)"),
+    cursor: str | None = Query(default=None, description="next_cursor from the previous page (mode=cursor)"),
+    total: str = Query(default="exact", pattern="^(exact|cached|estimate|none)$", description="How to compute total"),
     db: Session = Depends(get_db),
     ctx: AuthContext = Depends(get_auth_context),
 ):
@@ -303,6 +355,9 @@ def list_notifications(
         channel=channel,
         start_date=start_date,
         end_date=end_date,
+        pagination=mode,
+        cursor=cursor,
+        total_mode=total,
     )
 
 
@@ -323,6 +378,19 @@ def get_notification_stats(
     )
 
 
+@router.post("/lookup/phone", response_model=PhoneLookupOut)
+def lookup_phone(
+    payload: PhoneLookupIn,
+    db: Session = Depends(get_db),
+    ctx: AuthContext = Depends(get_auth_context),
+):
+    """Find orders and notifications for a phone number (blind-index lookup)."""
+    try:
+        return PhoneIndexService(db).lookup(payload.phone, organization_id=ctx.organization_id)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e)) from e  # PHONE_REQUIRED / INVALID_PHONE
+
+
 @router.post("/orders/bulk-tokens", response_model=BulkTokenResponse)
 def bulk_generate_tokens(
     payload: BulkTokenRequest,
@@ -357,15 +425,23 @@ def export_orders_csv(
     if ctx.organization_id is None:
         raise HTTPException(status_code=403, detail="ORG_REQUIRED")
 
-    csv_data = AdminService(db).export_orders_csv(
+    chunks = AdminService(db).iter_orders_csv(
         organization_id=ctx.organization_id,
         status=status,
         start_date=start_date,
         end_date=end_date,
     )
 
+    def stream():
+        # The body is produced after the endpoint returns; release the
+        # connection ourselves once the last chunk has been sent.
+        try:
+            yield from chunks
+        finally:
+            db.close()
+
     return StreamingResponse(
-        iter([csv_data]),
+        stream(),
         media_type="text/csv",
         headers={
             "Content-Disposition": f"attachment; filename=orders_{date.today().isoformat()}.csv"
@@ -373,6 +449,63 @@ def export_orders_csv(
     )
 
 
+@router.post("/orders/export/jobs", response_model=JobOut, status_code=202)
+def enqueue_orders_export(
+    status: str | None = Query(default=None),
+    start_date: date | None = Query(default=None, description="Start date (YYYY-MM-DD)"),
+    end_date: date | None = Query(default=None, description="End date (YYYY-MM-DD)"),
+    db: Session = Depends(get_db),
+    ctx: AuthContext = Depends(get_auth_context),
+):
+    """Queue a CSV export for the job worker; poll GET /admin/jobs/{id} for the download URL."""
+    if ctx.organization_id is None:
+        raise HTTPException(status_code=403, detail="ORG_REQUIRED")
+    job = ExportService(db).enqueue_order_export(
+        organization_id=ctx.organization_id,
+        status=status,
+        start_date=start_date,
+        end_date=end_date,
+        created_by=ctx.sub,
+    )
+    return JobService.to_out(job)
+
+
+@router.get("/jobs/{job_id}", response_model=JobOut)
+def get_job(
+    job_id: int,
+    db: Session = Depends(get_db),
+    ctx: AuthContext = Depends(get_auth_context),
+):
+    job = JobService(db).get(job_id, organization_id=ctx.organization_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="JOB_NOT_FOUND")
+    return JobService.to_out(job)
+
+
+@router.get("/jobs/{job_id}/download")
+def download_job_file(
+    job_id: int,
+    db: Session = Depends(get_db),
+    ctx: AuthContext = Depends(get_auth_context),
+):
+    """Stream a finished export's CSV (private storage; never a public URL)."""
+    f, filename = JobService(db).open_download(job_id, organization_id=ctx.organization_id)
+
+    def iter_file():
+        with f:
+            while chunk := f.read(64 * 1024):
+                yield chunk
+
+    return StreamingResponse(
+        iter_file(),
+        media_type="text/csv; charset=utf-8",
+        headers={
+            "Content-Disposition": f'attachment; filename="{filename}"',
+            "Cache-Control": "private, no-store",
+        },
+    )
+
+
 @router.get("/analytics", response_model=AnalyticsOut)
 def get_analytics(
     start_date: date | None = Query(default=None, description="Start date (YYYY-MM-DD)"),
@@ -394,9 +527,8 @@ def get_analytics(
 
 
 @router.post("/orders/reminders", response_model=ReminderResponse)
-async def send_reminders(
+def send_reminders(
     payload: ReminderRequest,
-    background_tasks: BackgroundTasks,
     db: Session = Depends(get_db),
     ctx: AuthContext = Depends(get_auth_context),
 ):
@@ -408,22 +540,23 @@ async def send_reminders(
     """
     if ctx.organization_id is None:
         raise HTTPException(status_code=403, detail="ORG_REQUIRED")
-    return await AdminService(db).send_reminders(
+    return AdminService(db).send_reminders(
         organization_id=ctx.organization_id,
         order_ids=payload.order_ids,
         hours_since_token=payload.hours_since_token,
         max_reminders=payload.max_reminders,
-        background_tasks=background_tasks,
     )
 
 
 @router.get("/orders/pending-reminders")
 def get_pending_reminders(
     hours_since_token: int = Query(default=24, description="Token issued > N hours ago"),
+    page: int = Query(default=1, ge=1),
+    limit: int = Query(default=100, ge=1, le=500),
     db: Session = Depends(get_db),
     ctx: AuthContext = Depends(get_auth_context),
 ):
-    """Get list of orders that could receive reminders.
+    """Get list of orders that could receive reminders (paged).
 
     Returns orders that:
     - Have token issued but no proof uploaded
@@ -434,4 +567,6 @@ def get_pending_reminders(
     return AdminService(db).get_pending_reminders(
         organization_id=ctx.organization_id,
         hours_since_token=hours_since_token,
+        page=page,
+        limit=limit,
     )
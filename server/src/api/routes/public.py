@@ -1,19 +1,21 @@
 import logging
 from typing import Optional
-from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Request, BackgroundTasks
+from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Request, Response
 from fastapi.responses import RedirectResponse
 from pydantic import BaseModel
-from sqlalchemy.orm import Session
-from starlette.status import HTTP_404_NOT_FOUND, HTTP_422_UNPROCESSABLE_ENTITY
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.status import HTTP_304_NOT_MODIFIED, HTTP_404_NOT_FOUND, HTTP_422_UNPROCESSABLE_ENTITY
 
-from src.core.database import get_db
+from src.core.database import get_async_db
 from src.core.config import settings
-from src.services.token_service import TokenService
-from src.services.proof_service import ProofService
-from src.services.short_link_service import ShortLinkService
-from src.services.storage_service import StorageService
-from src.schemas import PublicOrderSummary, ProofUploadResponse, PublicProofResponse, ProofItem
+from src.services.token_service import AsyncTokenService
+from src.services.proof_service import AsyncProofService
+from src.services.proof_snapshot_service import public_proof_response
+from src.services.short_link_service import AsyncShortLinkService
+from src.services.storage_service import FileTooLargeError, StorageService
+from src.schemas import PublicOrderSummary, ProofUploadResponse, PublicProofResponse
 from src.models import ProofType
+from src.utils.http_cache import cache_headers, is_not_modified, strong_etag
 from src.utils.rate_limiter import limiter, get_rate_limit
 
 logger = logging.getLogger(__name__)
@@ -36,42 +38,55 @@ class PresignedUploadResponse(BaseModel):
 
 router = APIRouter(prefix="/public", tags=["public"])
 
+_FILE_TOO_LARGE_DETAIL = (
+    f"UPLOAD_FAILED: File too large. Maximum size is {settings.UPLOAD_MAX_FILE_SIZE // (1024 * 1024)}MB."
+)
+
+# Cache-Control per endpoint. The upload landing page flips as soon as a
+# proof arrives and short links count clicks, so both always revalidate
+# (cheap: 304 on a matching ETag); the proof page may be reused briefly.
+_ORDER_CACHE_CONTROL = "private, no-cache"
+_PROOF_CACHE_CONTROL = "public, max-age=60, must-revalidate"
+_SHORT_LINK_CACHE_CONTROL = "private, no-cache"
+
 
 @router.get("/order/{token}", response_model=PublicOrderSummary)
 @limiter.limit(get_rate_limit())
 async def get_order_by_token(
     request: Request,
+    response: Response,
     token: str,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """
     Get order summary by QR token.
     This is the landing page for proof upload flow.
     Rate limited to prevent brute-force attacks.
     """
-    token_service = TokenService(db)
-    order = token_service.get_order_by_token(token)
+    token_service = AsyncTokenService(db)
+    resolved = await token_service.resolve(token)
 
-    if not order:
+    if not resolved or not resolved.is_valid:
         logger.warning(f"Invalid token access attempt: {token[:8]}...")
         raise HTTPException(
             status_code=HTTP_404_NOT_FOUND,
             detail="TOKEN_INVALID",
         )
 
-    # Check proof status
-    has_before = any(p.proof_type == ProofType.BEFORE for p in order.proofs)
-    has_after = any(p.proof_type == ProofType.AFTER for p in order.proofs)
+    headers = cache_headers(_ORDER_CACHE_CONTROL, resolved.etag, resolved.last_modified)
+    if is_not_modified(request, resolved.etag, resolved.last_modified):
+        return Response(status_code=HTTP_304_NOT_MODIFIED, headers=headers)
+    response.headers.update(headers)
 
     return PublicOrderSummary(
-        order_number=order.order_number,
-        context=order.context,
-        organization_name=(order.organization.brand_name or order.organization.name),
-        organization_logo=(order.organization.brand_logo_url or order.organization.logo_url),
-        hide_saegim=bool(order.organization.hide_saegim),
-        asset_meta=order.asset_meta,
-        has_before_proof=has_before,
-        has_after_proof=has_after,
+        order_number=resolved.order_number,
+        context=resolved.context,
+        organization_name=resolved.organization_name,
+        organization_logo=resolved.organization_logo,
+        hide_saegim=resolved.hide_saegim,
+        asset_meta=resolved.asset_meta,
+        has_before_proof=resolved.has_proof_type(ProofType.BEFORE.value),
+        has_after_proof=resolved.has_proof_type(ProofType.AFTER.value),
     )
 
 
@@ -81,7 +96,7 @@ async def get_presigned_upload(
     request: Request,
     token: str,
     body: PresignedUploadRequest,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """
     Get presigned URL for client-side upload.
@@ -93,11 +108,11 @@ async def get_presigned_upload(
     3. Client uploads directly to S3 using the presigned URL
     4. Client calls /proof/{token}/confirm with the file_key
     """
-    # Validate token
-    token_service = TokenService(db)
-    order = token_service.get_order_by_token(token)
+    # Validate token (cached snapshot; /confirm re-validates against the DB)
+    token_service = AsyncTokenService(db)
+    resolved = await token_service.resolve(token)
 
-    if not order:
+    if not resolved or not resolved.is_valid:
         logger.warning(f"Invalid token for presigned upload: {token[:8]}...")
         raise HTTPException(
             status_code=HTTP_404_NOT_FOUND,
@@ -116,7 +131,7 @@ async def get_presigned_upload(
     presigned = storage.create_presigned_upload(
         filename=body.filename,
         content_type=body.content_type,
-        folder=f"proofs/{order.id}",
+        folder=f"proofs/{resolved.order_id}",
     )
 
     # Build confirm URL
@@ -143,15 +158,14 @@ async def confirm_upload(
     request: Request,
     token: str,
     body: ConfirmUploadRequest,
-    background_tasks: BackgroundTasks,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """
     Confirm that client-side upload is complete.
     Creates proof record and triggers notifications.
     """
-    token_service = TokenService(db)
-    order = token_service.get_order_by_token(token)
+    token_service = AsyncTokenService(db)
+    order = await token_service.get_order_by_token(token)
 
     if not order:
         raise HTTPException(
@@ -168,13 +182,12 @@ async def confirm_upload(
         )
 
     # Create proof record
-    proof_service = ProofService(db)
+    proof_service = AsyncProofService(db)
     try:
         result = await proof_service.create_proof_from_key(
-            order=order,
+            token=token,
             file_key=body.file_key,
             proof_type=body.proof_type,
-            background_tasks=background_tasks,
         )
         logger.info(f"{body.proof_type.value} proof confirmed for token {token[:8]}...")
         return ProofUploadResponse(
@@ -196,10 +209,9 @@ async def confirm_upload(
 async def upload_proof(
     request: Request,
     token: str,
-    background_tasks: BackgroundTasks,
     file: UploadFile = File(...),
     proof_type: ProofType = ProofType.AFTER,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """
     Upload proof image with type (BEFORE, AFTER, RECEIPT, DAMAGE, OTHER).
@@ -214,25 +226,20 @@ async def upload_proof(
             detail="UPLOAD_FAILED: Invalid file type. Only images are allowed.",
         )
 
-    # Check file size (10MB limit)
-    file_size = 0
-    contents = await file.read()
-    file_size = len(contents)
-    await file.seek(0)  # Reset file position
-
-    if file_size > 10 * 1024 * 1024:  # 10MB
+    # Cheap early reject when the multipart part size is already known.
+    # The authoritative limit is enforced while streaming (see StorageService.save_upload).
+    if file.size is not None and file.size > settings.UPLOAD_MAX_FILE_SIZE:
         raise HTTPException(
             status_code=HTTP_422_UNPROCESSABLE_ENTITY,
-            detail="UPLOAD_FAILED: File too large. Maximum size is 10MB.",
+            detail=_FILE_TOO_LARGE_DETAIL,
         )
 
-    proof_service = ProofService(db)
+    proof_service = AsyncProofService(db)
 
     try:
         result = await proof_service.create_proof(
             token=token,
             file=file,
-            background_tasks=background_tasks,
             proof_type=proof_type,
         )
         logger.info(f"{proof_type.value} proof uploaded successfully for token {token[:8]}...")
@@ -242,6 +249,11 @@ async def upload_proof(
             proof_type=result["proof_type"],
             message=result["message"],
         )
+    except FileTooLargeError:
+        raise HTTPException(
+            status_code=HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=_FILE_TOO_LARGE_DETAIL,
+        )
     except ValueError as e:
         logger.warning(f"Token validation failed: {token[:8]}... - {e}")
         raise HTTPException(
@@ -266,43 +278,46 @@ async def upload_proof(
 @limiter.limit(get_rate_limit())
 async def get_proof(
     request: Request,
+    response: Response,
     token: str,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """
     Get proof data for public proof page.
     Shows proof photo with minimal order context (no PII).
+    With PROOF_SNAPSHOT_REDIRECT, redirects to the published snapshot.
     Rate limited.
     """
-    token_service = TokenService(db)
-    proof_data = token_service.get_proof_by_token(token)
+    resolved = await AsyncTokenService(db).resolve(token)
+    if resolved and resolved.proof_snapshot_key and settings.PROOF_SNAPSHOT_REDIRECT:
+        # Published snapshot: let the bucket / CDN serve the same body
+        return RedirectResponse(url=StorageService().get_file_url(resolved.proof_snapshot_key), status_code=307)
 
-    if not proof_data:
+    if not resolved or not resolved.proofs:
         raise HTTPException(
             status_code=HTTP_404_NOT_FOUND,
             detail="TOKEN_INVALID",
         )
 
-    return PublicProofResponse(
-        order_number=proof_data["order_number"],
-        context=proof_data["context"],
-        organization_name=proof_data["organization_name"],
-        organization_logo=proof_data["organization_logo"],
-        hide_saegim=proof_data.get("hide_saegim", False),
-        asset_meta=proof_data.get("asset_meta"),
-        proofs=[ProofItem(**p) for p in proof_data["proofs"]],
-        # Backward compatibility
-        proof_url=proof_data.get("proof_url"),
-        uploaded_at=proof_data.get("uploaded_at"),
-    )
+    if not StorageService().stable_urls:
+        # Body carries presigned file URLs: never let a client revalidate it
+        response.headers["Cache-Control"] = "private, no-store"
+        return public_proof_response(resolved)
+
+    headers = cache_headers(_PROOF_CACHE_CONTROL, resolved.etag, resolved.last_modified)
+    if is_not_modified(request, resolved.etag, resolved.last_modified):
+        return Response(status_code=HTTP_304_NOT_MODIFIED, headers=headers)
+    response.headers.update(headers)
+    return public_proof_response(resolved)
 
 
 @router.get("/s/{code}")
 @limiter.limit(get_rate_limit())
 async def resolve_short(
     request: Request,
+    response: Response,
     code: str,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """Resolve short code to canonical public proof URL.
 
@@ -313,7 +328,7 @@ async def resolve_short(
     if not code:
         raise HTTPException(status_code=HTTP_422_UNPROCESSABLE_ENTITY, detail="SHORT_CODE_REQUIRED")
 
-    link = ShortLinkService(db).resolve(code)
+    link = await AsyncShortLinkService(db).resolve(code)
     if not link:
         raise HTTPException(status_code=HTTP_404_NOT_FOUND, detail="SHORT_NOT_FOUND")
 
@@ -332,4 +347,10 @@ async def resolve_short(
     if "text/html" in accept and "application/json" not in accept:
         return RedirectResponse(url=target_url, status_code=302)
 
+    # The target depends on the request host, so it is part of the ETag
+    etag = strong_etag(target_url)
+    headers = {**cache_headers(_SHORT_LINK_CACHE_CONTROL, etag), "Vary": "Accept, Host, X-Forwarded-Host"}
+    if is_not_modified(request, etag):
+        return Response(status_code=HTTP_304_NOT_MODIFIED, headers=headers)
+    response.headers.update(headers)
     return {"target_url": target_url}
@@ -1,14 +1,18 @@
 from .config import settings
-from .database import Base, get_db, engine, SessionLocal
-from .security import encrypt_phone, decrypt_phone, hash_phone
+from .database import Base, get_db, get_async_db, engine, async_engine, SessionLocal, AsyncSessionLocal
+from .security import encrypt_phone, decrypt_phone, hash_phone, phone_blind_index
 
 __all__ = [
     "settings",
     "Base",
     "get_db",
+    "get_async_db",
     "engine",
+    "async_engine",
     "SessionLocal",
+    "AsyncSessionLocal",
     "encrypt_phone",
     "decrypt_phone",
     "hash_phone",
+    "phone_blind_index",
 ]
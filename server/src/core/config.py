@@ -18,6 +18,10 @@ class Settings(BaseSettings):
     POSTGRES_USER: str = "postgres"
     POSTGRES_PASSWORD: str = "postgres"
 
+    # Async pool (public router, asyncpg)
+    DB_ASYNC_POOL_SIZE: int = 10
+    DB_ASYNC_MAX_OVERFLOW: int = 20
+
     # Security - Development defaults (MUST be overridden in production)
     JWT_SECRET: Optional[str] = None
     JWT_EXPIRES_MIN: int = 60
@@ -89,6 +93,8 @@ class Settings(BaseSettings):
     # Storage
     STORAGE_DRIVER: str = "local"  # "local" or "s3"
     LOCAL_UPLOAD_DIR: str = "data/uploads"
+    LOCAL_PRIVATE_DIR: str = "data/private"  # Exports / staged imports (never served by /uploads)
+    UPLOAD_MAX_FILE_SIZE: int = 10 * 1024 * 1024  # 10MB (direct proof uploads)
 
     # S3 Configuration (when STORAGE_DRIVER=s3)
     S3_BUCKET: str | None = None
@@ -99,10 +105,53 @@ class Settings(BaseSettings):
     S3_PRESIGNED_URL_EXPIRES: int = 300  # 5 minutes
     S3_MAX_FILE_SIZE: int = 10 * 1024 * 1024  # 10MB
     S3_CDN_URL: str | None = None  # Optional CDN URL for serving files
+    # Exports / staged imports (phone numbers): defaults to S3_BUCKET; never via
+    # the CDN, only presigned or through the API. Use a separate bucket, or keep
+    # exports/ and imports/ outside the CDN origin.
+    S3_PRIVATE_BUCKET: str | None = None
 
     # Token
     TOKEN_LENGTH: int = 12
 
+    # Token resolution cache (public QR endpoints, in-process per worker)
+    # TTL bounds how long branding/proof changes from another worker may stay stale.
+    TOKEN_CACHE_TTL_SECONDS: float = 30.0  # 0 disables the cache
+    TOKEN_CACHE_MAX_ENTRIES: int = 10000
+
+    # Short link resolution (/s/{code}): cached per worker, clicks counted in
+    # memory and written as one batched UPDATE per flush interval
+    SHORT_LINK_CACHE_TTL_SECONDS: float = 60.0  # 0 disables the cache
+    SHORT_LINK_CACHE_MAX_ENTRIES: int = 10000
+    SHORT_LINK_CLICK_FLUSH_SECONDS: float = 5.0  # clicks lost on a worker crash at most
+
+    # Public lookup guard: per-worker Bloom filter of issued tokens / short codes
+    # plus a negative cache, so guessed keys are rejected without a query
+    LOOKUP_GUARD_ENABLED: bool = True
+    LOOKUP_GUARD_MIN_CAPACITY: int = 100000  # sized for 2x the rows at startup
+    LOOKUP_GUARD_ERROR_RATE: float = 0.001
+    LOOKUP_GUARD_SYNC_SECONDS: float = 1.0  # min interval between catch-up queries
+    LOOKUP_GUARD_SYNC_LOOKBACK_SECONDS: float = 60.0  # catch-up re-reads ids this old (late commits)
+    NEGATIVE_CACHE_TTL_SECONDS: float = 30.0  # 0 disables the cache
+    NEGATIVE_CACHE_MAX_ENTRIES: int = 50000
+
+    # Public proof snapshots: /public/proof/{token} JSON published to storage
+    # (immutable, content-hashed key) on proof upload / branding change
+    PROOF_SNAPSHOT_ENABLED: bool = True
+    PROOF_SNAPSHOT_REDIRECT: bool = False  # 307 to the stored JSON (needs CORS on the bucket/CDN)
+
+    # Proof image variants (rendered by the job worker after each upload)
+    PROOF_VARIANTS_ENABLED: bool = True
+    PROOF_VARIANT_FORMAT: str = "webp"  # webp | jpeg
+    PROOF_VARIANT_QUALITY: int = 80
+    PROOF_THUMBNAIL_SIZE: int = 320  # longest edge, px
+    PROOF_MEDIUM_SIZE: int = 1280  # longest edge, px
+
+    # Dashboard rollup (org_daily_stats), maintained on every ORM flush
+    STATS_ROLLUP_ENABLED: bool = True  # False: dashboards aggregate raw tables
+
+    # Admin list totals (total=cached): exact COUNT(*) memoized per filter set
+    LIST_TOTAL_CACHE_TTL_SECONDS: float = 60.0  # 0 disables the cache
+
     # Rate Limiting
     PUBLIC_TOKEN_RATE_LIMIT_PER_MIN: int = 60
 
@@ -110,6 +159,26 @@ class Settings(BaseSettings):
     NOTIFICATION_MAX_RETRIES: int = 3
     NOTIFICATION_RETRY_DELAY_SECONDS: float = 1.0  # Base delay, will be exponentially increased
 
+    # Notification outbox worker (python -m src.workers.notification_worker)
+    NOTIFICATION_WORKER_CONCURRENCY: int = 8  # Max in-flight provider calls per worker process
+    NOTIFICATION_WORKER_BATCH_SIZE: int = 50  # Jobs claimed per poll
+    NOTIFICATION_WORKER_POLL_SECONDS: float = 1.0  # Idle sleep between polls
+    NOTIFICATION_OUTBOX_LOCK_TIMEOUT_SECONDS: int = 300  # Reclaim PROCESSING jobs from crashed workers
+
+    # Background job worker (python -m src.workers.job_worker): exports, imports, proof snapshots / variants
+    JOB_WORKER_KINDS: str = ""  # Comma-separated job kinds this worker claims, e.g. PROOF_VARIANTS,PROOF_SNAPSHOTS (empty = all)
+    JOB_WORKER_POLL_SECONDS: float = 2.0  # Idle sleep between polls
+    JOB_LOCK_TIMEOUT_SECONDS: int = 1800  # Reclaim RUNNING jobs from crashed workers
+    JOB_MAX_ATTEMPTS: int = 3  # Crashed/reclaimed runs before FAILED
+    EXPORT_CHUNK_ROWS: int = 1000  # Rows fetched / decrypted per chunk
+    EXPORT_DECRYPT_PROCESSES: int = 0  # Process pool for phone encrypts/decrypts (0 = CPU count)
+    EXPORT_RETENTION_HOURS: int = 24  # Export files (and abandoned staged imports) deleted after this
+
+    # CSV order import
+    IMPORT_BATCH_SIZE: int = 1000  # Rows validated/encrypted and inserted per batch (one INSERT, one commit)
+    IMPORT_MAX_FILE_SIZE: int = 50 * 1024 * 1024  # 50MB (import jobs stage the upload in storage)
+    IMPORT_ERROR_REPORT_LIMIT: int = 1000  # Row errors kept in an import job's report
+
     # Messaging
     # mock: no real sending, only DB log
     # kakao_i_connect: AlimTalk via Kakao i Connect Message API (Bearer token)
@@ -145,6 +214,13 @@ class Settings(BaseSettings):
     SENS_SMS_CONTENT_TYPE: str = "COMM"  # COMM | AD
     SENS_SMS_COUNTRY_CODE: str = "82"
 
+    # Provider HTTP connection pool (shared per process, keep-alive)
+    MESSAGING_HTTP_TIMEOUT_SECONDS: float = 10.0
+    MESSAGING_HTTP_MAX_CONNECTIONS: int = 20
+    MESSAGING_HTTP_MAX_KEEPALIVE: int = 10
+    MESSAGING_HTTP_KEEPALIVE_EXPIRY_SECONDS: float = 30.0
+    MESSAGING_HTTP2: bool = False  # requires the `h2` package (httpx[http2])
+
     # If AlimTalk fails, optionally send SMS fallback (requires SENS config)
     FALLBACK_SMS_ENABLED: bool = True
 
@@ -157,6 +233,10 @@ class Settings(BaseSettings):
     def DATABASE_URL(self) -> str:
         return f"postgresql://{self.POSTGRES_USER}:{self.POSTGRES_PASSWORD}@{self.POSTGRES_HOST}:{self.POSTGRES_PORT}/{self.POSTGRES_DB}"
 
+    @property
+    def ASYNC_DATABASE_URL(self) -> str:
+        return f"postgresql+asyncpg://{self.POSTGRES_USER}:{self.POSTGRES_PASSWORD}@{self.POSTGRES_HOST}:{self.POSTGRES_PORT}/{self.POSTGRES_DB}"
+
     class Config:
         env_file = ".env"
         env_file_encoding = "utf-8"
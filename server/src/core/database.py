@@ -1,6 +1,7 @@
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker, declarative_base
-from typing import Generator
+from typing import AsyncGenerator, Generator
 
 from .config import settings
 
@@ -17,6 +18,22 @@ SessionLocal = sessionmaker(
     bind=engine,
 )
 
+# Async engine (asyncpg) for the public QR path. Queries await on the event loop
+# instead of blocking it, so concurrent scans are limited by pool size, not by
+# one in-flight query per worker.
+async_engine = create_async_engine(
+    settings.ASYNC_DATABASE_URL,
+    pool_pre_ping=True,
+    pool_size=settings.DB_ASYNC_POOL_SIZE,
+    max_overflow=settings.DB_ASYNC_MAX_OVERFLOW,
+)
+
+AsyncSessionLocal = async_sessionmaker(
+    bind=async_engine,
+    autoflush=False,
+    expire_on_commit=False,  # avoid implicit lazy refresh (not allowed in async)
+)
+
 Base = declarative_base()
 
 
@@ -27,3 +44,9 @@ def get_db() -> Generator:
         yield db
     finally:
         db.close()
+
+
+async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
+    """Dependency for getting an async DB session (public router)."""
+    async with AsyncSessionLocal() as db:
+        yield db
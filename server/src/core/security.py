@@ -1,5 +1,6 @@
 import base64
 import hashlib
+import hmac
 import re
 from typing import Optional
 from functools import lru_cache
@@ -106,6 +107,49 @@ def hash_phone(phone: str) -> str:
     return hashlib.sha256(phone.encode()).hexdigest()
 
 
+@lru_cache(maxsize=1)
+def _blind_index_key() -> bytes:
+    """HMAC key for phone blind indexes, derived from ENCRYPTION_KEY (own context)."""
+    kdf = PBKDF2HMAC(
+        algorithm=hashes.SHA256(),
+        length=32,
+        salt=_derive_salt("phone_index"),
+        iterations=100000,
+    )
+    return kdf.derive(settings.ENCRYPTION_KEY.encode())
+
+
+@lru_cache(maxsize=1)
+def short_code_key() -> bytes:
+    """HMAC key for the short-link code permutation, derived from ENCRYPTION_KEY (own context)."""
+    kdf = PBKDF2HMAC(
+        algorithm=hashes.SHA256(),
+        length=32,
+        salt=_derive_salt("short_code"),
+        iterations=100000,
+    )
+    return kdf.derive(settings.ENCRYPTION_KEY.encode())
+
+
+def phone_blind_index(phone: str) -> str:
+    """
+    Keyed HMAC-SHA256 of an E.164 phone number for equality lookups.
+
+    Unlike hash_phone, the digest cannot be brute-forced over the (small)
+    phone number space without the key. Callers must normalize first so
+    the same number always yields the same index.
+
+    Args:
+        phone: E.164 format phone number
+
+    Returns:
+        HMAC-SHA256 as hex string ("" for empty input)
+    """
+    if not phone:
+        return ""
+    return hmac.new(_blind_index_key(), phone.encode(), hashlib.sha256).hexdigest()
+
+
 def normalize_phone(raw: str, default_country: str = "KR") -> str:
     """Normalize phone number into E.164.
 
@@ -3,11 +3,17 @@ from __future__ import annotations
 from abc import ABC, abstractmethod
 from typing import Optional
 
-from .types import SendResult
+from .types import SendResult, SmsMessage
 
 
 class MessagingProvider(ABC):
     name: str
+    # Max recipients per send_sms_batch call (1 = no native batching)
+    max_batch_size: int = 1
+
+    async def aclose(self) -> None:
+        """Release pooled connections (called on shutdown)."""
+        return None
 
     @abstractmethod
     async def send_alimtalk(
@@ -32,3 +38,16 @@ class MessagingProvider(ABC):
         from_no: Optional[str] = None,
     ) -> SendResult:
         raise NotImplementedError
+
+    async def send_sms_batch(
+        self,
+        *,
+        messages: list[SmsMessage],
+        from_no: Optional[str] = None,
+    ) -> list[SendResult]:
+        """Send up to max_batch_size SMS in one provider call.
+
+        Returns one SendResult per message, in order. Raises if the call fails
+        (the whole batch is treated as failed). Default: one call per message.
+        """
+        return [await self.send_sms(phone=m.phone, content=m.content, from_no=from_no) for m in messages]
@@ -1,5 +1,8 @@
 from __future__ import annotations
 
+import logging
+from typing import Optional
+
 from src.core.config import settings
 
 from .base import MessagingProvider
@@ -7,39 +10,85 @@ from .kakao_i_connect import KakaoIConnectProvider
 from .mock import MockMessagingProvider
 from .naver_sens_sms import NaverSensSmsProvider
 
+logger = logging.getLogger(__name__)
 
-def get_primary_provider() -> MessagingProvider:
+# Process-wide singletons: each real provider owns a keep-alive connection pool.
+_primary_provider: Optional[MessagingProvider] = None
+_sms_provider: Optional[MessagingProvider] = None
+
+
+def _build_sens_provider() -> NaverSensSmsProvider:
+    return NaverSensSmsProvider(
+        base_url=settings.SENS_BASE_URL,
+        access_key=settings.SENS_ACCESS_KEY,
+        secret_key=settings.SENS_SECRET_KEY,
+        service_id=settings.SENS_SMS_SERVICE_ID,
+        from_no=settings.SENS_SMS_FROM,
+        country_code=settings.SENS_SMS_COUNTRY_CODE,
+        content_type=settings.SENS_SMS_CONTENT_TYPE,
+        timeout_s=settings.MESSAGING_HTTP_TIMEOUT_SECONDS,
+    )
+
+
+def _build_primary_provider() -> MessagingProvider:
     p = (settings.MESSAGING_PROVIDER or "mock").strip().lower()
 
     if p == "mock":
         return MockMessagingProvider()
 
     if p in {"kakao", "kakao_i_connect", "kakaoiconnect"}:
-        return KakaoIConnectProvider(settings.KAKAOI_BASE_URL, settings.KAKAOI_ACCESS_TOKEN)
+        return KakaoIConnectProvider(
+            settings.KAKAOI_BASE_URL,
+            settings.KAKAOI_ACCESS_TOKEN,
+            timeout_s=settings.MESSAGING_HTTP_TIMEOUT_SECONDS,
+        )
 
     if p in {"sens_sms", "sens"}:
-        return NaverSensSmsProvider(
-            base_url=settings.SENS_BASE_URL,
-            access_key=settings.SENS_ACCESS_KEY,
-            secret_key=settings.SENS_SECRET_KEY,
-            service_id=settings.SENS_SMS_SERVICE_ID,
-            from_no=settings.SENS_SMS_FROM,
-            country_code=settings.SENS_SMS_COUNTRY_CODE,
-            content_type=settings.SENS_SMS_CONTENT_TYPE,
-        )
+        return _build_sens_provider()
 
     # unknown -> safe default
     return MockMessagingProvider()
 
 
+def get_primary_provider() -> MessagingProvider:
+    """Configured primary provider (singleton)."""
+    global _primary_provider
+    if _primary_provider is None:
+        _primary_provider = _build_primary_provider()
+    return _primary_provider
+
+
 def get_sms_provider() -> MessagingProvider:
-    """Dedicated SMS provider for fallback (SENS)."""
-    return NaverSensSmsProvider(
-        base_url=settings.SENS_BASE_URL,
-        access_key=settings.SENS_ACCESS_KEY,
-        secret_key=settings.SENS_SECRET_KEY,
-        service_id=settings.SENS_SMS_SERVICE_ID,
-        from_no=settings.SENS_SMS_FROM,
-        country_code=settings.SENS_SMS_COUNTRY_CODE,
-        content_type=settings.SENS_SMS_CONTENT_TYPE,
-    )
+    """Dedicated SMS provider for fallback (SENS, singleton)."""
+    global _sms_provider
+    if _sms_provider is None:
+        _sms_provider = _build_sens_provider()
+    return _sms_provider
+
+
+def init_providers() -> None:
+    """Build provider singletons up front (app/worker startup).
+
+    Config errors are logged, not raised: they surface per message as CONFIG_MISSING.
+    """
+    if (settings.MESSAGING_PROVIDER or "mock").strip().lower() == "mock":
+        return
+    try:
+        get_primary_provider()
+    except Exception as e:
+        logger.warning(f"Primary messaging provider not initialised: {e}")
+    if settings.FALLBACK_SMS_ENABLED:
+        try:
+            get_sms_provider()
+        except Exception as e:
+            logger.warning(f"SMS fallback provider not initialised: {e}")
+
+
+async def close_providers() -> None:
+    """Close pooled HTTP connections (app/worker shutdown)."""
+    global _primary_provider, _sms_provider
+    for provider in (_primary_provider, _sms_provider):
+        if provider is not None:
+            await provider.aclose()
+    _primary_provider = None
+    _sms_provider = None
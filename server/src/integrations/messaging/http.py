@@ -0,0 +1,33 @@
+from __future__ import annotations
+
+import logging
+
+import httpx
+
+from src.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+def build_http_client(timeout_s: float | None = None) -> httpx.AsyncClient:
+    """Long-lived AsyncClient with a keep-alive pool (one per provider instance).
+
+    Reusing it avoids a TCP+TLS handshake per message. HTTP/2 is used when
+    MESSAGING_HTTP2 is on and `h2` is installed; otherwise HTTP/1.1.
+    """
+    limits = httpx.Limits(
+        max_connections=settings.MESSAGING_HTTP_MAX_CONNECTIONS,
+        max_keepalive_connections=settings.MESSAGING_HTTP_MAX_KEEPALIVE,
+        keepalive_expiry=settings.MESSAGING_HTTP_KEEPALIVE_EXPIRY_SECONDS,
+    )
+    timeout = httpx.Timeout(timeout_s if timeout_s is not None else settings.MESSAGING_HTTP_TIMEOUT_SECONDS)
+
+    http2 = settings.MESSAGING_HTTP2
+    if http2:
+        try:
+            import h2  # noqa: F401
+        except ImportError:
+            logger.warning("MESSAGING_HTTP2 is enabled but 'h2' is not installed; using HTTP/1.1")
+            http2 = False
+
+    return httpx.AsyncClient(timeout=timeout, limits=limits, http2=http2)
@@ -6,6 +6,7 @@ import httpx
 
 from .base import MessagingProvider
 from .errors import ConfigMissingError, ProviderHTTPError, ProviderRejectedError
+from .http import build_http_client
 from .types import SendResult
 
 
@@ -23,12 +24,32 @@ class KakaoIConnectProvider(MessagingProvider):
 
     name = "kakao_i_connect"
 
-    def __init__(self, base_url: str | None, access_token: str | None, *, timeout_s: float = 10.0):
+    def __init__(
+        self,
+        base_url: str | None,
+        access_token: str | None,
+        *,
+        timeout_s: float = 10.0,
+        client: httpx.AsyncClient | None = None,
+    ):
         if not base_url or not access_token:
             raise ConfigMissingError("Kakao i Connect config missing", details="KAKAOI_BASE_URL or KAKAOI_ACCESS_TOKEN")
         self.base_url = base_url.rstrip("/")
         self.access_token = access_token
         self.timeout_s = timeout_s
+        # Shared keep-alive pool; created lazily so construction stays cheap
+        self._client = client
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        if self._client is None or self._client.is_closed:
+            self._client = build_http_client(self.timeout_s)
+        return self._client
+
+    async def aclose(self) -> None:
+        if self._client is not None and not self._client.is_closed:
+            await self._client.aclose()
+        self._client = None
 
     async def send_alimtalk(
         self,
@@ -64,8 +85,7 @@ class KakaoIConnectProvider(MessagingProvider):
             "content-type": "application/json",
         }
 
-        async with httpx.AsyncClient(timeout=self.timeout_s) as client:
-            r = await client.post(url, headers=headers, json=payload)
+        r = await self.client.post(url, headers=headers, json=payload)
 
         if r.status_code >= 400:
             raise ProviderHTTPError(r.status_code, "Kakao i Connect HTTP error", details=r.text)
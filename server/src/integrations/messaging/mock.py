@@ -4,11 +4,12 @@ import uuid
 from typing import Optional
 
 from .base import MessagingProvider
-from .types import SendResult
+from .types import SendResult, SmsMessage
 
 
 class MockMessagingProvider(MessagingProvider):
     name = "mock"
+    max_batch_size = 100
 
     async def send_alimtalk(
         self,
@@ -31,3 +32,15 @@ class MockMessagingProvider(MessagingProvider):
         from_no: Optional[str] = None,
     ) -> SendResult:
         return SendResult(request_id=f"mock-{uuid.uuid4().hex[:12]}", raw={"ok": True, "mode": "mock", "phone": phone})
+
+    async def send_sms_batch(
+        self,
+        *,
+        messages: list[SmsMessage],
+        from_no: Optional[str] = None,
+    ) -> list[SendResult]:
+        request_id = f"mock-{uuid.uuid4().hex[:12]}"
+        return [
+            SendResult(request_id=request_id, raw={"ok": True, "mode": "mock", "phone": m.phone, "batch": len(messages)})
+            for m in messages
+        ]
@@ -4,13 +4,15 @@ import base64
 import hashlib
 import hmac
 import time
-from typing import Optional
+from collections import Counter
+from typing import Any, Optional
 
 import httpx
 
 from .base import MessagingProvider
 from .errors import ConfigMissingError, ProviderHTTPError, ProviderRejectedError
-from .types import SendResult
+from .http import build_http_client
+from .types import SendResult, SmsMessage
 
 
 def _sens_signature(secret_key: str, method: str, url_path: str, timestamp_ms: str, access_key: str) -> str:
@@ -25,6 +27,7 @@ class NaverSensSmsProvider(MessagingProvider):
     """NAVER Cloud SENS SMS provider."""
 
     name = "sens_sms"
+    max_batch_size = 100  # SENS limit per request
 
     def __init__(
         self,
@@ -37,6 +40,7 @@ class NaverSensSmsProvider(MessagingProvider):
         timeout_s: float = 10.0,
         country_code: str = "82",
         content_type: str = "COMM",
+        client: httpx.AsyncClient | None = None,
     ):
         if not access_key or not secret_key or not service_id or not from_no:
             raise ConfigMissingError(
@@ -51,8 +55,21 @@ class NaverSensSmsProvider(MessagingProvider):
         self.timeout_s = timeout_s
         self.country_code = country_code
         self.content_type = content_type
+        # Shared keep-alive pool; created lazily so construction stays cheap
+        self._client = client
 
-    async def send_sms(self, *, phone: str, content: str, from_no: Optional[str] = None) -> SendResult:
+    @property
+    def client(self) -> httpx.AsyncClient:
+        if self._client is None or self._client.is_closed:
+            self._client = build_http_client(self.timeout_s)
+        return self._client
+
+    async def aclose(self) -> None:
+        if self._client is not None and not self._client.is_closed:
+            await self._client.aclose()
+        self._client = None
+
+    async def _post_messages(self, *, content: str, messages: list[dict], from_no: Optional[str]) -> Any:
         url_path = f"/sms/v2/services/{self.service_id}/messages"
         url = f"{self.base_url}{url_path}"
 
@@ -72,11 +89,10 @@ class NaverSensSmsProvider(MessagingProvider):
             "countryCode": self.country_code,
             "from": (from_no or self.from_no),
             "content": content,
-            "messages": [{"to": phone}],
+            "messages": messages,
         }
 
-        async with httpx.AsyncClient(timeout=self.timeout_s) as client:
-            r = await client.post(url, headers=headers, json=payload)
+        r = await self.client.post(url, headers=headers, json=payload)
 
         if r.status_code >= 400:
             raise ProviderHTTPError(r.status_code, "SENS SMS HTTP error", details=r.text)
@@ -87,9 +103,42 @@ class NaverSensSmsProvider(MessagingProvider):
         if isinstance(data, dict) and str(data.get("statusCode", "")).startswith(("4", "5")):
             raise ProviderRejectedError("PROVIDER_REJECTED", "SENS rejected request", details=str(data))
 
+        return data
+
+    async def send_sms(self, *, phone: str, content: str, from_no: Optional[str] = None) -> SendResult:
+        data = await self._post_messages(content=content, messages=[{"to": phone}], from_no=from_no)
         request_id = data.get("requestId") if isinstance(data, dict) else None
         return SendResult(request_id=request_id, raw=data)
 
+    async def send_sms_batch(
+        self,
+        *,
+        messages: list[SmsMessage],
+        from_no: Optional[str] = None,
+    ) -> list[SendResult]:
+        """One SENS request for many recipients.
+
+        The most common content becomes the request-level default; recipients
+        with different text carry a per-message `content` override. SENS returns
+        a single requestId for the whole request, shared by every result.
+        """
+        if not messages:
+            return []
+        if len(messages) > self.max_batch_size:
+            raise ValueError(f"SENS accepts at most {self.max_batch_size} recipients per request")
+
+        default_content = Counter(m.content for m in messages).most_common(1)[0][0]
+        items = []
+        for m in messages:
+            item = {"to": m.phone}
+            if m.content != default_content:
+                item["content"] = m.content
+            items.append(item)
+
+        data = await self._post_messages(content=default_content, messages=items, from_no=from_no)
+        request_id = data.get("requestId") if isinstance(data, dict) else None
+        return [SendResult(request_id=request_id, raw=data) for _ in messages]
+
     async def send_alimtalk(
         self,
         *,
@@ -8,3 +8,10 @@ from typing import Any, Optional
 class SendResult:
     request_id: Optional[str]
     raw: Any
+
+
+@dataclass
+class SmsMessage:
+    """One recipient of a batched SMS send."""
+    phone: str
+    content: str
@@ -4,8 +4,12 @@ from .organization import Organization, PlanType
 from .order import Order, OrderStatus
 from .qr_token import QRToken
 from .proof import Proof, ProofType
+from .proof_blob import ProofBlob
 from .notification import Notification, NotificationType, NotificationChannel, NotificationStatus
 from .short_link import ShortLink
+from .notification_outbox import NotificationOutbox, OutboxStatus
+from .org_daily_stats import OrgDailyStats
+from .background_job import BackgroundJob, JobKind, JobStatus
 
 __all__ = [
     "Base",
@@ -16,9 +20,16 @@ __all__ = [
     "QRToken",
     "Proof",
     "ProofType",
+    "ProofBlob",
     "Notification",
     "NotificationType",
     "NotificationChannel",
     "NotificationStatus",
     "ShortLink",
+    "NotificationOutbox",
+    "OutboxStatus",
+    "OrgDailyStats",
+    "BackgroundJob",
+    "JobKind",
+    "JobStatus",
 ]
@@ -0,0 +1,56 @@
+import enum
+from sqlalchemy import Column, Integer, String, Enum, DateTime, ForeignKey, Index, Text, func
+from sqlalchemy.dialects.postgresql import JSONB
+
+from src.core.database import Base
+
+
+class JobKind(str, enum.Enum):
+    ORDER_EXPORT = "ORDER_EXPORT"  # CSV export written to storage
+    ORDER_IMPORT = "ORDER_IMPORT"  # CSV upload (staged in storage) inserted in batches
+    PROOF_SNAPSHOTS = "PROOF_SNAPSHOTS"  # republish public proof snapshots after a branding change / order edit
+    PROOF_VARIANTS = "PROOF_VARIANTS"  # thumbnail / medium copies of an uploaded proof image
+
+
+class JobStatus(str, enum.Enum):
+    PENDING = "PENDING"    # Waiting for the job worker
+    RUNNING = "RUNNING"    # Claimed (reclaimed if the lock goes stale)
+    DONE = "DONE"          # Finished; result / file_key set
+    FAILED = "FAILED"      # Gave up; error set
+
+
+class BackgroundJob(Base):
+    """
+    Long-running admin job (exports, imports) processed off the request path by
+    the job worker (python -m src.workers.job_worker), claimed with
+    SELECT ... FOR UPDATE SKIP LOCKED. Clients poll GET /admin/jobs/{id}.
+    """
+    __tablename__ = "background_jobs"
+
+    id = Column(Integer, primary_key=True, index=True)
+    organization_id = Column(Integer, ForeignKey("organizations.id", ondelete="CASCADE"), nullable=False, index=True)
+    kind = Column(Enum(JobKind, name="job_kind"), nullable=False)
+    status = Column(Enum(JobStatus, name="job_status"), default=JobStatus.PENDING, nullable=False)
+    params = Column(JSONB, nullable=True)  # kind-specific input (filters, staged upload, ...)
+    created_by = Column(String(200), nullable=True)  # auth subject
+
+    # Progress (rows); total_rows may be unknown until the job starts
+    processed_rows = Column(Integer, default=0, nullable=False)
+    total_rows = Column(Integer, nullable=True)
+
+    result = Column(JSONB, nullable=True)  # kind-specific summary
+    file_key = Column(String(500), nullable=True)  # storage key of the artifact
+    error = Column(Text, nullable=True)
+
+    attempts = Column(Integer, default=0, nullable=False)
+    locked_at = Column(DateTime(timezone=True), nullable=True)
+    locked_by = Column(String(100), nullable=True)
+
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    started_at = Column(DateTime(timezone=True), nullable=True)
+    finished_at = Column(DateTime(timezone=True), nullable=True)
+    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+
+    __table_args__ = (
+        Index("ix_background_jobs_status_created", "status", "created_at"),
+    )
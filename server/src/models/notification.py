@@ -1,5 +1,5 @@
 import enum
-from sqlalchemy import Column, Integer, String, Enum, DateTime, ForeignKey, Text, func
+from sqlalchemy import Column, Integer, String, Enum, DateTime, ForeignKey, Index, Text, func
 from sqlalchemy.orm import relationship
 
 from src.core.database import Base
@@ -38,7 +38,7 @@ class Notification(Base):
     status = Column(Enum(NotificationStatus), default=NotificationStatus.PENDING, nullable=False)
 
     # Store hash of phone for logging (no PII in logs)
-    phone_hash = Column(String(64), nullable=False)
+    phone_hash = Column(String(64), nullable=False, index=True)  # phone_blind_index (legacy rows: SHA-256)
 
     # Provider response tracking
     provider_request_id = Column(String(100), nullable=True)
@@ -52,3 +52,8 @@ class Notification(Base):
 
     # Relationships
     order = relationship("Order", back_populates="notifications")
+
+    __table_args__ = (
+        # Keyset pagination: ORDER BY created_at DESC, id DESC
+        Index("ix_notifications_created_id", "created_at", "id"),
+    )
@@ -0,0 +1,47 @@
+import enum
+from sqlalchemy import Boolean, Column, Integer, String, Enum, DateTime, ForeignKey, Index, Text, func
+from sqlalchemy.orm import relationship
+
+from src.core.database import Base
+
+
+class OutboxStatus(str, enum.Enum):
+    PENDING = "PENDING"        # Waiting for (re)delivery at next_attempt_at
+    PROCESSING = "PROCESSING"  # Claimed by a worker (reclaimed if the lock goes stale)
+    DONE = "DONE"              # Delivered (or terminally handled)
+    DEAD = "DEAD"              # Gave up after max_attempts
+
+
+class NotificationOutbox(Base):
+    """
+    Durable notification outbox.
+    Written in the same transaction as the triggering change (proof upload,
+    resend, reminder) and delivered by the notification worker with
+    SELECT ... FOR UPDATE SKIP LOCKED. Delivery is at-least-once.
+    No PII: the phone is decrypted from the order at send time.
+    """
+    __tablename__ = "notification_outbox"
+
+    id = Column(Integer, primary_key=True, index=True)
+    notification_id = Column(Integer, ForeignKey("notifications.id", ondelete="CASCADE"), nullable=False, index=True)
+    order_id = Column(Integer, ForeignKey("orders.id", ondelete="CASCADE"), nullable=False, index=True)
+    is_fallback = Column(Boolean, default=False, nullable=False)  # SMS fallback after AlimTalk failure
+
+    status = Column(Enum(OutboxStatus, name="outbox_status"), default=OutboxStatus.PENDING, nullable=False)
+    attempts = Column(Integer, default=0, nullable=False)
+    max_attempts = Column(Integer, default=4, nullable=False)
+    next_attempt_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+    locked_at = Column(DateTime(timezone=True), nullable=True)
+    locked_by = Column(String(100), nullable=True)
+    last_error = Column(Text, nullable=True)
+
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+
+    # Relationships
+    notification = relationship("Notification")
+
+    __table_args__ = (
+        Index("ix_notification_outbox_status_next", "status", "next_attempt_at"),
+    )
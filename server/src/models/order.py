@@ -1,5 +1,5 @@
 import enum
-from sqlalchemy import Column, Integer, String, Enum, DateTime, ForeignKey, func, Text
+from sqlalchemy import Column, Integer, String, Enum, DateTime, ForeignKey, Index, func, Text
 from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import relationship
 
@@ -30,10 +30,12 @@ class Order(Base):
     # Sender (발주자/구매자) - encrypted
     sender_name = Column(String(100), nullable=False)
     sender_phone_encrypted = Column(Text, nullable=False)  # AES-256 encrypted
+    sender_phone_index = Column(String(64), nullable=True, index=True)  # HMAC blind index (lookup)
 
     # Recipient (수령인) - encrypted
     recipient_name = Column(String(100), nullable=True)
     recipient_phone_encrypted = Column(Text, nullable=True)  # AES-256 encrypted
+    recipient_phone_index = Column(String(64), nullable=True, index=True)  # HMAC blind index (lookup)
 
     status = Column(Enum(OrderStatus), default=OrderStatus.PENDING, nullable=False, index=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now(), index=True)
@@ -44,3 +46,10 @@ class Order(Base):
     qr_token = relationship("QRToken", back_populates="order", uselist=False)
     proofs = relationship("Proof", back_populates="order", uselist=True)
     notifications = relationship("Notification", back_populates="order")
+
+    __table_args__ = (
+        # Keyset pagination: WHERE organization_id = ? AND (created_at, id) < (?, ?)
+        Index("ix_orders_org_created_id", "organization_id", "created_at", "id"),
+        # One order per number within an org (CSV / ERP upserts key on it)
+        Index("uq_orders_org_order_number", "organization_id", "order_number", unique=True),
+    )
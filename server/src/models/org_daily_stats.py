@@ -0,0 +1,32 @@
+from sqlalchemy import Column, Date, DateTime, ForeignKey, Integer, func
+
+from src.core.database import Base
+
+
+class OrgDailyStats(Base):
+    """
+    Per-organization, per-KST-day rollup for dashboards/analytics.
+    Maintained incrementally on flush (see services/daily_stats_service.py);
+    rebuild with scripts/rebuild_daily_stats.py.
+
+    Buckets:
+      - orders_created / orders_completed: by order created day
+      - proofs_uploaded: AFTER proofs, by upload day
+      - notifications_*: by notification created day
+    """
+    __tablename__ = "org_daily_stats"
+
+    organization_id = Column(Integer, ForeignKey("organizations.id", ondelete="CASCADE"), primary_key=True)
+    day = Column(Date, primary_key=True)
+
+    orders_created = Column(Integer, nullable=False, default=0)
+    orders_completed = Column(Integer, nullable=False, default=0)  # PROOF_UPLOADED / NOTIFIED / COMPLETED
+    proofs_uploaded = Column(Integer, nullable=False, default=0)
+
+    notifications_total = Column(Integer, nullable=False, default=0)
+    alimtalk_sent = Column(Integer, nullable=False, default=0)
+    alimtalk_failed = Column(Integer, nullable=False, default=0)
+    sms_sent = Column(Integer, nullable=False, default=0)
+    sms_failed = Column(Integer, nullable=False, default=0)
+
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
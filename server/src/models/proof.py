@@ -1,5 +1,6 @@
 import enum
 from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Enum, func
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import relationship
 
 from src.core.database import Base
@@ -27,7 +28,11 @@ class Proof(Base):
     proof_type = Column(Enum(ProofType), default=ProofType.AFTER, nullable=False)
     file_path = Column(String(500), nullable=False)
     file_size = Column(Integer, nullable=True)  # bytes
+    sha256 = Column(String(64), nullable=True, index=True)  # hex digest; proof_blobs key
     mime_type = Column(String(50), nullable=True)
+    # Downscaled copies written by the job worker: {"thumbnail": key, "medium": key}
+    variants = Column(JSONB, nullable=True)
+    variants_at = Column(DateTime(timezone=True), nullable=True)  # when variants were last stored
     uploaded_at = Column(DateTime(timezone=True), server_default=func.now())
 
     # Relationships
@@ -0,0 +1,20 @@
+from sqlalchemy import Column, Integer, String, DateTime, func
+
+from src.core.database import Base
+
+
+class ProofBlob(Base):
+    """
+    Content-addressed proof file.
+    Identical uploads (same SHA-256) are stored once; ref_count is the number
+    of proofs whose file_path points at file_key. Rows at zero are removed,
+    with their file, by scripts/gc_proof_blobs.py.
+    """
+    __tablename__ = "proof_blobs"
+
+    sha256 = Column(String(64), primary_key=True)  # hex digest of the file
+    file_key = Column(String(500), nullable=False)  # storage key
+    file_size = Column(Integer, nullable=False)  # bytes
+    mime_type = Column(String(50), nullable=True)
+    ref_count = Column(Integer, nullable=False, default=0)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
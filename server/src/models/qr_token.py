@@ -17,6 +17,8 @@ class QRToken(Base):
     is_valid = Column(Boolean, default=True, nullable=False)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     revoked_at = Column(DateTime(timezone=True), nullable=True)
+    # Storage key of the published public proof JSON (see proof_snapshot_service)
+    proof_snapshot_key = Column(String(500), nullable=True)
 
     # Relationships
     order = relationship("Order", back_populates="qr_token")
@@ -117,6 +117,8 @@ class OrderDetailOut(BaseModel):
     short_public_url: Optional[str] = None
 
     proof_url: Optional[str] = None
+    thumbnail_url: Optional[str] = None  # downscaled variants, once rendered
+    medium_url: Optional[str] = None
     proof_uploaded_at: Optional[datetime] = None
 
     notifications: list[NotificationLog] = []
@@ -156,17 +158,26 @@ class CsvImportError(BaseModel):
 class CsvImportOut(BaseModel):
     created_count: int
     created_order_ids: list[int]
+    # upsert / skip modes
+    updated_count: int = 0
+    updated_order_ids: list[int] = []
+    unchanged_count: int = 0
     errors: list[CsvImportError] = []
 
 
 # --- Order List (Paginated) ---
 class OrderListOut(BaseModel):
-    """Paginated order list response."""
+    """Paginated order list response.
+
+    Offset mode fills page/total_pages; cursor mode fills next_cursor.
+    total is None when not requested (total=none).
+    """
     items: list  # Will contain OrderOut objects
-    total: int
-    page: int
+    total: Optional[int] = None
+    page: Optional[int] = None
     limit: int
-    total_pages: int
+    total_pages: Optional[int] = None
+    next_cursor: Optional[str] = None
 
 
 # --- Dashboard ---
@@ -220,12 +231,41 @@ class NotificationListItem(BaseModel):
 
 
 class NotificationListOut(BaseModel):
-    """Paginated notification list response."""
+    """Paginated notification list response (see OrderListOut for modes)."""
     items: list[NotificationListItem]
-    total: int
-    page: int
+    total: Optional[int] = None
+    page: Optional[int] = None
     limit: int
-    total_pages: int
+    total_pages: Optional[int] = None
+    next_cursor: Optional[str] = None
+
+
+# --- Background jobs ---
+class JobOut(BaseModel):
+    """Background job status (poll until status is DONE or FAILED)."""
+    id: int
+    kind: str  # ORDER_EXPORT, ORDER_IMPORT
+    status: str  # PENDING, RUNNING, DONE, FAILED
+    processed_rows: int = 0
+    total_rows: Optional[int] = None
+    result: Optional[dict] = None  # imports: created/updated/unchanged/error counts, errors (report), phase
+    download_url: Optional[str] = None  # exports, when DONE: authenticated API path (GET /admin/jobs/{id}/download)
+    error: Optional[str] = None
+    created_at: Optional[datetime] = None
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+
+
+# --- Phone lookup (blind index) ---
+class PhoneLookupIn(BaseModel):
+    """Phone lookup request (body, so the number stays out of access logs)."""
+    phone: str
+
+
+class PhoneLookupOut(BaseModel):
+    """Orders and notifications for one phone number."""
+    orders: list[OrderOut]
+    notifications: list[NotificationListItem]
 
 
 class NotificationStats(BaseModel):
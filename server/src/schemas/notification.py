@@ -12,7 +12,7 @@ class NotificationLog(BaseModel):
     type: NotificationType
     channel: NotificationChannel
     status: NotificationStatus
-    phone_hash: str  # SHA-256 hash, not actual phone
+    phone_hash: str  # keyed blind index (legacy rows: SHA-256), not actual phone
     provider_request_id: Optional[str] = None
     message_url: Optional[str] = None
     error_code: Optional[str] = None
@@ -9,7 +9,9 @@ class ProofItem(BaseModel):
     """Single proof item for list response."""
     id: int
     proof_type: ProofType
-    proof_url: str
+    proof_url: str  # original upload
+    thumbnail_url: Optional[str] = None  # downscaled variants, once rendered
+    medium_url: Optional[str] = None
     uploaded_at: datetime
 
     class Config:
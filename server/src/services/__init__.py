@@ -1,9 +1,11 @@
 from .token_service import TokenService
 from .proof_service import ProofService
 from .notification_service import NotificationService
+from .daily_stats_service import DailyStatsService  # also registers the rollup flush listener
 
 __all__ = [
     "TokenService",
     "ProofService",
     "NotificationService",
+    "DailyStatsService",
 ]
@@ -1,29 +1,71 @@
 from __future__ import annotations
 
-from typing import Optional
-from collections import defaultdict
+from typing import Iterable, Iterator, Optional
+from collections import Counter, defaultdict
 import csv
 import io
-import statistics
+import json
 
 from datetime import date, datetime, time, timedelta, timezone
 from zoneinfo import ZoneInfo
 
-from fastapi import HTTPException, BackgroundTasks
-from sqlalchemy import or_, func
-from sqlalchemy.orm import Session
+from fastapi import HTTPException
+from sqlalchemy import func, select, tuple_, update
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
+from sqlalchemy.orm import Session, joinedload
 
 from src.core.config import settings
-from src.core.security import encrypt_phone, decrypt_phone, normalize_phone
-from src.models import Organization, Order, OrderStatus, QRToken, Notification, Proof
+from src.core.security import encrypt_phone, decrypt_phone, normalize_phone, phone_blind_index
+from src.models import Organization, Order, OrderStatus, QRToken, Notification, Proof, ProofType
 from src.models.notification import NotificationStatus, NotificationType, NotificationChannel
 from src.schemas.admin import OrganizationCreate, OrderUpdate
 from src.schemas.order import OrderCreate
 from src.schemas.notification import NotificationLog
-from src.services.token_service import TokenService
+from src.services.token_service import TokenService, invalidate_token_cache
 from src.services.proof_service import ProofService
+from src.services.proof_blob_service import release_blobs
+from src.services.proof_snapshot_service import ProofSnapshotService
 from src.services.notification_service import NotificationService
 from src.services.short_link_service import ShortLinkService
+from src.services.storage_service import StorageService
+from src.services.order_import import IMPORT_MODES, CsvEncodingError, ImportAbortedError, ImportResult, OrderImporter
+from src.services.order_search import search_orders
+from src.services.daily_stats_service import (
+    COMPLETED_STATUSES,
+    COUNTERS as DAILY_COUNTERS,
+    SENT_STATUSES,
+    DailyStatsService,
+    day_key,
+    kst_day,
+    record_order_deleted,
+    record_order_status_changed,
+)
+from src.utils.cursor import decode_cursor, encode_cursor
+from src.utils.ttl_cache import TTLCache
+
+
+# Exact list totals for total=cached, keyed by the compiled COUNT statement + params.
+_list_total_cache = TTLCache(max_entries=1000, ttl_seconds=settings.LIST_TOTAL_CACHE_TTL_SECONDS)
+
+def decrypt_export_phones(sender_encrypted: Optional[str], recipient_encrypted: Optional[str]) -> tuple[str, str]:
+    """Decrypt phones for export; undecryptable values are masked, not raised.
+
+    Module-level (picklable) so export jobs can fan it out to a process pool.
+    """
+    phones = []
+    for encrypted in (sender_encrypted, recipient_encrypted):
+        phone = ""
+        if encrypted:
+            try:
+                phone = decrypt_phone(encrypted)
+            except Exception:
+                phone = "[암호화됨]"
+        phones.append(phone)
+    return phones[0], phones[1]
+
+
+PAGINATION_MODES = ("offset", "cursor")
+TOTAL_MODES = ("exact", "cached", "estimate", "none")
 
 
 class AdminService:
@@ -83,6 +125,12 @@ class AdminService:
 
         fields_set = getattr(payload, '__fields_set__', None) or getattr(payload, 'model_fields_set', None) or set()
 
+        def public_branding():
+            # Everything the public proof page shows about the organization
+            return (org.name, org.logo_url, org.brand_name, org.brand_logo_url, org.hide_saegim)
+
+        branding_before = public_branding()
+
         # internal
         if getattr(payload, 'name', None) is not None:
             org.name = (payload.name or '').strip() or org.name
@@ -116,12 +164,24 @@ class AdminService:
             # None => inherit global, otherwise override
             org.msg_fallback_sms_enabled = payload.msg_fallback_sms_enabled
 
+        # Published proof snapshots carry the branding: stop serving them in
+        # the same transaction, republish in the background
+        snapshots = ProofSnapshotService(self.db)
+        unpublished = []
+        if public_branding() != branding_before:
+            unpublished = snapshots.unpublish_organization(org.id)
+
         try:
             self.db.commit()
         except Exception as e:
             self.db.rollback()
             raise HTTPException(status_code=400, detail=f"UPDATE_ORG_FAILED: {e}") from e
 
+        if unpublished:
+            for token, _ in unpublished:
+                invalidate_token_cache(token)
+            snapshots.enqueue_republish(org.id, [key for _, key in unpublished])
+
         self.db.refresh(org)
         return org
 
@@ -139,22 +199,25 @@ class AdminService:
         end_date: Optional[date] = None,
         page: int = 1,
         limit: int = 50,
+        pagination: str = "offset",
+        cursor: Optional[str] = None,
+        total_mode: str = "exact",
+        sort: str = "recent",
     ) -> dict:
         query = self.db.query(Order)
 
         if organization_id is not None:
             query = query.filter(Order.organization_id == organization_id)
 
-        if q:
-            like = f"%{q.strip()}%"
-            query = query.filter(
-                or_(
-                    Order.order_number.ilike(like),
-                    Order.sender_name.ilike(like),
-                    Order.recipient_name.ilike(like),
-                    Order.context.ilike(like),
-                )
-            )
+        if sort not in ("recent", "relevance"):
+            raise HTTPException(status_code=400, detail=f"INVALID_SORT: {sort}")
+
+        # Trigram-indexed on PostgreSQL (see order_search); relevance ranks only with q
+        rank = None
+        if q and q.strip():
+            query, search_rank = search_orders(query, q, self.db.get_bind().dialect.name)
+            if sort == "relevance":
+                rank = search_rank
 
         if status:
             try:
@@ -196,34 +259,142 @@ class AdminService:
             end_utc = end_kst.astimezone(timezone.utc)
             query = query.filter(Order.created_at <= end_utc)
 
-        # Count total
-        total = query.count()
+        return self._paginate(
+            query,
+            Order.created_at,
+            Order.id,
+            row_key=lambda o: (o.created_at, o.id),
+            pagination=pagination,
+            cursor=cursor,
+            page=page,
+            limit=limit,
+            total_mode=total_mode,
+            rank=rank,
+        )
 
-        # Paginate
-        offset = (page - 1) * limit
-        items = query.order_by(Order.created_at.desc()).offset(offset).limit(limit).all()
+    # ---------------------------
+    # List pagination
+    # ---------------------------
+    def _paginate(
+        self,
+        query,
+        created_col,
+        id_col,
+        *,
+        row_key,
+        pagination: str,
+        cursor: Optional[str],
+        page: int,
+        limit: int,
+        total_mode: str,
+        rank=None,
+    ) -> dict:
+        """Shared offset/keyset pagination for admin listings (newest first).
+
+        cursor mode seeks past (created_at, id) of the last row served, so every
+        page is an index range scan regardless of depth. Totals are optional:
+        exact (COUNT), cached (COUNT memoized briefly), estimate (planner rows on
+        PostgreSQL, cached count elsewhere) or none. A rank expression orders by
+        relevance first and is offset-only.
+        """
+        if pagination not in PAGINATION_MODES:
+            raise HTTPException(status_code=400, detail=f"INVALID_PAGINATION: {pagination}")
+        if total_mode not in TOTAL_MODES:
+            raise HTTPException(status_code=400, detail=f"INVALID_TOTAL_MODE: {total_mode}")
+        if rank is not None and pagination == "cursor":
+            raise HTTPException(status_code=400, detail="RELEVANCE_SORT_REQUIRES_OFFSET")
+
+        total = self._list_total(query, total_mode)
+        if rank is not None:
+            ordered = query.order_by(rank.desc(), created_col.desc(), id_col.desc())
+        else:
+            ordered = query.order_by(created_col.desc(), id_col.desc())
+
+        if pagination == "offset":
+            items = ordered.offset((page - 1) * limit).limit(limit).all()
+            return {
+                "items": items,
+                "total": total,
+                "page": page,
+                "limit": limit,
+                "total_pages": (total + limit - 1) // limit if total is not None else None,
+                "next_cursor": None,
+            }
+
+        if cursor:
+            try:
+                after_created, after_id = decode_cursor(cursor)
+            except ValueError as e:
+                raise HTTPException(status_code=400, detail="INVALID_CURSOR") from e
+            ordered = ordered.filter(tuple_(created_col, id_col) < tuple_(after_created, after_id))
 
-        total_pages = (total + limit - 1) // limit
+        # One extra row tells us whether another page exists.
+        rows = ordered.limit(limit + 1).all()
+        items = rows[:limit]
+        next_cursor = encode_cursor(*row_key(items[-1])) if len(rows) > limit else None
 
         return {
             "items": items,
             "total": total,
-            "page": page,
+            "page": None,
             "limit": limit,
-            "total_pages": total_pages,
+            "total_pages": None,
+            "next_cursor": next_cursor,
         }
 
+    def _list_total(self, query, total_mode: str) -> Optional[int]:
+        if total_mode == "none":
+            return None
+        if total_mode == "exact":
+            return query.count()
+        if total_mode == "estimate" and self._is_postgres:
+            estimate = self._estimate_rows(query)
+            if estimate is not None:
+                return estimate
+
+        count_stmt = query.statement.with_only_columns(func.count()).order_by(None)
+        compiled = count_stmt.compile(dialect=self.db.get_bind().dialect)
+        key = (str(compiled), tuple(sorted((k, repr(v)) for k, v in compiled.params.items())))
+        cached = _list_total_cache.get(key)
+        if cached is not None:
+            return cached
+        total = query.count()
+        _list_total_cache.set(key, total)
+        return total
+
+    def _estimate_rows(self, query) -> Optional[int]:
+        """Planner row estimate (EXPLAIN) for the filtered listing; PostgreSQL only."""
+        compiled = query.statement.compile(
+            dialect=self.db.get_bind().dialect,
+            compile_kwargs={"render_postcompile": True},
+        )
+        try:
+            # Savepoint: a failed EXPLAIN must not abort the request's transaction
+            with self.db.begin_nested():
+                plan = self.db.connection().exec_driver_sql(
+                    f"EXPLAIN (FORMAT JSON) {compiled}", compiled.params
+                ).scalar()
+        except Exception:
+            return None
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        try:
+            return int(plan[0]["Plan"]["Plan Rows"])
+        except (KeyError, IndexError, TypeError, ValueError):
+            return None
+
     def import_orders_csv(
         self,
-        rows: list[dict],
+        rows: Iterable[dict],
         organization_id: int,
         *,
         strict: bool = False,
-    ) -> tuple[list[int], list[dict]]:
+        mode: str = "insert",
+    ) -> ImportResult:
         """Import many orders from parsed CSV rows.
 
         Args:
-            rows: list of dict rows. Expected keys:
+            rows: iterable of dict rows (see order_import.iter_csv_rows). Expected keys:
               - order_number
               - context (optional)
               - sender_name
@@ -231,72 +402,30 @@ class AdminService:
               - recipient_name (optional)
               - recipient_phone (optional)
             strict: if True, any row error aborts whole import.
+            mode: insert | upsert | skip (see order_import.IMPORT_MODES);
+              upsert / skip make re-running the same file safe.
 
         Returns:
-            (created_order_ids, errors)
+            ImportResult (created / updated ids, unchanged count, errors)
         """
 
+        if mode not in IMPORT_MODES:
+            raise HTTPException(status_code=400, detail="INVALID_IMPORT_MODE")
+
         org = self.db.query(Organization).filter(Organization.id == organization_id).first()
         if not org:
             raise HTTPException(status_code=404, detail="ORG_NOT_FOUND")
 
-        created_ids: list[int] = []
-        errors: list[dict] = []
-
-        for idx, r in enumerate(rows, start=1):
-            try:
-                order_number = (r.get("order_number") or r.get("order_no") or "").strip()
-                if not order_number:
-                    raise ValueError("ORDER_NUMBER_REQUIRED")
-
-                sender_name = (r.get("sender_name") or r.get("buyer_name") or "").strip()
-                if not sender_name:
-                    raise ValueError("SENDER_NAME_REQUIRED")
-
-                sender_phone_raw = (r.get("sender_phone") or r.get("buyer_phone") or "").strip()
-                if not sender_phone_raw:
-                    raise ValueError("SENDER_PHONE_REQUIRED")
-
-                sender_phone = normalize_phone(sender_phone_raw)
-                sender_enc = encrypt_phone(sender_phone)
-
-                recipient_name = (r.get("recipient_name") or r.get("receiver_name") or "").strip() or None
-                recipient_phone_raw = (r.get("recipient_phone") or r.get("receiver_phone") or "").strip() or None
-
-                recipient_enc = None
-                if recipient_phone_raw:
-                    recipient_phone = normalize_phone(recipient_phone_raw)
-                    recipient_enc = encrypt_phone(recipient_phone)
-
-                context = (r.get("context") or r.get("event") or "").strip() or None
-
-                order = Order(
-                    organization_id=organization_id,
-                    order_number=order_number,
-                    context=context,
-                    sender_name=sender_name,
-                    sender_phone_encrypted=sender_enc,
-                    recipient_name=recipient_name,
-                    recipient_phone_encrypted=recipient_enc,
-                    status=OrderStatus.PENDING,
-                )
-                self.db.add(order)
-                self.db.flush()  # assign PK
-                created_ids.append(order.id)
-            except Exception as e:
-                err = {"row": idx, "message": str(e)}
-                errors.append(err)
-                if strict:
-                    self.db.rollback()
-                    raise HTTPException(status_code=400, detail=f"CSV_IMPORT_FAILED: row {idx}: {e}") from e
-
         try:
-            self.db.commit()
-        except Exception as e:
-            self.db.rollback()
+            result = OrderImporter(self.db, organization_id, strict=strict, mode=mode).run(rows)
+        except ImportAbortedError as e:
+            raise HTTPException(status_code=400, detail=f"CSV_IMPORT_FAILED: row {e.row}: {e.message}") from e
+        except CsvEncodingError as e:
+            raise HTTPException(status_code=400, detail=str(e)) from e
+        except SQLAlchemyError as e:
             raise HTTPException(status_code=400, detail=f"CSV_IMPORT_COMMIT_FAILED: {e}") from e
-
-        return created_ids, errors
+        ProofSnapshotService(self.db).republish_later(organization_id, result.unpublished)
+        return result
 
     def create_order(self, payload: OrderCreate, organization_id: int) -> Order:
         org = self.db.query(Organization).filter(Organization.id == organization_id).first()
@@ -312,9 +441,11 @@ class AdminService:
         sender_enc = encrypt_phone(sender_phone)
 
         recipient_enc = None
+        recipient_idx = None
         if payload.recipient_phone:
             recipient_phone = normalize_phone(payload.recipient_phone)
             recipient_enc = encrypt_phone(recipient_phone)
+            recipient_idx = phone_blind_index(recipient_phone)
 
         order = Order(
             organization_id=organization_id,
@@ -322,12 +453,18 @@ class AdminService:
             context=(payload.context.strip() if payload.context else None),
             sender_name=payload.sender_name.strip(),
             sender_phone_encrypted=sender_enc,
+            sender_phone_index=phone_blind_index(sender_phone),
             recipient_name=(payload.recipient_name.strip() if payload.recipient_name else None),
             recipient_phone_encrypted=recipient_enc,
+            recipient_phone_index=recipient_idx,
             status=OrderStatus.PENDING,
         )
         self.db.add(order)
-        self.db.commit()
+        try:
+            self.db.commit()
+        except IntegrityError as e:
+            self.db.rollback()
+            raise HTTPException(status_code=409, detail="ORDER_NUMBER_EXISTS") from e
         self.db.refresh(order)
         return order
 
@@ -341,7 +478,7 @@ class AdminService:
 
         org = order.organization
         qr: Optional[QRToken] = order.qr_token
-        proof = order.proof
+        proof = max(order.proofs, key=lambda p: p.id, default=None)  # latest upload
 
         token = qr.token if qr else None
         token_valid = bool(qr and qr.is_valid)
@@ -355,9 +492,15 @@ class AdminService:
             short_public_url = f"{settings.WEB_BASE_URL}/s/{sl.code}"
 
         proof_url = None
+        thumbnail_url = None
+        medium_url = None
         proof_uploaded_at = None
         if proof:
-            proof_url = f"{settings.APP_BASE_URL}/uploads/{proof.file_path}"
+            storage = StorageService()
+            variants = proof.variants or {}
+            proof_url = storage.get_file_url(proof.file_path)
+            thumbnail_url = storage.get_file_url(variants["thumbnail"]) if variants.get("thumbnail") else None
+            medium_url = storage.get_file_url(variants["medium"]) if variants.get("medium") else None
             proof_uploaded_at = proof.uploaded_at
 
         notifications = (
@@ -377,6 +520,8 @@ class AdminService:
             "public_proof_url": public_proof_url,
             "short_public_url": short_public_url,
             "proof_url": proof_url,
+            "thumbnail_url": thumbnail_url,
+            "medium_url": medium_url,
             "proof_uploaded_at": proof_uploaded_at,
             "notifications": notifications_out,
         }
@@ -399,16 +544,17 @@ class AdminService:
                 "public_proof_url": f"{settings.WEB_BASE_URL}/p/{token}",
             }
 
-        # If existing token present, delete it to satisfy (order_id) unique constraint
-        if existing:
-            self.db.delete(existing)
+        # Same path as the bulk reissue: the old token (one per order) is replaced,
+        # the short link retargeted and the old token's snapshot deleted
+        try:
+            issued, replaced = self._issue_tokens([order], [order.id] if existing else [])
             self.db.commit()
+        except Exception as e:
+            self.db.rollback()
+            raise HTTPException(status_code=400, detail=f"ISSUE_TOKEN_FAILED: {e}") from e
+        self._evict_replaced(replaced)
 
-        qr_token = self.token_service.create_token_for_order(order.id)
-        order.status = OrderStatus.TOKEN_ISSUED
-        self.db.commit()
-
-        token = qr_token.token
+        token = issued[order.id]
         return {
             "token": token,
             "token_valid": True,
@@ -443,47 +589,39 @@ class AdminService:
             seen.add(oid)
             ids.append(oid)
 
-        orders = (
-            self.db.query(Order)
-            .filter(Order.organization_id == scope_org_id)
-            .filter(Order.id.in_(ids))
-            .all()
-        )
-        by_id = {o.id: o for o in orders}
-
-        out: list[dict] = []
-        changed = False
-
+        by_id = self._orders_with_tokens(ids, scope_org_id)
         for oid in ids:
-            order = by_id.get(oid)
-            if not order:
+            if oid not in by_id:
                 # keep response stable for the rest; caller can show error per id
                 raise HTTPException(status_code=404, detail=f"ORDER_NOT_FOUND:{oid}")
 
-            org = order.organization
-            existing = order.qr_token
+        existing = {oid: by_id[oid].qr_token for oid in ids}
+        to_issue = [
+            by_id[oid]
+            for oid in ids
+            if (existing[oid] is None and ensure_tokens) or (existing[oid] is not None and force)
+        ]
+        # WARNING: force replaces tokens (breaks old links).
+        replace_ids = [o.id for o in to_issue if existing[o.id] is not None]
 
-            if (existing is None) and ensure_tokens:
-                qr_token = self.token_service.create_token_for_order(order.id)
-                order.status = OrderStatus.TOKEN_ISSUED
-                existing = qr_token
-                changed = True
+        issued: dict[int, str] = {}
+        replaced: list[tuple[str, Optional[str]]] = []
+        if to_issue:
+            issued, replaced = self._issue_tokens(to_issue, replace_ids)
 
-            if existing and force:
-                # WARNING: This replaces token (breaks old links).
-                self.db.delete(existing)
-                self.db.commit()
-                qr_token = self.token_service.create_token_for_order(order.id)
-                order.status = OrderStatus.TOKEN_ISSUED
-                existing = qr_token
-                changed = True
+        out: list[dict] = []
+        for oid in ids:
+            order = by_id[oid]
+            org = order.organization
 
-            if not existing:
+            if oid in issued:
+                token, token_valid = issued[oid], True
+            elif existing[oid] is not None:
+                token, token_valid = existing[oid].token, bool(existing[oid].is_valid)
+            else:
                 # still no token (ensure_tokens=False)
                 continue
 
-            token = existing.token
-            token_valid = bool(existing.is_valid)
             upload_url = f"{settings.WEB_BASE_URL}/proof/{token}"
             public_proof_url = f"{settings.WEB_BASE_URL}/p/{token}"
 
@@ -503,15 +641,59 @@ class AdminService:
                 }
             )
 
-        if changed:
+        if to_issue:
             self.db.commit()
+            self._evict_replaced(replaced)
 
         return out
 
-    async def resend_notification(
+    def _orders_with_tokens(self, ids: list[int], scope_org_id: int) -> dict[int, Order]:
+        """Orders by id with organization and token loaded in the same statement."""
+        orders = (
+            self.db.query(Order)
+            .options(joinedload(Order.organization), joinedload(Order.qr_token))
+            .filter(Order.organization_id == scope_org_id)
+            .filter(Order.id.in_(ids))
+            .all()
+        )
+        return {o.id: o for o in orders}
+
+    def _issue_tokens(
+        self, orders: list[Order], replace_order_ids: list[int]
+    ) -> tuple[dict[int, str], list[tuple[str, Optional[str]]]]:
+        """Set-based token issuance: one DELETE, one INSERT, one short-link upsert
+        and one status UPDATE (no commit).
+
+        Returns ({order_id: token}, replaced (token, snapshot key) for _evict_replaced after commit).
+        """
+        issued, replaced = self.token_service.create_tokens_for_orders(
+            [o.id for o in orders],
+            replace_order_ids=replace_order_ids,
+        )
+        # Codes are derived from order ids, so links need no collision checks
+        ShortLinkService(self.db).create_public_proof_links(issued)
+        # Bulk UPDATE bypasses the rollup listener
+        record_order_status_changed(
+            self.db,
+            [(o.organization_id, o.created_at, o.status) for o in orders if o.status != OrderStatus.TOKEN_ISSUED],
+            OrderStatus.TOKEN_ISSUED,
+        )
+        self.db.execute(
+            update(Order).where(Order.id.in_(list(issued))).values(status=OrderStatus.TOKEN_ISSUED)
+        )
+        for order in orders:
+            self.db.expire(order, ["qr_token"])
+        return issued, replaced
+
+    def _evict_replaced(self, replaced: list[tuple[str, Optional[str]]]) -> None:
+        """After the commit: drop replaced tokens from the cache and delete their snapshots."""
+        for old_token, _ in replaced:
+            invalidate_token_cache(old_token)
+        ProofSnapshotService(self.db).discard(key for _, key in replaced)
+
+    def resend_notification(
         self,
         order_id: int,
-        background_tasks: BackgroundTasks,
         scope_org_id: Optional[int] = None,
     ) -> dict:
         q = self.db.query(Order).filter(Order.id == order_id)
@@ -521,10 +703,11 @@ class AdminService:
         if not order:
             raise HTTPException(status_code=404, detail="ORDER_NOT_FOUND")
 
-        if not order.proof:
+        if not order.proofs:
             raise HTTPException(status_code=400, detail="PROOF_NOT_UPLOADED")
 
-        await self.notification_service.send_dual_notification(order=order, background_tasks=background_tasks)
+        self.notification_service.enqueue_dual_notification(order)
+        self.db.commit()
         return {"status": "ok"}
 
     # ---------------------------
@@ -551,29 +734,15 @@ class AdminService:
         start_utc = start_kst.astimezone(timezone.utc)
         end_utc = end_kst.astimezone(timezone.utc)
 
-        # Query orders in date range
-        orders = (
-            self.db.query(Order)
-            .filter(Order.organization_id == organization_id)
-            .filter(Order.created_at >= start_utc)
-            .filter(Order.created_at <= end_utc)
-            .all()
-        )
+        # O(days) from the rollup (or grouped SQL when it is disabled)
+        totals = Counter()
+        for counts in self._daily_counts(organization_id, start_date, end_date, start_utc, end_utc).values():
+            totals.update(counts)
 
-        total_orders = len(orders)
-        proof_completed = sum(1 for o in orders if o.status == OrderStatus.PROOF_UPLOADED or o.status == OrderStatus.NOTIFIED or o.status == OrderStatus.COMPLETED)
+        total_orders = totals["orders_created"]
+        proof_completed = totals["orders_completed"]
         proof_pending = total_orders - proof_completed
-
-        # Count failed notifications in date range
-        failed_notifications = (
-            self.db.query(Notification)
-            .join(Order, Notification.order_id == Order.id)
-            .filter(Order.organization_id == organization_id)
-            .filter(Notification.created_at >= start_utc)
-            .filter(Notification.created_at <= end_utc)
-            .filter(Notification.status == NotificationStatus.FAILED)
-            .count()
-        )
+        failed_notifications = totals["alimtalk_failed"] + totals["sms_failed"]
 
         # Get recent proofs (last 5)
         recent_proofs_query = (
@@ -636,6 +805,7 @@ class AdminService:
         if payload.sender_phone is not None:
             sender_phone = normalize_phone(payload.sender_phone)
             order.sender_phone_encrypted = encrypt_phone(sender_phone)
+            order.sender_phone_index = phone_blind_index(sender_phone)
 
         if payload.recipient_name is not None:
             order.recipient_name = payload.recipient_name.strip() if payload.recipient_name.strip() else None
@@ -644,15 +814,28 @@ class AdminService:
             if payload.recipient_phone.strip():
                 recipient_phone = normalize_phone(payload.recipient_phone)
                 order.recipient_phone_encrypted = encrypt_phone(recipient_phone)
+                order.recipient_phone_index = phone_blind_index(recipient_phone)
             else:
                 order.recipient_phone_encrypted = None
+                order.recipient_phone_index = None
+
+        # The public proof page shows order_number / context: stop serving
+        # the published snapshot in the same transaction, republish after
+        snapshots = ProofSnapshotService(self.db)
+        unpublished = []
+        if payload.order_number is not None or payload.context is not None:
+            unpublished = snapshots.unpublish_orders([order.id])
 
         try:
             self.db.commit()
+        except IntegrityError as e:
+            self.db.rollback()
+            raise HTTPException(status_code=409, detail="ORDER_NUMBER_EXISTS") from e
         except Exception as e:
             self.db.rollback()
             raise HTTPException(status_code=400, detail=f"UPDATE_ORDER_FAILED: {e}") from e
 
+        snapshots.republish_later(order.organization_id, unpublished)
         self.db.refresh(order)
         return order
 
@@ -670,12 +853,20 @@ class AdminService:
         if not order:
             raise HTTPException(status_code=404, detail="ORDER_NOT_FOUND")
 
+        # Bulk deletes below bypass the flush listener; take them out of the rollup first
+        record_order_deleted(self.db, order_id)
+
         # Delete related records first
         # Delete notifications
         self.db.query(Notification).filter(Notification.order_id == order_id).delete()
-        # Delete proofs
+        # Delete proofs (their files are shared blobs; gc_proof_blobs.py reclaims them)
+        release_blobs(self.db, self.db.query(Proof.sha256, Proof.file_path).filter(Proof.order_id == order_id).all())
         self.db.query(Proof).filter(Proof.order_id == order_id).delete()
-        # Delete QR token
+        # Delete QR token (and its published snapshot, after the commit)
+        snapshot_key = None
+        if order.qr_token is not None:
+            invalidate_token_cache(order.qr_token.token)
+            snapshot_key = order.qr_token.proof_snapshot_key
         self.db.query(QRToken).filter(QRToken.order_id == order_id).delete()
         # Delete order
         self.db.delete(order)
@@ -685,6 +876,7 @@ class AdminService:
         except Exception as e:
             self.db.rollback()
             raise HTTPException(status_code=400, detail=f"DELETE_ORDER_FAILED: {e}") from e
+        ProofSnapshotService(self.db).discard([snapshot_key])
 
         return {"status": "ok", "deleted_order_id": order_id}
 
@@ -700,6 +892,9 @@ class AdminService:
         channel: Optional[str] = None,
         start_date: Optional[date] = None,
         end_date: Optional[date] = None,
+        pagination: str = "offset",
+        cursor: Optional[str] = None,
+        total_mode: str = "exact",
     ) -> dict:
         """List notifications with pagination and filters."""
         kst = ZoneInfo("Asia/Seoul")
@@ -737,21 +932,20 @@ class AdminService:
             except ValueError:
                 pass  # ignore invalid channel
 
-        # Count total
-        total = query.count()
-
-        # Paginate
-        offset = (page - 1) * limit
-        results = (
-            query
-            .order_by(Notification.created_at.desc())
-            .offset(offset)
-            .limit(limit)
-            .all()
+        result = self._paginate(
+            query,
+            Notification.created_at,
+            Notification.id,
+            row_key=lambda row: (row[0].created_at, row[0].id),
+            pagination=pagination,
+            cursor=cursor,
+            page=page,
+            limit=limit,
+            total_mode=total_mode,
         )
 
         items = []
-        for notification, order in results:
+        for notification, order in result["items"]:
             items.append({
                 "id": notification.id,
                 "order_id": order.id,
@@ -765,15 +959,8 @@ class AdminService:
                 "sent_at": notification.sent_at,
             })
 
-        total_pages = (total + limit - 1) // limit
-
-        return {
-            "items": items,
-            "total": total,
-            "page": page,
-            "limit": limit,
-            "total_pages": total_pages,
-        }
+        result["items"] = items
+        return result
 
     def get_notification_stats(
         self,
@@ -839,18 +1026,33 @@ class AdminService:
             seen.add(oid)
             ids.append(oid)
 
-        orders = (
-            self.db.query(Order)
-            .filter(Order.organization_id == scope_org_id)
-            .filter(Order.id.in_(ids))
-            .all()
-        )
-        by_id = {o.id: o for o in orders}
+        by_id = self._orders_with_tokens(ids, scope_org_id)
 
-        results: list[dict] = []
-        success_count = 0
-        failed_count = 0
+        # Keep valid tokens unless forcing; everything else gets a fresh token
+        # (an existing revoked/used token is replaced: one token per order)
+        to_issue: list[Order] = []
+        kept: dict[int, str] = {}
+        for oid in ids:
+            order = by_id.get(oid)
+            if order is None:
+                continue
+            existing = order.qr_token
+            if existing is not None and existing.is_valid and not force:
+                kept[oid] = existing.token
+            else:
+                to_issue.append(order)
+        replace_ids = [o.id for o in to_issue if o.qr_token is not None]
 
+        issued: dict[int, str] = {}
+        replaced: list[tuple[str, Optional[str]]] = []
+        if to_issue:
+            try:
+                issued, replaced = self._issue_tokens(to_issue, replace_ids)
+            except Exception as e:
+                self.db.rollback()
+                raise HTTPException(status_code=400, detail=f"BULK_TOKEN_COMMIT_FAILED: {e}") from e
+
+        results: list[dict] = []
         for oid in ids:
             order = by_id.get(oid)
             if not order:
@@ -860,164 +1062,178 @@ class AdminService:
                     "success": False,
                     "error": "ORDER_NOT_FOUND",
                 })
-                failed_count += 1
                 continue
 
-            try:
-                existing = order.qr_token
-
-                # Skip if token exists and not forcing
-                if existing and existing.is_valid and not force:
-                    token = existing.token
-                    results.append({
-                        "order_id": order.id,
-                        "order_number": order.order_number,
-                        "success": True,
-                        "token": token,
-                        "token_valid": True,
-                        "upload_url": f"{settings.WEB_BASE_URL}/proof/{token}",
-                        "public_proof_url": f"{settings.WEB_BASE_URL}/p/{token}",
-                    })
-                    success_count += 1
-                    continue
-
-                # Delete existing if forcing
-                if existing and force:
-                    self.db.delete(existing)
-                    self.db.flush()
-
-                # Create new token
-                qr_token = self.token_service.create_token_for_order(order.id)
-                order.status = OrderStatus.TOKEN_ISSUED
-                self.db.flush()
-
-                token = qr_token.token
-                results.append({
-                    "order_id": order.id,
-                    "order_number": order.order_number,
-                    "success": True,
-                    "token": token,
-                    "token_valid": True,
-                    "upload_url": f"{settings.WEB_BASE_URL}/proof/{token}",
-                    "public_proof_url": f"{settings.WEB_BASE_URL}/p/{token}",
-                })
-                success_count += 1
+            token = issued.get(oid) or kept[oid]
+            results.append({
+                "order_id": order.id,
+                "order_number": order.order_number,
+                "success": True,
+                "token": token,
+                "token_valid": True,
+                "upload_url": f"{settings.WEB_BASE_URL}/proof/{token}",
+                "public_proof_url": f"{settings.WEB_BASE_URL}/p/{token}",
+            })
 
+        if to_issue:
+            # Results are built first: the commit expires every loaded order
+            try:
+                self.db.commit()
             except Exception as e:
-                results.append({
-                    "order_id": order.id,
-                    "order_number": order.order_number,
-                    "success": False,
-                    "error": str(e),
-                })
-                failed_count += 1
-
-        try:
-            self.db.commit()
-        except Exception as e:
-            self.db.rollback()
-            raise HTTPException(status_code=400, detail=f"BULK_TOKEN_COMMIT_FAILED: {e}") from e
+                self.db.rollback()
+                raise HTTPException(status_code=400, detail=f"BULK_TOKEN_COMMIT_FAILED: {e}") from e
+            self._evict_replaced(replaced)
 
+        success_count = sum(1 for r in results if r["success"])
         return {
             "total": len(ids),
             "success_count": success_count,
-            "failed_count": failed_count,
+            "failed_count": len(ids) - success_count,
             "results": results,
         }
 
     # ---------------------------
     # CSV Export
     # ---------------------------
-    def export_orders_csv(
+    EXPORT_HEADER = (
+        "order_id",
+        "order_number",
+        "context",
+        "status",
+        "sender_name",
+        "sender_phone",
+        "recipient_name",
+        "recipient_phone",
+        "has_token",
+        "has_proof",
+        "created_at",
+    )
+
+    def export_query(
         self,
         organization_id: int,
         status: Optional[str] = None,
         start_date: Optional[date] = None,
         end_date: Optional[date] = None,
-    ) -> str:
-        """Export orders to CSV format."""
+    ):
+        """Column-only SELECT for exports (token/proof flags as EXISTS, no lazy loads)."""
         kst = ZoneInfo("Asia/Seoul")
 
-        query = self.db.query(Order).filter(Order.organization_id == organization_id)
+        has_token = (
+            select(QRToken.id)
+            .where(QRToken.order_id == Order.id, QRToken.is_valid.is_(True))
+            .exists()
+        )
+        has_proof = select(Proof.id).where(Proof.order_id == Order.id).exists()
+
+        stmt = select(
+            Order.id,
+            Order.order_number,
+            Order.context,
+            Order.status,
+            Order.sender_name,
+            Order.sender_phone_encrypted,
+            Order.recipient_name,
+            Order.recipient_phone_encrypted,
+            has_token.label("has_token"),
+            has_proof.label("has_proof"),
+            Order.created_at,
+        ).where(Order.organization_id == organization_id)
 
         # Status filter
         if status:
             try:
                 st = OrderStatus(status.upper())
-                query = query.filter(Order.status == st)
+                stmt = stmt.where(Order.status == st)
             except ValueError:
                 pass
 
         # Date filter
         if start_date:
             start_kst = datetime.combine(start_date, time.min).replace(tzinfo=kst)
-            start_utc = start_kst.astimezone(timezone.utc)
-            query = query.filter(Order.created_at >= start_utc)
+            stmt = stmt.where(Order.created_at >= start_kst.astimezone(timezone.utc))
 
         if end_date:
             end_kst = datetime.combine(end_date, time.max).replace(tzinfo=kst)
-            end_utc = end_kst.astimezone(timezone.utc)
-            query = query.filter(Order.created_at <= end_utc)
+            stmt = stmt.where(Order.created_at <= end_kst.astimezone(timezone.utc))
+
+        return stmt.order_by(Order.created_at.desc(), Order.id.desc())
+
+    @staticmethod
+    def export_row(row, kst: ZoneInfo, sender_phone: str, recipient_phone: str) -> list:
+        """CSV cells for one export_query row (phones already decrypted)."""
+        # Convert created_at to KST
+        created_at_kst = row.created_at.astimezone(kst).strftime("%Y-%m-%d %H:%M:%S") if row.created_at else ""
+
+        return [
+            row.id,
+            row.order_number,
+            row.context or "",
+            str(row.status.value) if row.status else "",
+            row.sender_name or "",
+            sender_phone,
+            row.recipient_name or "",
+            recipient_phone,
+            "Y" if row.has_token else "N",
+            "Y" if row.has_proof else "N",
+            created_at_kst,
+        ]
+
+    def iter_orders_csv(
+        self,
+        organization_id: int,
+        status: Optional[str] = None,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+        chunk_rows: int = 500,
+    ) -> Iterator[str]:
+        """Export orders as CSV text chunks.
 
-        orders = query.order_by(Order.created_at.desc()).all()
+        Rows are fetched chunk_rows at a time (yield_per: a server-side cursor
+        on PostgreSQL) and each chunk is yielded as soon as it is written, so
+        memory stays bounded by the chunk size rather than the export size.
+        """
+        kst = ZoneInfo("Asia/Seoul")
+        stmt = self.export_query(organization_id, status=status, start_date=start_date, end_date=end_date)
 
-        # Build CSV
         output = io.StringIO()
         writer = csv.writer(output)
+        writer.writerow(self.EXPORT_HEADER)
 
-        # Header
-        writer.writerow([
-            "order_id",
-            "order_number",
-            "context",
-            "status",
-            "sender_name",
-            "sender_phone",
-            "recipient_name",
-            "recipient_phone",
-            "has_token",
-            "has_proof",
-            "created_at",
-        ])
-
-        # Rows
-        for order in orders:
-            # Decrypt phones for export
-            sender_phone = ""
-            if order.sender_phone_encrypted:
-                try:
-                    sender_phone = decrypt_phone(order.sender_phone_encrypted)
-                except Exception:
-                    sender_phone = "[암호화됨]"
+        result = self.db.execute(stmt.execution_options(yield_per=chunk_rows))
+        try:
+            for rows in result.partitions():
+                for row in rows:
+                    sender_phone, recipient_phone = decrypt_export_phones(
+                        row.sender_phone_encrypted, row.recipient_phone_encrypted
+                    )
+                    writer.writerow(self.export_row(row, kst, sender_phone, recipient_phone))
+                yield output.getvalue()
+                output.seek(0)
+                output.truncate(0)
+        finally:
+            result.close()
+
+        tail = output.getvalue()
+        if tail:
+            yield tail  # header only (no rows)
 
-            recipient_phone = ""
-            if order.recipient_phone_encrypted:
-                try:
-                    recipient_phone = decrypt_phone(order.recipient_phone_encrypted)
-                except Exception:
-                    recipient_phone = "[암호화됨]"
-
-            has_token = bool(order.qr_token and order.qr_token.is_valid)
-            has_proof = order.proof is not None
-
-            # Convert created_at to KST
-            created_at_kst = order.created_at.astimezone(kst).strftime("%Y-%m-%d %H:%M:%S") if order.created_at else ""
-
-            writer.writerow([
-                order.id,
-                order.order_number,
-                order.context or "",
-                str(order.status.value) if order.status else "",
-                order.sender_name or "",
-                sender_phone,
-                order.recipient_name or "",
-                recipient_phone,
-                "Y" if has_token else "N",
-                "Y" if has_proof else "N",
-                created_at_kst,
-            ])
-
-        return output.getvalue()
+    def export_orders_csv(
+        self,
+        organization_id: int,
+        status: Optional[str] = None,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+    ) -> str:
+        """Export orders to CSV format (whole file; prefer iter_orders_csv)."""
+        return "".join(
+            self.iter_orders_csv(
+                organization_id,
+                status=status,
+                start_date=start_date,
+                end_date=end_date,
+            )
+        )
 
     # ---------------------------
     # Analytics
@@ -1043,93 +1259,36 @@ class AdminService:
         start_utc = start_kst.astimezone(timezone.utc)
         end_utc = end_kst.astimezone(timezone.utc)
 
-        # Query orders in date range
-        orders = (
-            self.db.query(Order)
-            .filter(Order.organization_id == organization_id)
-            .filter(Order.created_at >= start_utc)
-            .filter(Order.created_at <= end_utc)
-            .all()
-        )
-
-        total_orders = len(orders)
+        daily = self._daily_counts(organization_id, start_date, end_date, start_utc, end_utc)
+        totals = Counter()
+        for counts in daily.values():
+            totals.update(counts)
 
-        # Count proofs
-        completed_statuses = [OrderStatus.PROOF_UPLOADED, OrderStatus.NOTIFIED, OrderStatus.COMPLETED]
-        total_proofs = sum(1 for o in orders if o.status in completed_statuses)
+        total_orders = totals["orders_created"]
+        total_proofs = totals["orders_completed"]
         proof_completion_rate = (total_proofs / total_orders) if total_orders > 0 else 0.0
 
-        # Query notifications in date range
-        notifications = (
-            self.db.query(Notification)
-            .join(Order, Notification.order_id == Order.id)
-            .filter(Order.organization_id == organization_id)
-            .filter(Notification.created_at >= start_utc)
-            .filter(Notification.created_at <= end_utc)
-            .all()
-        )
-
-        total_notifications = len(notifications)
-        success_statuses = [NotificationStatus.SENT, NotificationStatus.FALLBACK_SENT, NotificationStatus.MOCK_SENT]
-        successful_notifications = sum(1 for n in notifications if n.status in success_statuses)
+        total_notifications = totals["notifications_total"]
+        alimtalk_sent = totals["alimtalk_sent"]
+        alimtalk_failed = totals["alimtalk_failed"]
+        sms_sent = totals["sms_sent"]
+        sms_failed = totals["sms_failed"]
+        successful_notifications = alimtalk_sent + sms_sent
         notification_success_rate = (successful_notifications / total_notifications) if total_notifications > 0 else 0.0
 
-        # Channel breakdown
-        alimtalk_sent = sum(1 for n in notifications if n.channel == NotificationChannel.ALIMTALK and n.status in success_statuses)
-        alimtalk_failed = sum(1 for n in notifications if n.channel == NotificationChannel.ALIMTALK and n.status == NotificationStatus.FAILED)
-        sms_sent = sum(1 for n in notifications if n.channel == NotificationChannel.SMS and n.status in success_statuses)
-        sms_failed = sum(1 for n in notifications if n.channel == NotificationChannel.SMS and n.status == NotificationStatus.FAILED)
-
-        # Proof timing calculation
-        proof_timings: list[float] = []
-        for order in orders:
-            if order.proof and order.qr_token:
-                token_created = order.qr_token.created_at
-                proof_uploaded = order.proof.uploaded_at
-                if token_created and proof_uploaded:
-                    delta_minutes = (proof_uploaded - token_created).total_seconds() / 60
-                    if delta_minutes > 0:
-                        proof_timings.append(delta_minutes)
-
-        proof_timing_stats = {}
-        if proof_timings:
-            proof_timing_stats = {
-                "avg_minutes": round(sum(proof_timings) / len(proof_timings), 2),
-                "min_minutes": round(min(proof_timings), 2),
-                "max_minutes": round(max(proof_timings), 2),
-                "median_minutes": round(statistics.median(proof_timings), 2),
-            }
-
-        # Daily trends
-        daily_trends: list[dict] = []
-        orders_by_date: dict[str, list] = defaultdict(list)
-        proofs_by_date: dict[str, int] = defaultdict(int)
-        notifications_sent_by_date: dict[str, int] = defaultdict(int)
-        notifications_failed_by_date: dict[str, int] = defaultdict(int)
-
-        for order in orders:
-            order_date = order.created_at.astimezone(kst).date().isoformat()
-            orders_by_date[order_date].append(order)
-            if order.status in completed_statuses:
-                proofs_by_date[order_date] += 1
-
-        for notification in notifications:
-            notif_date = notification.created_at.astimezone(kst).date().isoformat()
-            if notification.status in success_statuses:
-                notifications_sent_by_date[notif_date] += 1
-            elif notification.status == NotificationStatus.FAILED:
-                notifications_failed_by_date[notif_date] += 1
+        proof_timing_stats = self._proof_timing_stats(organization_id, start_utc, end_utc)
 
         # Generate all dates in range
+        daily_trends: list[dict] = []
         current_date = start_date
         while current_date <= end_date:
-            date_str = current_date.isoformat()
+            counts = daily.get(current_date, Counter())
             daily_trends.append({
-                "date": date_str,
-                "orders": len(orders_by_date.get(date_str, [])),
-                "proofs": proofs_by_date.get(date_str, 0),
-                "notifications_sent": notifications_sent_by_date.get(date_str, 0),
-                "notifications_failed": notifications_failed_by_date.get(date_str, 0),
+                "date": current_date.isoformat(),
+                "orders": counts["orders_created"],
+                "proofs": counts["orders_completed"],
+                "notifications_sent": counts["alimtalk_sent"] + counts["sms_sent"],
+                "notifications_failed": counts["alimtalk_failed"] + counts["sms_failed"],
             })
             current_date += timedelta(days=1)
 
@@ -1151,48 +1310,193 @@ class AdminService:
             "end_date": end_date.isoformat(),
         }
 
+    # ---------------------------
+    # Analytics helpers (SQL aggregation)
+    # ---------------------------
+    @property
+    def _is_postgres(self) -> bool:
+        return self.db.get_bind().dialect.name == "postgresql"
+
+    def _daily_counts(
+        self,
+        organization_id: int,
+        start_date: date,
+        end_date: date,
+        start_utc: datetime,
+        end_utc: datetime,
+    ) -> dict[date, Counter]:
+        """Per-KST-day counters (org_daily_stats columns) for the range.
+
+        Reads the rollup (O(days)) when enabled, otherwise aggregates raw rows in SQL.
+        """
+        if settings.STATS_ROLLUP_ENABLED:
+            return {
+                day: Counter({name: getattr(row, name) or 0 for name in DAILY_COUNTERS})
+                for day, row in DailyStatsService(self.db).get_range(organization_id, start_date, end_date).items()
+            }
+
+        dialect = self.db.get_bind().dialect.name
+        daily: dict[date, Counter] = defaultdict(Counter)
+
+        order_day = kst_day(Order.created_at, dialect)
+        order_rows = (
+            self.db.query(
+                order_day,
+                func.count(Order.id),
+                func.count(Order.id).filter(Order.status.in_(COMPLETED_STATUSES)),
+            )
+            .filter(Order.organization_id == organization_id)
+            .filter(Order.created_at >= start_utc)
+            .filter(Order.created_at <= end_utc)
+            .group_by(order_day)
+            .all()
+        )
+        for day_value, created, completed in order_rows:
+            daily[day_key(day_value)].update(orders_created=created, orders_completed=completed)
+
+        notif_day = kst_day(Notification.created_at, dialect)
+        is_success = Notification.status.in_(SENT_STATUSES)
+        is_failed = Notification.status == NotificationStatus.FAILED
+        is_alimtalk = Notification.channel == NotificationChannel.ALIMTALK
+        is_sms = Notification.channel == NotificationChannel.SMS
+        notif_rows = (
+            self.db.query(
+                notif_day,
+                func.count(Notification.id),
+                func.count(Notification.id).filter(is_alimtalk, is_success),
+                func.count(Notification.id).filter(is_alimtalk, is_failed),
+                func.count(Notification.id).filter(is_sms, is_success),
+                func.count(Notification.id).filter(is_sms, is_failed),
+            )
+            .join(Order, Notification.order_id == Order.id)
+            .filter(Order.organization_id == organization_id)
+            .filter(Notification.created_at >= start_utc)
+            .filter(Notification.created_at <= end_utc)
+            .group_by(notif_day)
+            .all()
+        )
+        for day_value, total, at_sent, at_failed, s_sent, s_failed in notif_rows:
+            daily[day_key(day_value)].update(
+                notifications_total=total,
+                alimtalk_sent=at_sent,
+                alimtalk_failed=at_failed,
+                sms_sent=s_sent,
+                sms_failed=s_failed,
+            )
+        return daily
+
+    def _proof_timing_stats(self, organization_id: int, start_utc: datetime, end_utc: datetime) -> dict:
+        """Token issued -> AFTER proof uploaded, in minutes (avg/min/max/median) computed in SQL."""
+        if self._is_postgres:
+            minutes = func.extract("epoch", Proof.uploaded_at - QRToken.created_at) / 60.0
+        else:
+            minutes = (func.julianday(Proof.uploaded_at) - func.julianday(QRToken.created_at)) * 1440.0
+
+        base = (
+            self.db.query(minutes)
+            .select_from(Proof)
+            .join(QRToken, QRToken.order_id == Proof.order_id)
+            .join(Order, Order.id == Proof.order_id)
+            .filter(Order.organization_id == organization_id)
+            .filter(Order.created_at >= start_utc)
+            .filter(Order.created_at <= end_utc)
+            .filter(Proof.proof_type == ProofType.AFTER)
+            .filter(minutes > 0)
+        )
+
+        aggregates = [func.count(), func.avg(minutes), func.min(minutes), func.max(minutes)]
+        if self._is_postgres:
+            aggregates.append(func.percentile_cont(0.5).within_group(minutes))
+        count, avg_m, min_m, max_m, *median = base.with_entities(*aggregates).one()
+        if not count:
+            return {}
+
+        if median:
+            median_m = median[0]
+        else:
+            # No percentile_cont: read the middle one/two values by offset
+            middle = [
+                row[0]
+                for row in base.order_by(minutes).offset((count - 1) // 2).limit(2 - count % 2).all()
+            ]
+            median_m = sum(middle) / len(middle)
+
+        return {
+            "avg_minutes": round(float(avg_m), 2),
+            "min_minutes": round(float(min_m), 2),
+            "max_minutes": round(float(max_m), 2),
+            "median_minutes": round(float(median_m), 2),
+        }
+
     # ---------------------------
     # Reminder Notifications
     # ---------------------------
-    def get_pending_reminders(
+    def _reminder_candidates(
         self,
         organization_id: int,
-        hours_since_token: int = 24,
-    ) -> dict:
-        """Get orders that are eligible for reminder notifications."""
+        hours_since_token: int,
+        order_ids: Optional[list[int]] = None,
+    ):
+        """Orders eligible for a reminder, with token timestamp and reminder count.
+
+        One query: orders JOIN qr_tokens LEFT JOIN (reminder counts GROUP BY order_id).
+        Rows are (Order, token_created_at, reminder_count).
+        """
         cutoff = datetime.now(timezone.utc) - timedelta(hours=hours_since_token)
 
+        org_order_ids = self.db.query(Order.id).filter(Order.organization_id == organization_id)
+        reminder_counts = (
+            self.db.query(
+                Notification.order_id.label("order_id"),
+                func.count(Notification.id).label("reminder_count"),
+            )
+            .filter(Notification.type == NotificationType.REMINDER)
+            .filter(Notification.order_id.in_(org_order_ids))
+            .group_by(Notification.order_id)
+            .subquery()
+        )
+
         # Find orders with:
         # - Token issued (status >= TOKEN_ISSUED)
         # - No proof uploaded (status < PROOF_UPLOADED)
         # - Token issued before cutoff time
-        orders = (
-            self.db.query(Order)
+        query = (
+            self.db.query(
+                Order,
+                QRToken.created_at,
+                func.coalesce(reminder_counts.c.reminder_count, 0),
+            )
             .join(QRToken, Order.id == QRToken.order_id)
+            .outerjoin(reminder_counts, reminder_counts.c.order_id == Order.id)
             .filter(Order.organization_id == organization_id)
             .filter(Order.status.in_([OrderStatus.TOKEN_ISSUED, OrderStatus.PENDING]))
-            .filter(QRToken.is_active == True)
+            .filter(QRToken.is_valid == True)
             .filter(QRToken.created_at < cutoff)
-            .all()
         )
+        if order_ids:
+            query = query.filter(Order.id.in_(order_ids))
+        return query
 
-        # Count existing reminders per order
-        reminder_counts = {}
-        for order in orders:
-            reminder_count = (
-                self.db.query(Notification)
-                .filter(Notification.order_id == order.id)
-                .filter(Notification.type == NotificationType.REMINDER)
-                .count()
-            )
-            reminder_counts[order.id] = reminder_count
+    def get_pending_reminders(
+        self,
+        organization_id: int,
+        hours_since_token: int = 24,
+        page: int = 1,
+        limit: int = 100,
+    ) -> dict:
+        """Get orders that are eligible for reminder notifications (paged, oldest token first)."""
+        query = self._reminder_candidates(organization_id, hours_since_token)
+        total = query.count()
 
+        offset = (page - 1) * limit
+        rows = query.order_by(QRToken.created_at.asc(), Order.id.asc()).offset(offset).limit(limit).all()
+
+        now = datetime.now(timezone.utc)
         items = []
-        for order in orders:
-            token_created = order.qr_token.created_at if order.qr_token else None
+        for order, token_created, reminder_count in rows:
             hours_ago = None
             if token_created:
-                delta = datetime.now(timezone.utc) - token_created.replace(tzinfo=timezone.utc)
+                delta = now - token_created.replace(tzinfo=timezone.utc)
                 hours_ago = round(delta.total_seconds() / 3600, 1)
 
             items.append({
@@ -1202,88 +1506,83 @@ class AdminService:
                 "sender_name": order.sender_name,
                 "token_created_at": token_created.isoformat() if token_created else None,
                 "hours_since_token": hours_ago,
-                "reminder_count": reminder_counts.get(order.id, 0),
+                "reminder_count": int(reminder_count or 0),
             })
 
         return {
-            "total": len(items),
+            "total": total,
+            "page": page,
+            "limit": limit,
+            "total_pages": (total + limit - 1) // limit,
             "orders": items,
         }
 
-    async def send_reminders(
+    def send_reminders(
         self,
         organization_id: int,
-        background_tasks: BackgroundTasks,
         order_ids: Optional[list[int]] = None,
         hours_since_token: int = 24,
         max_reminders: int = 1,
+        chunk_size: int = 500,
     ) -> dict:
-        """Send reminder notifications to orders pending proof upload."""
-        cutoff = datetime.now(timezone.utc) - timedelta(hours=hours_since_token)
-
-        # Build query
-        query = (
-            self.db.query(Order)
-            .join(QRToken, Order.id == QRToken.order_id)
-            .filter(Order.organization_id == organization_id)
-            .filter(Order.status.in_([OrderStatus.TOKEN_ISSUED, OrderStatus.PENDING]))
-            .filter(QRToken.is_active == True)
-            .filter(QRToken.created_at < cutoff)
-        )
-
-        if order_ids:
-            query = query.filter(Order.id.in_(order_ids))
-
-        orders = query.all()
+        """Queue reminder notifications for orders pending proof upload (delivered by the worker).
 
+        Candidates are walked in keyset pages of chunk_size (by order id); each
+        page is one grouped query and one commit.
+        """
         results: list[dict] = []
+        total = 0
         sent_count = 0
         skipped_count = 0
         failed_count = 0
 
-        for order in orders:
-            # Check reminder count
-            existing_reminders = (
-                self.db.query(Notification)
-                .filter(Notification.order_id == order.id)
-                .filter(Notification.type == NotificationType.REMINDER)
-                .count()
+        last_id = 0
+        while True:
+            rows = (
+                self._reminder_candidates(organization_id, hours_since_token, order_ids)
+                .filter(Order.id > last_id)
+                .order_by(Order.id.asc())
+                .limit(chunk_size)
+                .all()
             )
+            if not rows:
+                break
+            last_id = rows[-1][0].id
+            total += len(rows)
 
-            if existing_reminders >= max_reminders:
-                results.append({
-                    "order_id": order.id,
-                    "order_number": order.order_number,
-                    "success": False,
-                    "message": f"Skipped: already sent {existing_reminders} reminder(s)",
-                })
-                skipped_count += 1
-                continue
+            for order, _token_created, existing_reminders in rows:
+                if existing_reminders >= max_reminders:
+                    results.append({
+                        "order_id": order.id,
+                        "order_number": order.order_number,
+                        "success": False,
+                        "message": f"Skipped: already sent {existing_reminders} reminder(s)",
+                    })
+                    skipped_count += 1
+                    continue
 
-            try:
-                # Send reminder notification
-                await self.notification_service.send_reminder_notification(
-                    order=order,
-                    background_tasks=background_tasks,
-                )
-                results.append({
-                    "order_id": order.id,
-                    "order_number": order.order_number,
-                    "success": True,
-                    "message": "Reminder sent",
-                })
-                sent_count += 1
-            except Exception as e:
-                results.append({
-                    "order_id": order.id,
-                    "order_number": order.order_number,
-                    "success": False,
-                    "error": str(e),
-                })
-                failed_count += 1
+                try:
+                    self.notification_service.enqueue_reminder(order)
+                    results.append({
+                        "order_id": order.id,
+                        "order_number": order.order_number,
+                        "success": True,
+                        "message": "Reminder queued",
+                    })
+                    sent_count += 1
+                except Exception as e:
+                    results.append({
+                        "order_id": order.id,
+                        "order_number": order.order_number,
+                        "success": False,
+                        "error": str(e),
+                    })
+                    failed_count += 1
+
+            self.db.commit()
 
         return {
-            "total": len(orders),
+            "total": total,
             "sent_count": sent_count,
             "skipped_count": skipped_count,
             "failed_count": failed_count,
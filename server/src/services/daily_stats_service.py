@@ -0,0 +1,466 @@
+"""
+Incrementally maintained org_daily_stats rollup.
+
+An after_flush listener turns ORM inserts/updates/deletes of Order, Proof and
+Notification into per-(organization, KST day) counter deltas and upserts them
+in the same transaction. Bulk Query.update()/delete() and Core INSERTs bypass
+the ORM and must apply deltas themselves (see record_order_deleted,
+record_orders_inserted and record_order_status_changed); anything else that drifts is repaired by
+DailyStatsService.rebuild (scripts/rebuild_daily_stats.py).
+
+Contention: the upsert row-locks (organization, day) until the writing
+transaction commits, so concurrent order / notification writes of one
+organization serialize on today's row. Short request transactions barely
+notice; a long one does, so long transactions (strict imports) call
+defer_deltas() and apply_deferred() right before their commit: deltas are
+accumulated in session.info and the row lock is held only for the commit.
+Rows are always upserted in (organization, day) order so two writers never
+wait on each other in opposite order (deadlock).
+
+Rebuild vs. writers: on PostgreSQL every delta upsert first takes a shared
+transaction-level advisory lock on its organization and rebuild takes the
+exclusive one, so a rebuild waits for in-flight writers to commit and holds
+new ones off until it commits; nothing is counted twice or lost between its
+aggregation and its DELETE / INSERT.
+"""
+
+import logging
+from collections import Counter, defaultdict
+from datetime import date, datetime, time, timedelta, timezone
+from typing import Iterable, Optional
+from zoneinfo import ZoneInfo
+
+from sqlalchemy import delete, event, func, inspect, literal_column, select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+from sqlalchemy.orm.attributes import NO_VALUE
+
+from src.core.config import settings
+from src.models import (
+    Notification,
+    NotificationChannel,
+    NotificationStatus,
+    Order,
+    OrderStatus,
+    OrgDailyStats,
+    Organization,
+    Proof,
+    ProofType,
+)
+
+logger = logging.getLogger(__name__)
+
+KST = ZoneInfo("Asia/Seoul")
+
+COMPLETED_STATUSES = (OrderStatus.PROOF_UPLOADED, OrderStatus.NOTIFIED, OrderStatus.COMPLETED)
+SENT_STATUSES = (NotificationStatus.SENT, NotificationStatus.FALLBACK_SENT, NotificationStatus.MOCK_SENT)
+
+COUNTERS = (
+    "orders_created",
+    "orders_completed",
+    "proofs_uploaded",
+    "notifications_total",
+    "alimtalk_sent",
+    "alimtalk_failed",
+    "sms_sent",
+    "sms_failed",
+)
+
+
+def kst_day(column, dialect_name: str):
+    """KST calendar day of a timestamptz column, as a GROUP BY expression."""
+    if dialect_name == "postgresql":
+        # Literals (not bind params) so SELECT and GROUP BY render the same expression
+        return func.date_trunc(literal_column("'day'"), func.timezone(literal_column("'Asia/Seoul'"), column))
+    # SQLite (tests): KST has no DST, so a fixed offset is exact
+    return func.date(column, "+9 hours")
+
+
+def day_key(value) -> date:
+    """Normalize a day bucket (datetime/date on Postgres, text on SQLite) to a date."""
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    return date.fromisoformat(str(value)[:10])
+
+
+# pg_advisory_xact_lock(class, organization_id) namespace of the rollup
+ADVISORY_LOCK_CLASS = 0x5354  # "ST"
+DEFERRED_KEY = "daily_stats_deferred"
+
+
+def _to_kst_date(value: Optional[datetime]) -> date:
+    # Server-default timestamps are not loaded yet for new rows: they are "now"
+    if value is None or value is NO_VALUE:
+        value = datetime.now(timezone.utc)
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.astimezone(KST).date()
+
+
+def _order_counters(status) -> Counter:
+    return Counter({"orders_completed": 1}) if status in COMPLETED_STATUSES else Counter()
+
+
+def _notification_counters(channel, status) -> Counter:
+    prefix = "alimtalk" if channel == NotificationChannel.ALIMTALK else "sms"
+    if status in SENT_STATUSES:
+        return Counter({f"{prefix}_sent": 1})
+    if status == NotificationStatus.FAILED:
+        return Counter({f"{prefix}_failed": 1})
+    return Counter()
+
+
+def _previous(obj, attr: str):
+    """Value before this flush (None if it was never loaded)."""
+    hist = inspect(obj).attrs[attr].history
+    if hist.deleted:
+        return hist.deleted[0]
+    if hist.unchanged:
+        return hist.unchanged[0]
+    return None
+
+
+def _loaded(obj, attr: str):
+    return inspect(obj).dict.get(attr)
+
+
+class _Deltas:
+    """Counter deltas keyed by (organization_id, day), or by order id until resolved."""
+
+    def __init__(self):
+        self.by_org: dict[tuple[int, date], Counter] = defaultdict(Counter)
+        self.by_order: dict[tuple[int, date], Counter] = defaultdict(Counter)
+
+    def add(self, obj, day: date, delta: Counter, sign: int = 1) -> None:
+        if not delta:
+            return
+        if isinstance(obj, Order):
+            target = self.by_org[(obj.organization_id, day)]
+        else:
+            target = self.by_order[(obj.order_id, day)]
+        if sign > 0:
+            target.update(delta)
+        else:
+            target.subtract(delta)
+
+
+def _collect(session: Session) -> _Deltas:
+    deltas = _Deltas()
+
+    for obj in session.new:
+        if isinstance(obj, Order):
+            day = _to_kst_date(_loaded(obj, "created_at"))
+            deltas.add(obj, day, Counter({"orders_created": 1}) + _order_counters(obj.status))
+        elif isinstance(obj, Proof) and obj.proof_type == ProofType.AFTER:
+            deltas.add(obj, _to_kst_date(_loaded(obj, "uploaded_at")), Counter({"proofs_uploaded": 1}))
+        elif isinstance(obj, Notification):
+            day = _to_kst_date(_loaded(obj, "created_at"))
+            deltas.add(obj, day, Counter({"notifications_total": 1}) + _notification_counters(obj.channel, obj.status))
+
+    for obj in session.dirty:
+        if isinstance(obj, Order) and inspect(obj).attrs.status.history.has_changes():
+            day = _to_kst_date(obj.created_at)
+            deltas.add(obj, day, _order_counters(_previous(obj, "status")), sign=-1)
+            deltas.add(obj, day, _order_counters(obj.status))
+        elif isinstance(obj, Notification) and inspect(obj).attrs.status.history.has_changes():
+            day = _to_kst_date(obj.created_at)
+            deltas.add(obj, day, _notification_counters(obj.channel, _previous(obj, "status")), sign=-1)
+            deltas.add(obj, day, _notification_counters(obj.channel, obj.status))
+
+    for obj in session.deleted:
+        if isinstance(obj, Order):
+            day = _to_kst_date(_loaded(obj, "created_at"))
+            deltas.add(obj, day, Counter({"orders_created": 1}) + _order_counters(obj.status), sign=-1)
+        elif isinstance(obj, Proof) and obj.proof_type == ProofType.AFTER:
+            deltas.add(obj, _to_kst_date(_loaded(obj, "uploaded_at")), Counter({"proofs_uploaded": 1}), sign=-1)
+        elif isinstance(obj, Notification):
+            day = _to_kst_date(_loaded(obj, "created_at"))
+            deltas.add(
+                obj,
+                day,
+                Counter({"notifications_total": 1}) + _notification_counters(obj.channel, obj.status),
+                sign=-1,
+            )
+
+    return deltas
+
+
+def _insert_for(dialect_name: str):
+    if dialect_name == "postgresql":
+        return postgresql.insert
+    if dialect_name == "sqlite":
+        return sqlite.insert
+    return None
+
+
+def apply_deltas(connection, by_org: dict[tuple[int, date], Counter]) -> None:
+    """Upsert counter deltas (INSERT ... ON CONFLICT DO UPDATE SET col = col + delta)."""
+    insert = _insert_for(connection.dialect.name)
+    if insert is None:
+        logger.warning(f"org_daily_stats not maintained on dialect {connection.dialect.name}")
+        return
+
+    table = OrgDailyStats.__table__
+    if connection.dialect.name == "postgresql":
+        for organization_id in sorted({org_id for org_id, _ in by_org}):
+            connection.execute(
+                select(func.pg_advisory_xact_lock_shared(ADVISORY_LOCK_CLASS, organization_id))
+            )
+    # Fixed lock order across transactions (see module docstring)
+    for (organization_id, day), counter in sorted(by_org.items()):
+        values = {name: counter.get(name, 0) for name in COUNTERS if counter.get(name, 0)}
+        if not values:
+            continue
+        stmt = insert(table).values(organization_id=organization_id, day=day, **values)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[table.c.organization_id, table.c.day],
+            set_={name: table.c[name] + stmt.excluded[name] for name in values} | {"updated_at": func.now()},
+        )
+        connection.execute(stmt)
+
+
+def _apply(db: Session, by_org: dict[tuple[int, date], Counter]) -> None:
+    deferred = db.info.get(DEFERRED_KEY)
+    if deferred is None:
+        apply_deltas(db.connection(), by_org)
+        return
+    for key, counter in by_org.items():
+        deferred[key].update(counter)
+
+
+def defer_deltas(db: Session) -> None:
+    """Accumulate this session's deltas instead of upserting them per flush."""
+    db.info.setdefault(DEFERRED_KEY, defaultdict(Counter))
+
+
+def apply_deferred(db: Session) -> None:
+    """Upsert the deltas accumulated since defer_deltas(); call right before commit."""
+    deferred = db.info.pop(DEFERRED_KEY, None)
+    if deferred:
+        apply_deltas(db.connection(), deferred)
+
+
+def discard_deferred(db: Session) -> None:
+    """Drop accumulated deltas (after a rollback) and stop deferring."""
+    db.info.pop(DEFERRED_KEY, None)
+
+
+def _resolve_orgs(connection, by_order: dict[tuple[int, date], Counter], into: dict) -> None:
+    order_ids = {order_id for order_id, _ in by_order}
+    if not order_ids:
+        return
+    org_by_order = dict(connection.execute(select(Order.id, Order.organization_id).where(Order.id.in_(order_ids))).all())
+    for (order_id, day), counter in by_order.items():
+        organization_id = org_by_order.get(order_id)
+        if organization_id is None:
+            continue
+        into[(organization_id, day)].update(counter)
+
+
+@event.listens_for(Session, "after_flush")
+def _update_daily_stats(session: Session, flush_context) -> None:
+    if not settings.STATS_ROLLUP_ENABLED:
+        return
+    deltas = _collect(session)
+    if not deltas.by_org and not deltas.by_order:
+        return
+    connection = session.connection()
+    _resolve_orgs(connection, deltas.by_order, deltas.by_org)
+    _apply(session, deltas.by_org)
+
+
+def record_order_deleted(db: Session, order_id: int) -> None:
+    """Subtract an order's contributions before it is bulk-deleted (Query.delete bypasses flush)."""
+    if not settings.STATS_ROLLUP_ENABLED:
+        return
+    connection = db.connection()
+    dialect = connection.dialect.name
+    by_org: dict[tuple[int, date], Counter] = defaultdict(Counter)
+
+    order = connection.execute(
+        select(Order.organization_id, Order.created_at, Order.status).where(Order.id == order_id)
+    ).first()
+    if order is None:
+        return
+    organization_id = order.organization_id
+
+    notif_day = kst_day(Notification.created_at, dialect)
+    for day_value, channel, status, count in connection.execute(
+        select(notif_day, Notification.channel, Notification.status, func.count())
+        .where(Notification.order_id == order_id)
+        .group_by(notif_day, Notification.channel, Notification.status)
+    ):
+        counter = Counter({"notifications_total": 1}) + _notification_counters(channel, status)
+        by_org[(organization_id, day_key(day_value))].subtract({k: v * count for k, v in counter.items()})
+
+    proof_day = kst_day(Proof.uploaded_at, dialect)
+    for day_value, count in connection.execute(
+        select(proof_day, func.count())
+        .where(Proof.order_id == order_id, Proof.proof_type == ProofType.AFTER)
+        .group_by(proof_day)
+    ):
+        by_org[(organization_id, day_key(day_value))].subtract({"proofs_uploaded": count})
+
+    _apply(db, by_org)
+
+
+def record_orders_inserted(db: Session, organization_id: int, count: int) -> None:
+    """Add bulk-inserted PENDING orders (their created_at is "now")."""
+    if not settings.STATS_ROLLUP_ENABLED or count <= 0:
+        return
+    counter = Counter({"orders_created": count})
+    _apply(db, {(organization_id, _to_kst_date(None)): counter})
+
+
+def record_order_status_changed(
+    db: Session,
+    orders: Iterable[tuple[int, Optional[datetime], OrderStatus]],
+    new_status: OrderStatus,
+) -> None:
+    """Apply orders_completed deltas for a bulk status UPDATE.
+
+    orders: (organization_id, created_at, previous status) of every updated order.
+    """
+    if not settings.STATS_ROLLUP_ENABLED:
+        return
+    by_org: dict[tuple[int, date], Counter] = defaultdict(Counter)
+    for organization_id, created_at, previous in orders:
+        key = (organization_id, _to_kst_date(created_at))
+        by_org[key].update(_order_counters(new_status))
+        by_org[key].subtract(_order_counters(previous))
+    _apply(db, by_org)
+
+
+class DailyStatsService:
+    """Read and rebuild the org_daily_stats rollup."""
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def get_range(self, organization_id: int, start_date: date, end_date: date) -> dict[date, OrgDailyStats]:
+        rows = (
+            self.db.query(OrgDailyStats)
+            .filter(OrgDailyStats.organization_id == organization_id)
+            .filter(OrgDailyStats.day >= start_date)
+            .filter(OrgDailyStats.day <= end_date)
+            .all()
+        )
+        return {row.day: row for row in rows}
+
+    def totals(self, organization_id: int, start_date: date, end_date: date) -> dict[str, int]:
+        sums = (
+            self.db.query(*[func.coalesce(func.sum(getattr(OrgDailyStats, name)), 0) for name in COUNTERS])
+            .filter(OrgDailyStats.organization_id == organization_id)
+            .filter(OrgDailyStats.day >= start_date)
+            .filter(OrgDailyStats.day <= end_date)
+            .one()
+        )
+        return {name: int(value) for name, value in zip(COUNTERS, sums)}
+
+    def rebuild(
+        self,
+        organization_id: Optional[int] = None,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+    ) -> int:
+        """Recompute rows from raw tables (whole history by default). Returns rows written.
+
+        Runs in the current transaction; the caller commits. On PostgreSQL it
+        first takes the organizations' exclusive rollup advisory locks (see
+        module docstring), which are held until that commit.
+        """
+        connection = self.db.connection()
+        dialect = connection.dialect.name
+        if dialect == "postgresql":
+            if organization_id is not None:
+                org_ids = [organization_id]
+            else:
+                org_ids = connection.execute(select(Organization.id).order_by(Organization.id)).scalars().all()
+            for org_id in org_ids:
+                connection.execute(select(func.pg_advisory_xact_lock(ADVISORY_LOCK_CLASS, org_id)))
+
+        def scoped(stmt, ts_column):
+            if organization_id is not None:
+                stmt = stmt.where(Order.organization_id == organization_id)
+            if start_date is not None:
+                start_utc = datetime.combine(start_date, time.min).replace(tzinfo=KST).astimezone(timezone.utc)
+                stmt = stmt.where(ts_column >= start_utc)
+            if end_date is not None:
+                end_utc = datetime.combine(end_date + timedelta(days=1), time.min).replace(tzinfo=KST).astimezone(timezone.utc)
+                stmt = stmt.where(ts_column < end_utc)
+            return stmt
+
+        by_org: dict[tuple[int, date], Counter] = defaultdict(Counter)
+
+        order_day = kst_day(Order.created_at, dialect)
+        stmt = scoped(
+            select(
+                Order.organization_id,
+                order_day,
+                func.count(),
+                func.count().filter(Order.status.in_(COMPLETED_STATUSES)),
+            ).group_by(Order.organization_id, order_day),
+            Order.created_at,
+        )
+        for org_id, day_value, created, completed in connection.execute(stmt):
+            by_org[(org_id, day_key(day_value))].update(orders_created=created, orders_completed=completed)
+
+        proof_day = kst_day(Proof.uploaded_at, dialect)
+        stmt = scoped(
+            select(Order.organization_id, proof_day, func.count())
+            .select_from(Proof)
+            .join(Order, Order.id == Proof.order_id)
+            .where(Proof.proof_type == ProofType.AFTER)
+            .group_by(Order.organization_id, proof_day),
+            Proof.uploaded_at,
+        )
+        for org_id, day_value, uploaded in connection.execute(stmt):
+            by_org[(org_id, day_key(day_value))].update(proofs_uploaded=uploaded)
+
+        notif_day = kst_day(Notification.created_at, dialect)
+        sent = Notification.status.in_(SENT_STATUSES)
+        failed = Notification.status == NotificationStatus.FAILED
+        alimtalk = Notification.channel == NotificationChannel.ALIMTALK
+        sms = Notification.channel == NotificationChannel.SMS
+        stmt = scoped(
+            select(
+                Order.organization_id,
+                notif_day,
+                func.count(),
+                func.count().filter(alimtalk, sent),
+                func.count().filter(alimtalk, failed),
+                func.count().filter(sms, sent),
+                func.count().filter(sms, failed),
+            )
+            .select_from(Notification)
+            .join(Order, Order.id == Notification.order_id)
+            .group_by(Order.organization_id, notif_day),
+            Notification.created_at,
+        )
+        for org_id, day_value, total, at_sent, at_failed, s_sent, s_failed in connection.execute(stmt):
+            by_org[(org_id, day_key(day_value))].update(
+                notifications_total=total,
+                alimtalk_sent=at_sent,
+                alimtalk_failed=at_failed,
+                sms_sent=s_sent,
+                sms_failed=s_failed,
+            )
+
+        clear = delete(OrgDailyStats)
+        if organization_id is not None:
+            clear = clear.where(OrgDailyStats.organization_id == organization_id)
+        if start_date is not None:
+            clear = clear.where(OrgDailyStats.day >= start_date)
+        if end_date is not None:
+            clear = clear.where(OrgDailyStats.day <= end_date)
+        connection.execute(clear)
+
+        rows = [
+            {"organization_id": org_id, "day": day, **{name: counter.get(name, 0) for name in COUNTERS}}
+            for (org_id, day), counter in by_org.items()
+        ]
+        if rows:
+            connection.execute(OrgDailyStats.__table__.insert(), rows)
+        return len(rows)
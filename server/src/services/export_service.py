@@ -0,0 +1,148 @@
+"""
+Order CSV export jobs.
+
+The request path only enqueues a BackgroundJob; the job worker runs
+run_order_export, which reads orders in keyset chunks, fans the CPU-bound
+Fernet decrypts out to a process pool while the next chunk is fetched, and
+writes the CSV to a temp file that is then streamed into private storage
+(see job_service). Progress is committed after every chunk so clients can
+poll GET /admin/jobs/{id}.
+"""
+
+import csv
+import io
+import logging
+import os
+import tempfile
+import uuid
+from collections import deque
+from concurrent.futures import Executor
+from datetime import date, datetime, timezone
+from typing import Optional
+from zoneinfo import ZoneInfo
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from src.core.config import settings
+from src.models import BackgroundJob, JobKind, Order
+from src.services.admin_service import AdminService, decrypt_export_phones
+from src.services.job_service import JobService, refresh_lock
+from src.services.storage_service import StorageService
+
+logger = logging.getLogger(__name__)
+
+
+def decrypt_pool_size() -> int:
+    """Worker processes for export decrypts (EXPORT_DECRYPT_PROCESSES, 0 = CPU count)."""
+    return settings.EXPORT_DECRYPT_PROCESSES or os.cpu_count() or 1
+
+
+def decrypt_export_chunk(pairs: list[tuple[Optional[str], Optional[str]]]) -> list[tuple[str, str]]:
+    """Process-pool entry point: decrypt (sender, recipient) ciphertext pairs."""
+    return [decrypt_export_phones(sender, recipient) for sender, recipient in pairs]
+
+
+class ExportService:
+    def __init__(self, db: Session, storage: Optional[StorageService] = None):
+        self.db = db
+        self.storage = storage
+
+    def enqueue_order_export(
+        self,
+        organization_id: int,
+        status: Optional[str] = None,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+        created_by: Optional[str] = None,
+    ) -> BackgroundJob:
+        params = {
+            "status": status,
+            "start_date": start_date.isoformat() if start_date else None,
+            "end_date": end_date.isoformat() if end_date else None,
+        }
+        return JobService(self.db).enqueue(organization_id, JobKind.ORDER_EXPORT, params, created_by=created_by)
+
+    def run_order_export(
+        self,
+        job: BackgroundJob,
+        pool: Optional[Executor] = None,
+        chunk_rows: Optional[int] = None,
+    ) -> None:
+        """Build the CSV for an ORDER_EXPORT job and store it (sets file_key/result).
+
+        Without a pool, phones are decrypted inline.
+        """
+        chunk_rows = chunk_rows or settings.EXPORT_CHUNK_ROWS
+        params = job.params or {}
+        admin = AdminService(self.db)
+        stmt = admin.export_query(
+            job.organization_id,
+            status=params.get("status"),
+            start_date=date.fromisoformat(params["start_date"]) if params.get("start_date") else None,
+            end_date=date.fromisoformat(params["end_date"]) if params.get("end_date") else None,
+        )
+
+        job.total_rows = self.db.scalar(select(func.count()).select_from(stmt.order_by(None).subquery()))
+        job.processed_rows = 0
+        refresh_lock(self.db, job)
+        self.db.commit()
+
+        kst = ZoneInfo("Asia/Seoul")
+        # Keep a few chunks decrypting while the next one is fetched
+        max_in_flight = 2 * decrypt_pool_size()
+
+        with tempfile.TemporaryFile() as raw:
+            out = io.TextIOWrapper(raw, encoding="utf-8", newline="")
+            writer = csv.writer(out)
+            writer.writerow(admin.EXPORT_HEADER)
+
+            pending: deque = deque()
+
+            def write_chunk(rows, phones) -> None:
+                for row, (sender_phone, recipient_phone) in zip(rows, phones):
+                    writer.writerow(admin.export_row(row, kst, sender_phone, recipient_phone))
+                job.processed_rows += len(rows)
+                refresh_lock(self.db, job)
+                self.db.commit()  # progress for pollers
+
+            # Keyset chunks on the primary key (short queries, so progress commits
+            # never invalidate an open cursor); newest first like the live export.
+            by_id = stmt.order_by(None).order_by(Order.id.desc())
+            after_id = None
+            while True:
+                chunk_stmt = by_id if after_id is None else by_id.where(Order.id < after_id)
+                rows = self.db.execute(chunk_stmt.limit(chunk_rows)).all()
+                if not rows:
+                    break
+                after_id = rows[-1].id
+
+                pairs = [(r.sender_phone_encrypted, r.recipient_phone_encrypted) for r in rows]
+                if pool is None:
+                    write_chunk(rows, decrypt_export_chunk(pairs))
+                    continue
+
+                pending.append((rows, pool.submit(decrypt_export_chunk, pairs)))
+                while len(pending) >= max_in_flight:
+                    done_rows, future = pending.popleft()
+                    write_chunk(done_rows, future.result())
+
+            while pending:
+                done_rows, future = pending.popleft()
+                write_chunk(done_rows, future.result())
+
+            out.flush()
+            out.detach()
+            raw.seek(0)
+
+            today = datetime.now(timezone.utc).astimezone(kst).date().isoformat()
+            key = f"exports/{job.organization_id}/{today.replace('-', '/')}/{uuid.uuid4().hex}.csv"
+            stored = (self.storage or StorageService(private=True)).save_upload(key, raw, "text/csv")
+
+        job.file_key = stored.key
+        job.result = {
+            "rows": job.processed_rows,
+            "size": stored.size,
+            "filename": f"orders_{today}.csv",
+        }
+        logger.info(f"Export job {job.id}: {job.processed_rows} rows -> {stored.key}")
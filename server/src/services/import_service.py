@@ -0,0 +1,186 @@
+"""
+Order CSV import jobs.
+
+The request path only stages the upload in storage and enqueues a
+BackgroundJob; the job worker runs run_order_import, which first scans the
+file (row count; in strict mode full validation, so a bad file fails before
+anything is inserted) and then imports it with OrderImporter.
+
+Non-strict imports commit progress together with each batch, so a job
+reclaimed after a worker crash resumes after the last committed row instead
+of inserting it twice. Strict imports run in one transaction: all or nothing.
+The error report (first IMPORT_ERROR_REPORT_LIMIT row errors) is kept in
+job.result. The upload is staged in private storage (job.file_key) and
+deleted once the job finishes.
+"""
+
+import itertools
+import logging
+import uuid
+from concurrent.futures import Executor
+from datetime import datetime, timezone
+from typing import BinaryIO, Optional
+
+from sqlalchemy.orm import Session
+
+from src.core.config import settings
+from src.models import BackgroundJob, JobKind
+from src.services.export_service import decrypt_pool_size
+from src.services.job_service import JobLostError, JobService, refresh_lock
+from src.services.proof_snapshot_service import ProofSnapshotService
+from src.services.order_import import ImportAbortedError, ImportResult, OrderImporter, iter_csv_rows, parse_order_row
+from src.services.storage_service import StorageService
+
+logger = logging.getLogger(__name__)
+
+
+class ImportService:
+    def __init__(self, db: Session, storage: Optional[StorageService] = None):
+        self.db = db
+        self.storage = storage
+
+    def enqueue_order_import(
+        self,
+        organization_id: int,
+        file: BinaryIO,
+        filename: str,
+        strict: bool = False,
+        mode: str = "insert",
+        created_by: Optional[str] = None,
+    ) -> BackgroundJob:
+        """Stage the upload in storage and queue it (FileTooLargeError past IMPORT_MAX_FILE_SIZE)."""
+        today = datetime.now(timezone.utc).strftime("%Y/%m/%d")
+        key = f"imports/{organization_id}/{today}/{uuid.uuid4().hex}.csv"
+        stored = (self.storage or StorageService(private=True)).save_upload(
+            key, file, "text/csv", max_size=settings.IMPORT_MAX_FILE_SIZE
+        )
+        params = {
+            "file_key": stored.key,
+            "filename": filename,
+            "size": stored.size,
+            "strict": strict,
+            "mode": mode,
+        }
+        return JobService(self.db).enqueue(
+            organization_id, JobKind.ORDER_IMPORT, params, created_by=created_by, file_key=stored.key
+        )
+
+    def run_order_import(
+        self,
+        job: BackgroundJob,
+        pool: Optional[Executor] = None,
+        batch_size: Optional[int] = None,
+    ) -> None:
+        """Import the staged CSV of an ORDER_IMPORT job (sets total_rows/processed_rows/result).
+
+        Raises ImportAbortedError when a strict import fails (nothing inserted).
+        """
+        params = job.params or {}
+        strict = bool(params.get("strict"))
+        storage = self.storage or StorageService(private=True)
+        limit = settings.IMPORT_ERROR_REPORT_LIMIT
+
+        # Non-strict progress is committed with its batch: continue after it
+        start = 0 if strict else (job.processed_rows or 0)
+        errors_before: list[dict] = []
+        counts = (0, 0, 0, 0)
+        if start:
+            summary = job.result or {}
+            errors_before = list(summary.get("errors", []))
+            counts = (
+                summary.get("created_count", 0),
+                summary.get("updated_count", 0),
+                summary.get("unchanged_count", 0),
+                summary.get("error_count", 0),
+            )
+
+        def report(phase: str, result: Optional[ImportResult] = None) -> dict:
+            result = result or ImportResult()
+            created, updated, unchanged, error_count = counts
+            error_count += len(result.errors)
+            return {
+                "created_count": created + len(result.created_ids),
+                "updated_count": updated + len(result.updated_ids),
+                "unchanged_count": unchanged + result.unchanged,
+                "error_count": error_count,
+                "errors": (errors_before + result.errors)[:limit],
+                "errors_truncated": error_count > limit,
+                "phase": phase,
+            }
+
+        lost = False
+        try:
+            with storage.open_file(params["file_key"]) as f:
+                job.result = report("scanning")
+                refresh_lock(self.db, job)
+                self.db.commit()
+                job.total_rows, strict_errors, strict_error_count = self._scan(f, strict, limit)
+                if strict_error_count:
+                    job.result = {
+                        **report("scanning"),
+                        "error_count": strict_error_count,
+                        "errors": strict_errors,
+                        "errors_truncated": strict_error_count > limit,
+                    }
+                    refresh_lock(self.db, job)
+                    self.db.commit()
+                    raise ImportAbortedError(strict_errors[0]["row"], strict_errors[0]["message"])
+
+                job.processed_rows = start
+                job.result = report("importing")
+                refresh_lock(self.db, job)
+                self.db.commit()
+
+                def on_batch(result: ImportResult) -> None:
+                    job.processed_rows = start + result.processed
+                    job.result = report("importing", result)
+                    refresh_lock(self.db, job)
+
+                f.seek(0)
+                importer = OrderImporter(
+                    self.db,
+                    job.organization_id,
+                    strict=strict,
+                    mode=params.get("mode", "insert"),
+                    batch_size=batch_size,
+                    pool=pool,
+                    pool_size=decrypt_pool_size(),
+                    on_batch=on_batch,
+                )
+                result = importer.run(itertools.islice(iter_csv_rows(f), start, None), first_row=start + 1)
+                ProofSnapshotService(self.db).republish_later(job.organization_id, result.unpublished)
+        except JobLostError:
+            lost = True
+            raise
+        finally:
+            # Uploads carry phone numbers; drop them once the job is over
+            # (a crashed worker never gets here, and a worker that lost the
+            # job leaves it to the new owner)
+            if not lost:
+                storage.delete_file(params["file_key"])
+                job.file_key = None
+
+        job.result = {**job.result, "phase": "done"}
+        logger.info(
+            f"Import job {job.id}: {job.processed_rows} rows, "
+            f"{job.result['created_count']} created, {job.result['updated_count']} updated, "
+            f"{job.result['error_count']} errors"
+        )
+
+    @staticmethod
+    def _scan(f: BinaryIO, strict: bool, limit: int) -> tuple[int, list[dict], int]:
+        """Count rows; in strict mode also validate them. Returns (rows, errors[:limit], error count)."""
+        total = 0
+        errors: list[dict] = []
+        error_count = 0
+        for idx, r in enumerate(iter_csv_rows(f), start=1):
+            total = idx
+            if not strict:
+                continue
+            try:
+                parse_order_row(r)
+            except ValueError as e:
+                error_count += 1
+                if len(errors) < limit:
+                    errors.append({"row": idx, "message": str(e)})
+        return total, errors, error_count
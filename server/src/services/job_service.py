@@ -0,0 +1,158 @@
+"""
+Background admin jobs: enqueue, look up and serialize for polling.
+
+Jobs are executed by the job worker (src/workers/job_worker.py); see
+ExportService for the ORDER_EXPORT handler.
+
+Job files (export CSVs, staged import uploads) hold phone numbers. They live
+in private storage (StorageService(private=True)), are downloaded through the
+authenticated GET /admin/jobs/{id}/download and are deleted
+EXPORT_RETENTION_HOURS after the job finished (purge_expired_files, run by
+the job worker).
+
+Lock ownership: the worker puts its id in db.info[LOCK_OWNER_KEY]; handlers
+call refresh_lock() with every progress commit, which keeps locked_at fresh
+(so long jobs are not reclaimed as stale) and raises JobLostError once
+another worker has taken the job over.
+"""
+
+import logging
+from datetime import datetime, timedelta, timezone
+from typing import BinaryIO, Optional
+
+from fastapi import HTTPException
+from sqlalchemy import update
+from sqlalchemy.orm import Session
+
+from src.core.config import settings
+from src.models import BackgroundJob, JobKind, JobStatus
+from src.services.storage_service import StorageService
+
+logger = logging.getLogger(__name__)
+
+LOCK_OWNER_KEY = "job_lock_owner"
+
+
+class JobLostError(Exception):
+    """The job's lock went stale and another worker claimed it; stop without writing."""
+
+
+def refresh_lock(db: Session, job: BackgroundJob) -> None:
+    """Bump job.locked_at if this session's worker still owns the job (commit is the caller's).
+
+    On 0 rows the transaction is rolled back and JobLostError raised. Inside
+    one long transaction (strict imports) the uncommitted UPDATE keeps the
+    row locked, so other workers' SKIP LOCKED claims pass it over. No-op
+    outside the job worker.
+    """
+    owner = db.info.get(LOCK_OWNER_KEY)
+    if owner is None:
+        return
+    job_id = job.id
+    hit = db.execute(
+        update(BackgroundJob)
+        .where(
+            BackgroundJob.id == job_id,
+            BackgroundJob.locked_by == owner,
+            BackgroundJob.status == JobStatus.RUNNING,
+        )
+        .values(locked_at=datetime.now(timezone.utc))
+        .execution_options(synchronize_session=False)
+    ).rowcount
+    if not hit:
+        db.rollback()
+        raise JobLostError(f"JOB_LOST: job {job_id} is no longer locked by {owner}")
+
+
+class JobService:
+    def __init__(self, db: Session, storage: Optional[StorageService] = None):
+        self.db = db
+        self.storage = storage
+
+    def enqueue(
+        self,
+        organization_id: int,
+        kind: JobKind,
+        params: Optional[dict] = None,
+        created_by: Optional[str] = None,
+        file_key: Optional[str] = None,
+    ) -> BackgroundJob:
+        job = BackgroundJob(
+            organization_id=organization_id,
+            kind=kind,
+            status=JobStatus.PENDING,
+            params=params or {},
+            created_by=created_by,
+            file_key=file_key,
+            processed_rows=0,
+            attempts=0,
+        )
+        self.db.add(job)
+        self.db.commit()
+        self.db.refresh(job)
+        return job
+
+    def get(self, job_id: int, organization_id: Optional[int] = None) -> Optional[BackgroundJob]:
+        q = self.db.query(BackgroundJob).filter(BackgroundJob.id == job_id)
+        if organization_id is not None:
+            q = q.filter(BackgroundJob.organization_id == organization_id)
+        return q.first()
+
+    def open_download(self, job_id: int, organization_id: Optional[int] = None) -> tuple[BinaryIO, str]:
+        """(open file, filename) of a finished export; caller closes the file."""
+        job = self.get(job_id, organization_id=organization_id)
+        if not job:
+            raise HTTPException(status_code=404, detail="JOB_NOT_FOUND")
+        if job.kind != JobKind.ORDER_EXPORT or job.status != JobStatus.DONE:
+            raise HTTPException(status_code=409, detail="JOB_NOT_DOWNLOADABLE")
+        if not job.file_key:
+            raise HTTPException(status_code=410, detail="EXPORT_EXPIRED")
+        filename = (job.result or {}).get("filename") or f"export_{job.id}.csv"
+        return (self.storage or StorageService(private=True)).open_file(job.file_key), filename
+
+    def purge_expired_files(self) -> int:
+        """Delete files of jobs finished more than EXPORT_RETENTION_HOURS ago. Returns the count.
+
+        Covers export CSVs and staged imports of jobs abandoned before the
+        import could delete its upload.
+        """
+        storage = self.storage or StorageService(private=True)
+        cutoff = datetime.now(timezone.utc) - timedelta(hours=settings.EXPORT_RETENTION_HOURS)
+        jobs = (
+            self.db.query(BackgroundJob)
+            .filter(BackgroundJob.file_key.isnot(None))
+            .filter(BackgroundJob.status.in_([JobStatus.DONE, JobStatus.FAILED]))
+            .filter(BackgroundJob.finished_at < cutoff)
+            .order_by(BackgroundJob.id)
+            .limit(500)
+            .all()
+        )
+        for job in jobs:
+            storage.delete_file(job.file_key)
+            job.file_key = None
+            if job.kind == JobKind.ORDER_EXPORT:
+                job.result = {**(job.result or {}), "expired": True}
+        self.db.commit()
+        if jobs:
+            logger.info(f"Deleted files of {len(jobs)} expired jobs")
+        return len(jobs)
+
+    @staticmethod
+    def to_out(job: BackgroundJob) -> dict:
+        download_url = None
+        if job.kind == JobKind.ORDER_EXPORT and job.status == JobStatus.DONE and job.file_key:
+            # Through the API (auth + org scope), never a public storage URL
+            download_url = f"/api/v1/admin/jobs/{job.id}/download"
+        return {
+            "id": job.id,
+            "kind": job.kind.value,
+            "status": job.status.value,
+            "processed_rows": job.processed_rows or 0,
+            "total_rows": job.total_rows,
+            "result": job.result,
+            "download_url": download_url,
+            "error": job.error,
+            "created_at": job.created_at,
+            "started_at": job.started_at,
+            "finished_at": job.finished_at,
+        }
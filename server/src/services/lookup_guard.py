@@ -0,0 +1,167 @@
+"""
+Existence guard for public lookups (QR tokens, short link codes).
+
+Each worker keeps a Bloom filter of every issued token / code, built at
+startup (build_lookup_guards) and extended in-process whenever this worker
+issues one. Guesses the filter rules out are rejected without a query; the
+filter's false positives that miss in the database are remembered in a
+short-TTL negative cache.
+
+Keys issued by other workers reach this filter through a catch-up query
+(rows with id above the last high-water mark). A filter miss waits for the
+next catch-up: one shared query at most every LOOKUP_GUARD_SYNC_SECONDS that
+every miss arriving meanwhile joins, so an enumeration storm costs one
+indexed query per interval while a key just issued elsewhere is found after
+at most one interval (never rejected). The catch-up re-reads ids from
+LOOKUP_GUARD_SYNC_LOOKBACK_SECONDS back, covering transactions that
+committed after a higher id. Until the filter is built (or when disabled)
+the guard lets everything through.
+"""
+
+import asyncio
+import logging
+import time
+from collections import deque
+from typing import Callable, Optional
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.core.config import settings
+from src.models import QRToken, ShortLink
+from src.utils.bloom_filter import BloomFilter
+from src.utils.ttl_cache import TTLCache
+
+logger = logging.getLogger(__name__)
+
+
+class LookupGuard:
+    """Bloom filter + negative cache over one unique key column."""
+
+    def __init__(self, name: str, id_column, key_column):
+        self.name = name
+        self.id_column = id_column
+        self.key_column = key_column
+        self._filter: Optional[BloomFilter] = None
+        self._negative = TTLCache(
+            max_entries=settings.NEGATIVE_CACHE_MAX_ENTRIES,
+            ttl_seconds=settings.NEGATIVE_CACHE_TTL_SECONDS,
+        )
+        # (monotonic time, max id seen) per sync, oldest first
+        self._watermarks: deque[tuple[float, int]] = deque()
+        self._synced_at = 0.0
+        self._syncing = False
+        self._next_sync: Optional[asyncio.Future] = None  # shared catch-up misses wait on
+        # Set by build_lookup_guards; the shared catch-up must not borrow a request's session
+        self.session_factory: Optional[Callable[[], AsyncSession]] = None
+
+    @property
+    def ready(self) -> bool:
+        return settings.LOOKUP_GUARD_ENABLED and self._filter is not None
+
+    def add(self, key: str) -> None:
+        """Register a newly issued key (safe to call before the commit)."""
+        if self._filter is not None:
+            self._filter.add(key)
+        self._negative.pop(key)
+
+    def record_miss(self, key: str) -> None:
+        """Remember a key the database does not have."""
+        if self.ready:
+            self._negative.set(key, True)
+
+    async def may_exist(self, db: AsyncSession, key: str) -> bool:
+        """False only when the key is known not to exist."""
+        if not key or not self.ready:
+            return True
+        if self._negative.get(key):
+            return False
+        if key in self._filter:
+            return True
+        if self._syncing:
+            return True  # catch-up query already running: let the database answer
+        if self._next_sync is None:
+            self._next_sync = asyncio.ensure_future(self._catch_up(db))
+        try:
+            await asyncio.shield(self._next_sync)
+        except Exception as e:
+            logger.warning(f"Lookup guard {self.name} catch-up failed: {e}")
+            return True
+        return key in self._filter
+
+    async def _catch_up(self, db: AsyncSession) -> None:
+        """Sync once LOOKUP_GUARD_SYNC_SECONDS have passed since the last one."""
+        try:
+            delay = self._synced_at + settings.LOOKUP_GUARD_SYNC_SECONDS - time.monotonic()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            if self.session_factory is None:
+                await self.sync(db)
+            else:
+                async with self.session_factory() as own_db:
+                    await self.sync(own_db)
+        finally:
+            self._next_sync = None
+
+    async def rebuild(self, db: AsyncSession) -> None:
+        """Build a fresh filter from the whole table."""
+        count = await db.scalar(select(func.count()).select_from(self.id_column.table))
+        bloom = BloomFilter(
+            max(settings.LOOKUP_GUARD_MIN_CAPACITY, 2 * (count or 0)),
+            settings.LOOKUP_GUARD_ERROR_RATE,
+        )
+        high_water = 0
+        stream = await db.stream(
+            select(self.id_column, self.key_column).execution_options(yield_per=10000)
+        )
+        async for row_id, key in stream:
+            bloom.add(key)
+            high_water = max(high_water, row_id)
+
+        if self._filter is None:
+            self._watermarks.append((time.monotonic(), high_water))
+        self._filter = bloom
+        self._synced_at = time.monotonic()
+        logger.info(f"Lookup guard {self.name}: {len(bloom)} keys (capacity {bloom.capacity})")
+
+    async def sync(self, db: AsyncSession) -> None:
+        """Catch-up: add keys issued since the lookback watermark."""
+        self._syncing = True
+        try:
+            now = time.monotonic()
+            cutoff = now - settings.LOOKUP_GUARD_SYNC_LOOKBACK_SECONDS
+            while len(self._watermarks) > 1 and self._watermarks[1][0] <= cutoff:
+                self._watermarks.popleft()
+            since = self._watermarks[0][1] if self._watermarks else 0
+            high_water = self._watermarks[-1][1] if self._watermarks else 0
+
+            result = await db.execute(
+                select(self.id_column, self.key_column).where(self.id_column > since)
+            )
+            for row_id, key in result:
+                self.add(key)
+                high_water = max(high_water, row_id)
+            self._watermarks.append((now, high_water))
+            self._synced_at = now
+        finally:
+            self._syncing = False
+
+        if len(self._filter) > self._filter.capacity:
+            await self.rebuild(db)
+
+
+token_guard = LookupGuard("qr_tokens", QRToken.id, QRToken.token)
+short_code_guard = LookupGuard("short_links", ShortLink.id, ShortLink.code)
+
+
+async def build_lookup_guards(session_factory: Callable[[], AsyncSession]) -> None:
+    """Build both filters (startup). On failure the guards stay open."""
+    if not settings.LOOKUP_GUARD_ENABLED:
+        return
+    for guard in (token_guard, short_code_guard):
+        guard.session_factory = session_factory
+        try:
+            async with session_factory() as db:
+                await guard.rebuild(db)
+        except Exception as e:
+            logger.warning(f"Lookup guard {guard.name} not built, lookups unguarded: {e}")
@@ -1,15 +1,23 @@
 import logging
-import asyncio
-from datetime import datetime
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
 from typing import Optional
 
-from fastapi import BackgroundTasks
 from sqlalchemy.orm import Session
 
 from src.core.config import settings
-from src.core.security import decrypt_phone, hash_phone
+from src.core.security import decrypt_phone, phone_blind_index
+from src.integrations.messaging.base import MessagingProvider
 from src.integrations.messaging.factory import get_primary_provider, get_sms_provider
-from src.models import Notification, NotificationChannel, NotificationStatus, NotificationType
+from src.integrations.messaging.types import SmsMessage
+from src.models import (
+    Notification,
+    NotificationChannel,
+    NotificationOutbox,
+    NotificationStatus,
+    NotificationType,
+    OutboxStatus,
+)
 from src.models.order import Order
 from src.services.message_render import render
 from src.services.short_link_service import ShortLinkService
@@ -17,44 +25,6 @@ from src.services.short_link_service import ShortLinkService
 logger = logging.getLogger(__name__)
 
 
-async def _retry_with_backoff(
-    coro_func,
-    max_retries: int = 3,
-    base_delay: float = 1.0,
-    *args,
-    **kwargs
-):
-    """
-    Execute coroutine with exponential backoff retry.
-
-    Args:
-        coro_func: Async function to execute
-        max_retries: Maximum retry attempts
-        base_delay: Base delay in seconds (doubles each retry)
-
-    Raises:
-        Last exception if all retries fail
-    """
-    last_exception = None
-
-    for attempt in range(max_retries + 1):
-        try:
-            return await coro_func(*args, **kwargs)
-        except Exception as e:
-            last_exception = e
-            if attempt < max_retries:
-                delay = base_delay * (2 ** attempt)  # Exponential backoff
-                logger.warning(
-                    f"Retry attempt {attempt + 1}/{max_retries} failed: {e}. "
-                    f"Retrying in {delay}s..."
-                )
-                await asyncio.sleep(delay)
-            else:
-                logger.error(f"All {max_retries + 1} attempts failed: {e}")
-
-    raise last_exception
-
-
 def _clean_phone(phone: str) -> str:
     return (phone or "").replace("-", "").replace(" ", "").strip()
 
@@ -100,57 +70,123 @@ def _brand_for_order(order: Order) -> str:
     return brand or "새김"
 
 
-class NotificationService:
-    """Notification sending (AlimTalk + SMS fallback)."""
+def _primary_channel() -> NotificationChannel:
+    """Choose primary channel by provider."""
+    provider_key = (settings.MESSAGING_PROVIDER or "mock").strip().lower()
+    return NotificationChannel.SMS if provider_key in {"sens_sms", "sens"} else NotificationChannel.ALIMTALK
 
-    def __init__(self, db: Session):
-        self.db = db
 
-    async def send_dual_notification(self, order: "Order", background_tasks: BackgroundTasks) -> None:
-        """Send to sender + recipient (if phone exists)."""
-        if not order:
-            return
+def _phone_for(order: Order, notification_type: NotificationType) -> str:
+    """Decrypt the destination phone (reminders always go to the sender)."""
+    if notification_type == NotificationType.RECIPIENT:
+        encrypted = order.recipient_phone_encrypted
+    else:
+        encrypted = order.sender_phone_encrypted
+    if not encrypted:
+        return ""
+    return _clean_phone(decrypt_phone(encrypted))
 
-        order_id = order.id
 
-        # Sender
-        try:
-            sender_phone = decrypt_phone(order.sender_phone_encrypted)
-            sender_phone = _clean_phone(sender_phone)
-            if sender_phone:
-                background_tasks.add_task(
-                    self._send_notification,
-                    order_id,
-                    sender_phone,
-                    NotificationType.SENDER,
-                )
-        except Exception as e:
-            logger.error(f"Sender phone decrypt failed for order {order_id}: {e}")
+def _retry_delay(attempts: int) -> timedelta:
+    """Exponential backoff for scheduled retries (base doubles each attempt)."""
+    return timedelta(seconds=settings.NOTIFICATION_RETRY_DELAY_SECONDS * (2 ** max(attempts - 1, 0)))
 
-        # Recipient (optional)
+
+def build_outbox_job(
+    order: Order,
+    notification_type: NotificationType,
+    channel: NotificationChannel,
+    *,
+    is_fallback: bool = False,
+) -> Optional[NotificationOutbox]:
+    """Build a PENDING Notification log row plus its outbox job (not added to any session).
+
+    Session-agnostic so both the sync services and the async public path can add
+    the result to their own transaction. Returns None if there is no phone.
+    """
+    phone = _phone_for(order, notification_type)
+    if not phone:
+        return None
+
+    notification = Notification(
+        order_id=order.id,
+        type=notification_type,
+        channel=channel,
+        phone_hash=phone_blind_index(phone),
+        status=NotificationStatus.PENDING,
+    )
+    return NotificationOutbox(
+        order_id=order.id,
+        notification=notification,
+        is_fallback=is_fallback,
+        status=OutboxStatus.PENDING,
+        attempts=0,
+        max_attempts=settings.NOTIFICATION_MAX_RETRIES + 1,
+        next_attempt_at=datetime.now(timezone.utc),
+    )
+
+
+def build_dual_notification_jobs(order: Order) -> list[NotificationOutbox]:
+    """Outbox jobs for sender + recipient (if phone exists)."""
+    jobs: list[NotificationOutbox] = []
+    channel = _primary_channel()
+    for notification_type in (NotificationType.SENDER, NotificationType.RECIPIENT):
         try:
-            if order.recipient_phone_encrypted:
-                recipient_phone = decrypt_phone(order.recipient_phone_encrypted)
-                recipient_phone = _clean_phone(recipient_phone)
-                if recipient_phone:
-                    background_tasks.add_task(
-                        self._send_notification,
-                        order_id,
-                        recipient_phone,
-                        NotificationType.RECIPIENT,
-                    )
+            job = build_outbox_job(order, notification_type, channel)
         except Exception as e:
-            logger.error(f"Recipient phone decrypt failed for order {order_id}: {e}")
+            logger.error(f"{notification_type.value} phone decrypt failed for order {order.id}: {e}")
+            continue
+        if job is not None:
+            jobs.append(job)
+    return jobs
 
-    async def _send_notification(self, order_id: int, phone: str, notification_type: NotificationType) -> None:
-        """Send a single notification with DB log."""
-        phone = _clean_phone(phone)
-        phone_hash = hash_phone(phone)
 
-        order = self.db.query(Order).filter(Order.id == order_id).first()
-        if not order:
-            return
+@dataclass
+class _PreparedSend:
+    job: NotificationOutbox
+    order: Order
+    notification: Notification
+    phone: str
+    content: str
+    templates: dict
+
+
+class NotificationService:
+    """Notification sending (AlimTalk + SMS fallback).
+
+    Request paths only enqueue (outbox rows in the caller's transaction);
+    delivery happens in the notification worker via process_job().
+    """
 
+    def __init__(self, db: Session):
+        self.db = db
+
+    # ---------------------------
+    # Enqueue (request path)
+    # ---------------------------
+    def enqueue_dual_notification(self, order: "Order") -> list[NotificationOutbox]:
+        """Queue sender + recipient notifications. Caller commits."""
+        if not order:
+            return []
+        jobs = build_dual_notification_jobs(order)
+        self.db.add_all(jobs)
+        return jobs
+
+    def enqueue_reminder(self, order: "Order") -> NotificationOutbox:
+        """Queue a reminder to the sender (only) for pending proof upload. Caller commits.
+
+        Reminder uses SMS by default (since it's a follow-up).
+        """
+        job = build_outbox_job(order, NotificationType.REMINDER, NotificationChannel.SMS)
+        if job is None:
+            raise ValueError("SENDER_PHONE_MISSING")
+        self.db.add(job)
+        return job
+
+    # ---------------------------
+    # Delivery (worker)
+    # ---------------------------
+    def _message_context(self, order: Order) -> dict:
         token = None
         try:
             if order.qr_token is not None:
@@ -158,271 +194,202 @@ class NotificationService:
         except Exception:
             token = None
 
+        base = _short_base_for_order(order)
         short_url: Optional[str] = None
         if token:
-            sl = ShortLinkService(self.db).get_or_create_public_proof(order_id=order_id, token=token)
-            base = _short_base_for_order(order)
+            sl = ShortLinkService(self.db).get_or_create_public_proof(order_id=order.id, token=token)
             short_url = f"{base}/s/{sl.code}"
 
-        # Choose channel by provider
-        provider_key = (settings.MESSAGING_PROVIDER or "mock").strip().lower()
-        primary_channel = NotificationChannel.SMS if provider_key in {"sens_sms", "sens"} else NotificationChannel.ALIMTALK
-
-        notification = Notification(
-            order_id=order_id,
-            type=notification_type,
-            channel=primary_channel,
-            phone_hash=phone_hash,
-            message_url=short_url,
-            status=NotificationStatus.PENDING,
-        )
-        self.db.add(notification)
-        self.db.commit()
-        self.db.refresh(notification)
-
-        brand = _brand_for_order(order)
-        base = _short_base_for_order(order)
         canonical_url = f"{base}/p/{token}" if token else base
-        ctx = {
-            "brand": brand,
+        return {
+            "brand": _brand_for_order(order),
             "url": short_url or canonical_url,
             "order": order.order_number,
             "context": (order.context or "").strip(),
             "sender": (order.sender_name or "").strip(),
             "recipient": (order.recipient_name or "").strip(),
         }
+
+    def _render(self, notification: Notification, ctx: dict, templates: dict) -> str:
+        is_sender = notification.type == NotificationType.SENDER
+
+        if notification.type == NotificationType.REMINDER:
+            template = settings.SMS_REMINDER_TEMPLATE or (
+                "[{brand}] 증빙 사진 업로드를 잊지 마세요! 주문: {order}. 업로드: {url}"
+            )
+        elif notification.channel == NotificationChannel.SMS:
+            template = templates['sms_sender'] if is_sender else templates['sms_recipient']
+        else:
+            template = templates['alimtalk_sender'] if is_sender else templates['alimtalk_recipient']
+        return render(template, ctx)
+
+    def _sms_provider_for(self, job: NotificationOutbox, notification: Notification) -> MessagingProvider:
+        if settings.MESSAGING_PROVIDER == "mock":
+            return get_primary_provider()
+        # Reminders and fallbacks always use the dedicated SMS provider
+        if job.is_fallback or notification.type == NotificationType.REMINDER:
+            return get_sms_provider()
+        return get_primary_provider()
+
+    def _prepare(self, job: NotificationOutbox, order: Optional[Order]) -> Optional[_PreparedSend]:
+        """Resolve phone + rendered content for a claimed job.
+
+        Returns None (job marked DEAD) if the order is gone. Raises on
+        recoverable problems so the caller records a failed attempt.
+        """
+        notification = job.notification
+        if not order or notification is None:
+            job.status = OutboxStatus.DEAD
+            job.last_error = "ORDER_NOT_FOUND"
+            return None
+
+        phone = _phone_for(order, notification.type)
+        if not phone:
+            raise ValueError("PHONE_MISSING")
+        ctx = self._message_context(order)
         templates = _templates_for_order(order)
+        notification.message_url = ctx.get("url")
+        return _PreparedSend(
+            job=job,
+            order=order,
+            notification=notification,
+            phone=phone,
+            content=self._render(notification, ctx, templates),
+            templates=templates,
+        )
 
-        try:
-            if settings.MESSAGING_PROVIDER == "mock":
-                await self._mock_send(notification, phone, notification_type, ctx, templates)
-            else:
-                await self._real_send(notification, phone, notification_type, ctx, templates)
+    async def _deliver(self, send: _PreparedSend):
+        """Single delivery attempt. Returns SendResult (None in mock mode)."""
+        job, notification = send.job, send.notification
 
-        except Exception as e:
-            # Persist primary failure
-            code = getattr(e, "code", None) or "SEND_FAILED"
-            details = getattr(e, "details", None)
-            logger.error(f"Notification failed order={order_id} type={notification_type} code={code} err={e}")
-            notification.status = NotificationStatus.FAILED
-            notification.error_code = str(code)
-            notification.error_message = str(details or e)
-            self.db.commit()
-
-            # Fallback only when primary is AlimTalk
-            if primary_channel == NotificationChannel.ALIMTALK and templates['fallback_sms_enabled']:
-                await self._send_sms_fallback(order_id=order_id, phone=phone, notification_type=notification_type, ctx=ctx, templates=templates)
-
-    async def _mock_send(self, notification: Notification, phone: str, notification_type: NotificationType, ctx: dict, templates: dict) -> None:
-        """Mock send - update DB."""
-        template = templates['alimtalk_sender'] if notification_type == NotificationType.SENDER else templates['alimtalk_recipient']
-        message = render(template, ctx)
-
-        logger.info(f"[MOCK] notify type={notification_type} phone={phone} msg={message}")
-        notification.status = NotificationStatus.MOCK_SENT
-        notification.sent_at = datetime.utcnow()
-        notification.provider_response = "MOCK"
-        self.db.commit()
+        if settings.MESSAGING_PROVIDER == "mock":
+            logger.info(f"[MOCK] notify type={notification.type} channel={notification.channel} phone={send.phone} msg={send.content}")
+            return None
 
-    async def _real_send(self, notification: Notification, phone: str, notification_type: NotificationType, ctx: dict, templates: dict) -> None:
-        """Real send via selected provider with retry logic."""
-        provider = get_primary_provider()
+        if notification.channel == NotificationChannel.SMS:
+            provider = self._sms_provider_for(job, notification)
+            return await provider.send_sms(phone=send.phone, content=send.content, from_no=settings.SENS_SMS_FROM)
 
-        async def _do_send():
-            if notification.channel == NotificationChannel.SMS:
-                template = templates['sms_sender'] if notification_type == NotificationType.SENDER else templates['sms_recipient']
-                content = render(template, ctx)
-                return await provider.send_sms(phone=phone, content=content, from_no=settings.SENS_SMS_FROM)
-            else:
-                template = templates['alimtalk_sender'] if notification_type == NotificationType.SENDER else templates['alimtalk_recipient']
-                message = render(template, ctx)
-                return await provider.send_alimtalk(
-                    phone=phone,
-                    message=message,
-                    sender_key=settings.KAKAO_SENDER_KEY or "",
-                    template_code=(templates.get('kakao_template_code') or ""),
-                    sender_no=settings.KAKAO_SENDER_NO,
-                    cid=settings.KAKAO_CID,
-                    fall_back_yn=False,
-                )
-
-        # Execute with retry
-        res = await _retry_with_backoff(
-            _do_send,
-            max_retries=settings.NOTIFICATION_MAX_RETRIES,
-            base_delay=settings.NOTIFICATION_RETRY_DELAY_SECONDS,
+        provider = get_primary_provider()
+        return await provider.send_alimtalk(
+            phone=send.phone,
+            message=send.content,
+            sender_key=settings.KAKAO_SENDER_KEY or "",
+            template_code=(send.templates.get('kakao_template_code') or ""),
+            sender_no=settings.KAKAO_SENDER_NO,
+            cid=settings.KAKAO_CID,
+            fall_back_yn=False,
         )
 
-        notification.status = NotificationStatus.SENT
-        notification.sent_at = datetime.utcnow()
-        notification.provider_request_id = res.request_id
-        notification.provider_response = str(res.raw)[:4000]
-        notification.retry_count = 0  # Will be updated if retries occurred
-        self.db.commit()
+    def _success_status(self, job: NotificationOutbox) -> NotificationStatus:
+        if settings.MESSAGING_PROVIDER == "mock":
+            return NotificationStatus.MOCK_SENT
+        return NotificationStatus.FALLBACK_SENT if job.is_fallback else NotificationStatus.SENT
 
-    async def _send_sms_fallback(self, *, order_id: int, phone: str, notification_type: NotificationType, ctx: dict, templates: dict) -> None:
-        """Send SMS fallback with retry (requires SENS config)."""
-        phone = _clean_phone(phone)
-        phone_hash = hash_phone(phone)
-
-        fallback = Notification(
-            order_id=order_id,
-            type=notification_type,
-            channel=NotificationChannel.SMS,
-            phone_hash=phone_hash,
-            message_url=ctx.get("url"),
-            status=NotificationStatus.PENDING,
-        )
-        self.db.add(fallback)
-        self.db.commit()
-        self.db.refresh(fallback)
-
-        try:
-            if settings.MESSAGING_PROVIDER == "mock":
-                logger.info(f"[MOCK] SMS fallback order={order_id} type={notification_type}")
-                fallback.status = NotificationStatus.MOCK_SENT
-                fallback.sent_at = datetime.utcnow()
-                fallback.provider_response = "MOCK_SMS_FALLBACK"
-            else:
-                provider = get_sms_provider()
-                template = templates['sms_sender'] if notification_type == NotificationType.SENDER else templates['sms_recipient']
-                content = render(template, ctx)
-
-                async def _do_fallback_send():
-                    return await provider.send_sms(phone=phone, content=content, from_no=settings.SENS_SMS_FROM)
-
-                # Execute with retry
-                res = await _retry_with_backoff(
-                    _do_fallback_send,
-                    max_retries=settings.NOTIFICATION_MAX_RETRIES,
-                    base_delay=settings.NOTIFICATION_RETRY_DELAY_SECONDS,
-                )
-
-                fallback.status = NotificationStatus.FALLBACK_SENT
-                fallback.sent_at = datetime.utcnow()
-                fallback.provider_request_id = res.request_id
-                fallback.provider_response = str(res.raw)[:4000]
-        except Exception as e:
-            code = getattr(e, "code", None) or "FALLBACK_FAILED"
-            details = getattr(e, "details", None)
-            fallback.status = NotificationStatus.FAILED
-            fallback.error_code = str(code)
-            fallback.error_message = str(details or e)
-            logger.error(f"SMS fallback failed after retries: order={order_id} error={e}")
-        finally:
-            self.db.commit()
-
-    async def send_reminder_notification(self, order: "Order", background_tasks: BackgroundTasks) -> None:
-        """Send reminder notification to sender (only) for pending proof upload."""
-        if not order:
+    def _record_success(self, job: NotificationOutbox, notification: Notification, res) -> None:
+        notification.status = self._success_status(job)
+        notification.sent_at = datetime.utcnow()
+        if res is None:
+            notification.provider_response = "MOCK_SMS_FALLBACK" if job.is_fallback else "MOCK"
+        else:
+            notification.provider_request_id = res.request_id
+            notification.provider_response = str(res.raw)[:4000]
+        job.status = OutboxStatus.DONE
+        job.last_error = None
+
+    def _record_failure(self, job: NotificationOutbox, order: Order, notification: Notification, e: Exception) -> None:
+        """Reschedule with backoff, or give up (FAILED/DEAD) and queue the SMS fallback."""
+        code = getattr(e, "code", None) or ("FALLBACK_FAILED" if job.is_fallback else "SEND_FAILED")
+        details = getattr(e, "details", None)
+        notification.error_code = str(code)
+        notification.error_message = str(details or e)
+        job.last_error = f"{code}: {e}"[:4000]
+        job.locked_at = None
+        job.locked_by = None
+
+        if job.attempts < job.max_attempts:
+            delay = _retry_delay(job.attempts)
+            job.status = OutboxStatus.PENDING
+            job.next_attempt_at = datetime.now(timezone.utc) + delay
+            logger.warning(
+                f"Notification attempt {job.attempts}/{job.max_attempts} failed order={order.id} "
+                f"type={notification.type} code={code}. Retrying in {delay.total_seconds()}s"
+            )
             return
 
-        order_id = order.id
-
-        # Reminder only to sender
+        logger.error(f"Notification failed order={order.id} type={notification.type} code={code} err={e}")
+        notification.status = NotificationStatus.FAILED
+        job.status = OutboxStatus.DEAD
+
+        # Fallback only when primary is AlimTalk
+        if (
+            not job.is_fallback
+            and notification.channel == NotificationChannel.ALIMTALK
+            and _templates_for_order(order)['fallback_sms_enabled']
+        ):
+            fallback = build_outbox_job(order, notification.type, NotificationChannel.SMS, is_fallback=True)
+            if fallback is not None:
+                fallback.notification.message_url = notification.message_url
+                self.db.add(fallback)
+
+    async def process_job(self, job: NotificationOutbox) -> None:
+        """Deliver one claimed outbox job (one attempt) and persist the outcome.
+
+        On failure the job is rescheduled with exponential backoff until
+        max_attempts; then the notification is marked FAILED and, for AlimTalk,
+        an SMS fallback job is queued.
+        """
+        order = self.db.query(Order).filter(Order.id == job.order_id).first()
         try:
-            sender_phone = decrypt_phone(order.sender_phone_encrypted)
-            sender_phone = _clean_phone(sender_phone)
-            if sender_phone:
-                background_tasks.add_task(
-                    self._send_reminder,
-                    order_id,
-                    sender_phone,
-                )
+            send = self._prepare(job, order)
+            res = await self._deliver(send) if send is not None else None
         except Exception as e:
-            logger.error(f"Sender phone decrypt failed for reminder order {order_id}: {e}")
-            raise
+            self._record_failure(job, order, job.notification, e)
+        else:
+            if send is not None:
+                self._record_success(job, send.notification, res)
+        self.db.commit()
 
-    async def _send_reminder(self, order_id: int, phone: str) -> None:
-        """Send a reminder notification with DB log."""
-        phone = _clean_phone(phone)
-        phone_hash = hash_phone(phone)
+    async def process_sms_batch(self, jobs: list[NotificationOutbox]) -> None:
+        """Deliver claimed SMS jobs with as few provider calls as possible.
 
-        order = self.db.query(Order).filter(Order.id == order_id).first()
-        if not order:
+        Jobs are grouped per provider and sent in chunks of max_batch_size;
+        each chunk succeeds or fails as a whole, and every job's Notification
+        row is updated individually from the per-recipient results.
+        """
+        if not jobs:
             return
+        order_ids = {job.order_id for job in jobs}
+        orders = {o.id: o for o in self.db.query(Order).filter(Order.id.in_(order_ids)).all()}
+
+        groups: dict[int, tuple[MessagingProvider, list[_PreparedSend]]] = {}
+        for job in jobs:
+            order = orders.get(job.order_id)
+            try:
+                send = self._prepare(job, order)
+                if send is None:
+                    continue
+                provider = self._sms_provider_for(job, send.notification)
+            except Exception as e:
+                self._record_failure(job, order, job.notification, e)
+                continue
+            groups.setdefault(id(provider), (provider, []))[1].append(send)
+
+        for provider, sends in groups.values():
+            size = max(provider.max_batch_size, 1)
+            for i in range(0, len(sends), size):
+                chunk = sends[i:i + size]
+                try:
+                    results = await provider.send_sms_batch(
+                        messages=[SmsMessage(phone=s.phone, content=s.content) for s in chunk],
+                        from_no=settings.SENS_SMS_FROM,
+                    )
+                except Exception as e:
+                    for send in chunk:
+                        self._record_failure(send.job, send.order, send.notification, e)
+                    continue
+                logger.info(f"SMS batch sent provider={provider.name} recipients={len(chunk)}")
+                for send, res in zip(chunk, results):
+                    self._record_success(send.job, send.notification, res)
 
-        token = None
-        try:
-            if order.qr_token is not None:
-                token = order.qr_token.token
-        except Exception:
-            token = None
-
-        short_url: Optional[str] = None
-        if token:
-            sl = ShortLinkService(self.db).get_or_create_public_proof(order_id=order_id, token=token)
-            base = _short_base_for_order(order)
-            short_url = f"{base}/s/{sl.code}"
-
-        # Reminder uses SMS by default (since it's a follow-up)
-        provider_key = (settings.MESSAGING_PROVIDER or "mock").strip().lower()
-        channel = NotificationChannel.SMS
-
-        notification = Notification(
-            order_id=order_id,
-            type=NotificationType.REMINDER,
-            channel=channel,
-            phone_hash=phone_hash,
-            message_url=short_url,
-            status=NotificationStatus.PENDING,
-        )
-        self.db.add(notification)
         self.db.commit()
-        self.db.refresh(notification)
-
-        brand = _brand_for_order(order)
-        base = _short_base_for_order(order)
-        canonical_url = f"{base}/p/{token}" if token else base
-        ctx = {
-            "brand": brand,
-            "url": short_url or canonical_url,
-            "order": order.order_number,
-            "context": (order.context or "").strip(),
-            "sender": (order.sender_name or "").strip(),
-            "recipient": (order.recipient_name or "").strip(),
-        }
-
-        # Reminder template (simple SMS)
-        reminder_template = settings.SMS_REMINDER_TEMPLATE or (
-            "[{brand}] 증빙 사진 업로드를 잊지 마세요! 주문: {order}. 업로드: {url}"
-        )
-
-        try:
-            if settings.MESSAGING_PROVIDER == "mock":
-                from src.services.message_render import render
-                message = render(reminder_template, ctx)
-                logger.info(f"[MOCK] reminder notify phone={phone} msg={message}")
-                notification.status = NotificationStatus.MOCK_SENT
-                notification.sent_at = datetime.utcnow()
-                notification.provider_response = "MOCK_REMINDER"
-            else:
-                provider = get_sms_provider()
-                from src.services.message_render import render
-                content = render(reminder_template, ctx)
-
-                async def _do_reminder_send():
-                    return await provider.send_sms(phone=phone, content=content, from_no=settings.SENS_SMS_FROM)
-
-                res = await _retry_with_backoff(
-                    _do_reminder_send,
-                    max_retries=settings.NOTIFICATION_MAX_RETRIES,
-                    base_delay=settings.NOTIFICATION_RETRY_DELAY_SECONDS,
-                )
-
-                notification.status = NotificationStatus.SENT
-                notification.sent_at = datetime.utcnow()
-                notification.provider_request_id = res.request_id
-                notification.provider_response = str(res.raw)[:4000]
-
-            self.db.commit()
-
-        except Exception as e:
-            code = getattr(e, "code", None) or "REMINDER_FAILED"
-            details = getattr(e, "details", None)
-            logger.error(f"Reminder notification failed order={order_id} code={code} err={e}")
-            notification.status = NotificationStatus.FAILED
-            notification.error_code = str(code)
-            notification.error_message = str(details or e)
-            self.db.commit()
-            raise
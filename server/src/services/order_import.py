@@ -0,0 +1,426 @@
+"""
+CSV order import engine.
+
+The upload is parsed incrementally (csv over a text wrapper, never fully
+decoded in memory), rows are validated / normalized / encrypted in batches
+(optionally fanned out to a process pool) and each batch is written with one
+multi-row INSERT ... RETURNING. Non-strict imports commit per batch and keep
+per-row errors; strict imports run in a single transaction and abort on the
+first bad row. Their org_daily_stats deltas are deferred and applied just
+before that single commit, so the organization's rollup row is not locked
+for the length of the import.
+
+Orders are unique per (organization_id, order_number). In the upsert / skip
+modes each batch is one INSERT ... ON CONFLICT DO UPDATE / DO NOTHING, so
+re-running a file (nightly ERP sync, retry after a partial failure) never
+duplicates orders; the result reports created / updated / unchanged.
+Updated orders' public proof snapshots are unpublished with their batch
+(ImportResult.unpublished; the caller queues the republish after the run).
+
+Bulk INSERTs bypass the ORM flush, so org_daily_stats is updated explicitly
+(record_orders_inserted).
+"""
+
+import codecs
+import csv
+import logging
+from concurrent.futures import Executor
+from dataclasses import dataclass, field
+from typing import BinaryIO, Callable, Iterable, Iterator, Optional
+
+from sqlalchemy import func, insert, or_, select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
+from sqlalchemy.orm import Session
+
+from src.core.config import settings
+from src.core.security import encrypt_phone, normalize_phone, phone_blind_index
+from src.models import Order, OrderStatus
+from src.services.daily_stats_service import (
+    apply_deferred,
+    defer_deltas,
+    discard_deferred,
+    record_orders_inserted,
+)
+from src.services.proof_snapshot_service import ProofSnapshotService
+
+logger = logging.getLogger(__name__)
+
+# Bytes inspected to choose between UTF-8 and CP949 (KR field ops)
+ENCODING_SAMPLE_BYTES = 64 * 1024
+
+# insert: existing order numbers are row errors
+# upsert: existing orders are updated when a field changed (ON CONFLICT DO UPDATE)
+# skip: existing orders are left alone (ON CONFLICT DO NOTHING)
+IMPORT_MODES = ("insert", "upsert", "skip")
+
+# Columns written by an upsert; phones are compared through their blind indexes
+# (Fernet ciphertexts differ on every encryption)
+_UPSERT_COLUMNS = (
+    "context",
+    "sender_name",
+    "sender_phone_encrypted",
+    "sender_phone_index",
+    "recipient_name",
+    "recipient_phone_encrypted",
+    "recipient_phone_index",
+)
+_UPSERT_COMPARE = ("context", "sender_name", "sender_phone_index", "recipient_name", "recipient_phone_index")
+
+
+class CsvEncodingError(ValueError):
+    """The upload is neither valid UTF-8 nor valid CP949."""
+
+
+class ImportAbortedError(Exception):
+    """Strict import hit a bad row; nothing was committed."""
+
+    def __init__(self, row: int, message: str):
+        super().__init__(f"row {row}: {message}")
+        self.row = row
+        self.message = message
+
+
+@dataclass
+class ImportResult:
+    created_ids: list[int] = field(default_factory=list)
+    updated_ids: list[int] = field(default_factory=list)
+    unchanged: int = 0
+    errors: list[dict] = field(default_factory=list)
+    processed: int = 0
+    unpublished: list[tuple[str, str]] = field(default_factory=list)  # (token, stale snapshot key)
+
+
+def _detect_encoding(sample: bytes) -> str:
+    try:
+        # Incremental: a multi-byte char cut at the sample boundary is not an error
+        codecs.getincrementaldecoder("utf-8")().decode(sample, final=False)
+        return "utf-8-sig"
+    except UnicodeDecodeError:
+        return "cp949"
+
+
+def _decoded_lines(fileobj: BinaryIO, encoding: str) -> Iterator[str]:
+    """Decode the upload line by line, strictly (no replacement characters).
+
+    The sample can be pure ASCII in a CP949 file (English header, Korean rows
+    further down). While every line so far was ASCII, which reads the same in
+    both encodings, a line that is not UTF-8 switches the rest of the file to
+    CP949. Anything else undecodable raises CsvEncodingError.
+    """
+    decoder = codecs.getincrementaldecoder(encoding)()
+    ascii_so_far = True
+    # b"\n" never occurs inside a UTF-8 / CP949 multi-byte character
+    for line_no, raw in enumerate(fileobj, start=1):
+        try:
+            line = decoder.decode(raw)
+        except UnicodeDecodeError as e:
+            if not ascii_so_far or encoding == "cp949":
+                raise CsvEncodingError(f"CSV_ENCODING_ERROR: line {line_no} is not valid {encoding}") from e
+            encoding = "cp949"
+            decoder = codecs.getincrementaldecoder(encoding)()
+            try:
+                line = decoder.decode(raw)
+            except UnicodeDecodeError as e:
+                raise CsvEncodingError(f"CSV_ENCODING_ERROR: line {line_no} is neither UTF-8 nor CP949") from e
+        ascii_so_far = ascii_so_far and raw.isascii()
+        yield line
+    try:
+        tail = decoder.decode(b"", final=True)
+    except UnicodeDecodeError as e:
+        raise CsvEncodingError(f"CSV_ENCODING_ERROR: truncated {encoding} character at end of file") from e
+    if tail:
+        yield tail
+
+
+def iter_csv_rows(fileobj: BinaryIO) -> Iterator[dict]:
+    """Yield CSV rows as dicts with snake_lower keys and stripped values.
+
+    fileobj must be a seekable binary file (e.g. UploadFile.file). Raises
+    CsvEncodingError when the file is neither UTF-8 nor CP949.
+    """
+    sample = fileobj.read(ENCODING_SAMPLE_BYTES)
+    fileobj.seek(0)
+    for r in csv.DictReader(_decoded_lines(fileobj, _detect_encoding(sample))):
+        # normalize keys to snake_lower
+        yield {str(k).strip().lower(): (v.strip() if isinstance(v, str) else v) for k, v in (r or {}).items()}
+
+
+def parse_order_row(r: dict) -> dict:
+    """Validate one CSV row and return its fields (phones normalized, not encrypted).
+
+    Raises ValueError with an error code for invalid rows.
+    """
+    order_number = (r.get("order_number") or r.get("order_no") or "").strip()
+    if not order_number:
+        raise ValueError("ORDER_NUMBER_REQUIRED")
+
+    sender_name = (r.get("sender_name") or r.get("buyer_name") or "").strip()
+    if not sender_name:
+        raise ValueError("SENDER_NAME_REQUIRED")
+
+    sender_phone_raw = (r.get("sender_phone") or r.get("buyer_phone") or "").strip()
+    if not sender_phone_raw:
+        raise ValueError("SENDER_PHONE_REQUIRED")
+
+    recipient_phone_raw = (r.get("recipient_phone") or r.get("receiver_phone") or "").strip() or None
+
+    return {
+        "order_number": order_number,
+        "context": (r.get("context") or r.get("event") or "").strip() or None,
+        "sender_name": sender_name,
+        "sender_phone": normalize_phone(sender_phone_raw),
+        "recipient_name": (r.get("recipient_name") or r.get("receiver_name") or "").strip() or None,
+        "recipient_phone": normalize_phone(recipient_phone_raw) if recipient_phone_raw else None,
+    }
+
+
+def prepare_order_row(r: dict) -> dict:
+    """Validate one CSV row and build Order column values (phones encrypted).
+
+    Raises ValueError with an error code for invalid rows.
+    """
+    fields = parse_order_row(r)
+    sender_phone = fields["sender_phone"]
+    recipient_phone = fields["recipient_phone"]
+
+    return {
+        "order_number": fields["order_number"],
+        "context": fields["context"],
+        "sender_name": fields["sender_name"],
+        "sender_phone_encrypted": encrypt_phone(sender_phone),
+        "sender_phone_index": phone_blind_index(sender_phone),
+        "recipient_name": fields["recipient_name"],
+        "recipient_phone_encrypted": encrypt_phone(recipient_phone) if recipient_phone else None,
+        "recipient_phone_index": phone_blind_index(recipient_phone) if recipient_phone else None,
+    }
+
+
+def prepare_order_rows(batch: list[tuple[int, dict]]) -> list[tuple[int, Optional[dict], Optional[str]]]:
+    """Batch form of prepare_order_row: (row number, values or None, error or None).
+
+    Module-level (picklable) so imports can fan it out to a process pool.
+    """
+    prepared = []
+    for idx, r in batch:
+        try:
+            prepared.append((idx, prepare_order_row(r), None))
+        except Exception as e:
+            prepared.append((idx, None, str(e)))
+    return prepared
+
+
+def _batched(rows: Iterable[dict], size: int, start: int = 1) -> Iterator[list[tuple[int, dict]]]:
+    batch: list[tuple[int, dict]] = []
+    for idx, r in enumerate(rows, start=start):
+        batch.append((idx, r))
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+class OrderImporter:
+    """Batched CSV → orders insert for one organization."""
+
+    def __init__(
+        self,
+        db: Session,
+        organization_id: int,
+        *,
+        strict: bool = False,
+        mode: str = "insert",
+        batch_size: Optional[int] = None,
+        pool: Optional[Executor] = None,
+        pool_size: int = 1,
+        on_batch: Optional[Callable[[ImportResult], None]] = None,
+    ):
+        self.db = db
+        self.organization_id = organization_id
+        if mode not in IMPORT_MODES:
+            raise ValueError(f"INVALID_IMPORT_MODE: {mode}")
+        self.strict = strict
+        self.mode = mode
+        self.batch_size = batch_size or settings.IMPORT_BATCH_SIZE
+        self.pool = pool
+        self.pool_size = max(pool_size, 1)
+        self.on_batch = on_batch
+
+    def run(self, rows: Iterable[dict], first_row: int = 1) -> ImportResult:
+        """Import rows; returns created ids and per-row errors.
+
+        first_row is the CSV row number of the first item (for resumed imports).
+        on_batch runs after each batch, before its commit, so progress written
+        there is committed together with the rows.
+
+        Raises ImportAbortedError (after rolling back) in strict mode.
+        """
+        result = ImportResult()
+        if self.strict:
+            defer_deltas(self.db)
+        try:
+            for batch in _batched(rows, self.batch_size, start=first_row):
+                self._import_batch(batch, result)
+                result.processed += len(batch)
+                if self.on_batch is not None:
+                    self.on_batch(result)
+                if not self.strict:
+                    self.db.commit()
+            if self.strict:
+                apply_deferred(self.db)
+                self.db.commit()
+        except Exception:
+            self.db.rollback()
+            raise
+        finally:
+            discard_deferred(self.db)
+        return result
+
+    def _prepare(self, batch: list[tuple[int, dict]]) -> list[tuple[int, Optional[dict], Optional[str]]]:
+        if self.pool is None or self.pool_size == 1:
+            return prepare_order_rows(batch)
+        step = -(-len(batch) // self.pool_size)
+        parts = [batch[i:i + step] for i in range(0, len(batch), step)]
+        return [item for part in self.pool.map(prepare_order_rows, parts) for item in part]
+
+    def _import_batch(self, batch: list[tuple[int, dict]], result: ImportResult) -> None:
+        ready: list[tuple[int, dict]] = []
+        for idx, values, error in self._prepare(batch):
+            if error is not None:
+                if self.strict:
+                    raise ImportAbortedError(idx, error)
+                result.errors.append({"row": idx, "message": error})
+                continue
+            ready.append((idx, values))
+
+        if self.mode != "insert":
+            ready = self._last_per_order_number(ready, result)
+
+        if not ready:
+            return
+
+        if self.strict:
+            # Any failure aborts the whole import; the savepoint only keeps the
+            # transaction usable to find the row that broke
+            try:
+                with self.db.begin_nested():
+                    created, updated, unchanged = self._write([values for _, values in ready])
+            except SQLAlchemyError as e:
+                row, message = self._failing_row(ready, e)
+                raise ImportAbortedError(row, message) from e
+        else:
+            try:
+                with self.db.begin_nested():
+                    created, updated, unchanged = self._write([values for _, values in ready])
+            except SQLAlchemyError:
+                # Pin the failure on individual rows; the rest of the batch still goes in
+                created, updated, unchanged = [], [], 0
+                for idx, values in ready:
+                    try:
+                        with self.db.begin_nested():
+                            row_created, row_updated, row_unchanged = self._write([values])
+                    except SQLAlchemyError as row_error:
+                        result.errors.append({"row": idx, "message": _insert_error(row_error)})
+                        continue
+                    created.extend(row_created)
+                    updated.extend(row_updated)
+                    unchanged += row_unchanged
+
+        result.created_ids.extend(created)
+        result.updated_ids.extend(updated)
+        result.unchanged += unchanged
+        record_orders_inserted(self.db, self.organization_id, len(created))
+        if updated:
+            result.unpublished.extend(ProofSnapshotService(self.db).unpublish_orders(updated))
+
+    def _failing_row(self, ready: list[tuple[int, dict]], error: SQLAlchemyError) -> tuple[int, str]:
+        """Replay a failed strict batch row by row: (row number, error) of the first bad row.
+
+        The replayed rows are rolled back with the rest of the import.
+        """
+        for idx, values in ready:
+            try:
+                with self.db.begin_nested():
+                    self._write([values])
+            except SQLAlchemyError as row_error:
+                return idx, _insert_error(row_error)
+        return ready[0][0], _insert_error(error)
+
+    def _last_per_order_number(self, ready: list[tuple[int, dict]], result: ImportResult) -> list[tuple[int, dict]]:
+        """Keep the last row per order number (one statement cannot upsert a key twice)."""
+        last: dict[str, int] = {}
+        for idx, values in ready:
+            last[values["order_number"]] = idx
+        kept = []
+        for idx, values in ready:
+            winner = last[values["order_number"]]
+            if winner == idx:
+                kept.append((idx, values))
+                continue
+            message = f"DUPLICATE_ORDER_NUMBER: superseded by row {winner}"
+            if self.strict:
+                raise ImportAbortedError(idx, message)
+            result.errors.append({"row": idx, "message": message})
+        return kept
+
+    def _write(self, values: list[dict]) -> tuple[list[int], list[int], int]:
+        """Write one batch; returns (created ids, updated ids, unchanged count)."""
+        for v in values:
+            v["organization_id"] = self.organization_id
+            v["status"] = OrderStatus.PENDING
+        if self.mode == "insert":
+            return self._insert(values), [], 0
+        return self._upsert(values)
+
+    def _insert(self, values: list[dict]) -> list[int]:
+        """One multi-row INSERT ... RETURNING id."""
+        # Core insert against the table: the ORM bulk path splits executemany
+        # batches whenever a row's None pattern changes (e.g. optional recipient)
+        table = Order.__table__
+        stmt = insert(table).returning(table.c.id)
+        return list(self.db.execute(stmt, values).scalars().all())
+
+    def _upsert(self, values: list[dict]) -> tuple[list[int], list[int], int]:
+        """One multi-row INSERT ... ON CONFLICT (organization_id, order_number).
+
+        Rows the statement did not touch (DO NOTHING, or DO UPDATE whose WHERE
+        found no change) return nothing and count as unchanged; which of the
+        returned rows existed before comes from one lookup per batch.
+        """
+        table = Order.__table__
+        existing = set(self.db.scalars(
+            select(table.c.order_number).where(
+                table.c.organization_id == self.organization_id,
+                table.c.order_number.in_([v["order_number"] for v in values]),
+            )
+        ))
+
+        dialect = self.db.get_bind().dialect.name
+        if dialect == "postgresql":
+            stmt = postgresql.insert(table)
+        elif dialect == "sqlite":
+            stmt = sqlite.insert(table)
+        else:
+            raise ValueError(f"UPSERT_UNSUPPORTED: {dialect}")
+
+        key = ["organization_id", "order_number"]
+        if self.mode == "skip":
+            stmt = stmt.on_conflict_do_nothing(index_elements=key)
+        else:
+            stmt = stmt.on_conflict_do_update(
+                index_elements=key,
+                set_={**{c: stmt.excluded[c] for c in _UPSERT_COLUMNS}, "updated_at": func.now()},
+                where=or_(*(table.c[c].is_distinct_from(stmt.excluded[c]) for c in _UPSERT_COMPARE)),
+            )
+        rows = self.db.execute(stmt.returning(table.c.id, table.c.order_number), values).all()
+
+        created = [r.id for r in rows if r.order_number not in existing]
+        updated = [r.id for r in rows if r.order_number in existing]
+        return created, updated, len(values) - len(rows)
+
+
+def _insert_error(e: SQLAlchemyError) -> str:
+    if isinstance(e, IntegrityError):
+        return "DUPLICATE_ORDER_NUMBER"
+    return f"INSERT_FAILED: {e.__class__.__name__}"
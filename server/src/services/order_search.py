@@ -0,0 +1,56 @@
+"""
+Admin order search (the `q` filter of list_orders).
+
+Every searchable column is folded into one lower-cased "search document"
+expression. On PostgreSQL migration 0013 builds a pg_trgm GIN index on exactly
+this expression, so a substring match is an index scan instead of a
+sequential scan over the tenant's orders, and results can be ranked with
+word_similarity(). SQLite (tests) evaluates the same expression unindexed
+and ranks with a cheap exact/prefix heuristic.
+
+Keep order_search_document() and the index expression in 0013 in sync:
+PostgreSQL only uses an expression index when the query expression matches.
+"""
+
+from sqlalchemy import case, func, literal, literal_column
+
+from src.models import Order
+
+SEARCH_COLUMNS = (Order.order_number, Order.sender_name, Order.recipient_name, Order.context)
+
+
+def order_search_document():
+    """lower(coalesce(order_number,'') || ' ' || ... || coalesce(context,''))"""
+    # Literals (not bind params) so the rendered SQL matches the index expression
+    empty = literal_column("''")
+    space = literal_column("' '")
+    doc = None
+    for column in SEARCH_COLUMNS:
+        part = func.coalesce(column, empty)
+        doc = part if doc is None else doc.op("||")(space).op("||")(part)
+    return func.lower(doc)
+
+
+# "!" rather than backslash: renders the same whatever standard_conforming_strings is
+_ESCAPE = "!"
+
+
+def _like_escape(term: str) -> str:
+    return term.replace("!", "!!").replace("%", "!%").replace("_", "!_")
+
+
+def search_orders(query, q: str, dialect_name: str):
+    """Filter an Order query by substring `q`; returns (query, rank expression)."""
+    term = q.strip().lower()
+    doc = order_search_document()
+    query = query.filter(doc.like(f"%{_like_escape(term)}%", escape=_ESCAPE))
+
+    if dialect_name == "postgresql":
+        rank = func.word_similarity(literal(term), doc)
+    else:
+        rank = case(
+            (func.lower(Order.order_number) == term, 1.0),
+            (doc.like(f"{_like_escape(term)}%", escape=_ESCAPE), 0.5),
+            else_=0.0,
+        )
+    return query, rank
@@ -0,0 +1,124 @@
+"""
+Phone blind-index lookup and backfill.
+
+Orders carry HMAC blind indexes of their (encrypted) sender/recipient phones
+and notifications store the same index in phone_hash, so support staff can find
+everything sent to a number with one indexed query instead of decrypting
+every row.
+"""
+
+import logging
+from typing import Optional
+
+from sqlalchemy import and_, or_
+from sqlalchemy.orm import Session
+
+from src.core.security import decrypt_phone, hash_phone, normalize_phone, phone_blind_index
+from src.models import Notification, NotificationType, Order
+
+logger = logging.getLogger(__name__)
+
+
+def _decrypt_or_none(encrypted: Optional[str]) -> Optional[str]:
+    if not encrypted:
+        return None
+    try:
+        return decrypt_phone(encrypted)
+    except Exception:
+        return None
+
+
+class PhoneIndexService:
+    def __init__(self, db: Session):
+        self.db = db
+
+    def lookup(self, phone: str, organization_id: Optional[int] = None) -> dict:
+        """Orders (as sender or recipient) and notifications sent to a phone number.
+
+        Raises ValueError for an unparseable phone.
+        """
+        index = phone_blind_index(normalize_phone(phone))
+
+        query = (
+            self.db.query(Order, Notification)
+            .outerjoin(
+                Notification,
+                and_(Notification.order_id == Order.id, Notification.phone_hash == index),
+            )
+            .filter(or_(Order.sender_phone_index == index, Order.recipient_phone_index == index))
+        )
+        if organization_id is not None:
+            query = query.filter(Order.organization_id == organization_id)
+
+        orders: dict[int, Order] = {}
+        notifications: list[dict] = []
+        for order, notification in query.order_by(Order.created_at.desc(), Order.id.desc()).all():
+            orders.setdefault(order.id, order)
+            if notification is None:
+                continue
+            notifications.append({
+                "id": notification.id,
+                "order_id": order.id,
+                "order_number": order.order_number,
+                "type": str(notification.type.value) if notification.type else None,
+                "channel": str(notification.channel.value) if notification.channel else None,
+                "status": str(notification.status.value) if notification.status else None,
+                "message_url": notification.message_url,
+                "error_message": notification.error_message,
+                "created_at": notification.created_at,
+                "sent_at": notification.sent_at,
+            })
+
+        notifications.sort(key=lambda n: (n["created_at"] is not None, n["created_at"], n["id"]), reverse=True)
+        return {"orders": list(orders.values()), "notifications": notifications}
+
+    def backfill(self, batch_size: int = 500, organization_id: Optional[int] = None) -> dict:
+        """Populate blind indexes for rows written before they existed.
+
+        Walks orders in id order (keyset), one commit per batch, so it can run
+        against a live database and be resumed. Legacy notification phone_hash
+        values (unkeyed SHA-256) are re-keyed only when they still match the
+        order's current phone; others are left untouched.
+        """
+        stats = {"orders": 0, "notifications": 0}
+        last_id = 0
+        while True:
+            query = self.db.query(Order).filter(
+                Order.id > last_id,
+                or_(
+                    Order.sender_phone_index.is_(None),
+                    and_(Order.recipient_phone_encrypted.isnot(None), Order.recipient_phone_index.is_(None)),
+                ),
+            )
+            if organization_id is not None:
+                query = query.filter(Order.organization_id == organization_id)
+            orders = query.order_by(Order.id).limit(batch_size).all()
+            if not orders:
+                break
+            last_id = orders[-1].id
+
+            by_id = {o.id: o for o in orders}
+            phones: dict[int, dict] = {}
+            for order in orders:
+                sender = _decrypt_or_none(order.sender_phone_encrypted)
+                recipient = _decrypt_or_none(order.recipient_phone_encrypted)
+                phones[order.id] = {"sender": sender, "recipient": recipient}
+                # Undecryptable rows keep NULL (and are revisited on the next run)
+                if sender:
+                    order.sender_phone_index = phone_blind_index(sender)
+                if recipient:
+                    order.recipient_phone_index = phone_blind_index(recipient)
+                stats["orders"] += 1
+
+            legacy = self.db.query(Notification).filter(Notification.order_id.in_(by_id)).all()
+            for notification in legacy:
+                pair = phones[notification.order_id]
+                phone = pair["recipient"] if notification.type == NotificationType.RECIPIENT else pair["sender"]
+                if phone and notification.phone_hash == hash_phone(phone):
+                    notification.phone_hash = phone_blind_index(phone)
+                    stats["notifications"] += 1
+
+            self.db.commit()
+            logger.info(f"Phone index backfill: {stats['orders']} orders, {stats['notifications']} notifications")
+
+        return stats
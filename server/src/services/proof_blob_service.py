@@ -0,0 +1,129 @@
+"""
+Content-addressed proof storage.
+
+Uploads are hashed (SHA-256) before anything is written and stored under
+proofs/sha256/{aa}/{digest}{ext}, once per distinct content. A proof_blobs
+row per digest counts the proofs pointing at the file: acquiring a blob is
+one upsert (ref_count + 1) in the proof's transaction, and only the
+upload that takes the count to 1 writes the file. A repeated upload (a
+retry after a flaky connection, the same photo sent twice) therefore costs
+one local read of the spooled upload and no storage write.
+
+Releasing a blob only decrements the count. Blobs left at zero keep their
+file until scripts/gc_proof_blobs.py deletes row and file together while
+holding the row lock, so a concurrent upload of the same bytes either
+revives the row before the collector sees it or waits for it and then
+writes the file again.
+"""
+
+import logging
+from collections import Counter
+from typing import BinaryIO, Iterable, Optional
+
+from sqlalchemy import delete, select, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from src.models import ProofBlob
+from src.services.proof_variant_service import variant_keys
+from src.services.storage_service import UPLOAD_CHUNK_SIZE, HashingReader, StorageService
+
+logger = logging.getLogger(__name__)
+
+_table = ProofBlob.__table__
+
+
+def hash_upload(file: BinaryIO, max_size: Optional[int] = None) -> tuple[str, int]:
+    """SHA-256 and size of a seekable upload, then rewind it (blocking).
+
+    Raises FileTooLargeError past max_size.
+    """
+    reader = HashingReader(file, max_size=max_size)
+    while reader.read(UPLOAD_CHUNK_SIZE):
+        pass
+    file.seek(0)
+    return reader.sha256, reader.size
+
+
+def blob_key(sha256: str, ext: str) -> str:
+    """Storage key of a blob (ext of the first upload, e.g. ".jpg")."""
+    return f"proofs/sha256/{sha256[:2]}/{sha256}{ext}"
+
+
+def acquire_stmt(dialect: str, sha256: str, file_key: str, file_size: int, mime_type: Optional[str]):
+    """Upsert adding one reference; RETURNING (ref_count, file_key).
+
+    ref_count == 1 means the caller is the only reference and must make sure
+    the file is stored (under the returned key).
+    """
+    if dialect == "postgresql":
+        insert = postgresql.insert
+    elif dialect == "sqlite":
+        insert = sqlite.insert
+    else:
+        raise ValueError(f"UPSERT_UNSUPPORTED: {dialect}")
+    stmt = insert(_table).values(
+        sha256=sha256,
+        file_key=file_key,
+        file_size=file_size,
+        mime_type=mime_type,
+        ref_count=1,
+    )
+    return stmt.on_conflict_do_update(
+        index_elements=["sha256"],
+        set_={"ref_count": _table.c.ref_count + 1},
+    ).returning(_table.c.ref_count, _table.c.file_key)
+
+
+def release_blobs(db: Session, proofs: Iterable[tuple[Optional[str], str]]) -> None:
+    """Drop the references of deleted proofs, given as (sha256, file_path); no commit.
+
+    Proofs stored before content addressing (file_path is not the blob's key)
+    hold no reference and are skipped.
+    """
+    counts = Counter((sha, path) for sha, path in proofs if sha)
+    for (sha, path), n in counts.items():
+        db.execute(
+            update(_table)
+            .where(_table.c.sha256 == sha, _table.c.file_key == path)
+            .values(ref_count=_table.c.ref_count - n)
+        )
+
+
+def collect_garbage(db: Session, storage: Optional[StorageService] = None, batch_size: int = 100) -> int:
+    """Delete unreferenced blobs (rows, files and variants). Returns the number removed.
+
+    Each batch deletes its rows, then the files, then commits; a failed file
+    delete rolls the batch back so it is retried on the next run. Variants
+    are looked up at the current size settings.
+    """
+    storage = storage or StorageService()
+    removed = 0
+    while True:
+        victims = (
+            select(_table.c.sha256)
+            .where(_table.c.ref_count <= 0)
+            .limit(batch_size)
+            .with_for_update(skip_locked=True)
+        )
+        keys = list(db.scalars(
+            delete(_table)
+            .where(_table.c.sha256.in_(victims.scalar_subquery()))
+            .where(_table.c.ref_count <= 0)
+            .returning(_table.c.file_key)
+        ))
+        if not keys:
+            db.rollback()
+            return removed
+        try:
+            for key in keys:
+                for variant in variant_keys(key).values():
+                    storage.delete_file(variant)
+                if storage.file_exists(key) and not storage.delete_file(key):
+                    raise IOError(f"Failed to delete blob {key}")
+        except Exception:
+            db.rollback()
+            raise
+        db.commit()
+        removed += len(keys)
+        logger.info(f"Removed {len(keys)} unreferenced proof blobs")
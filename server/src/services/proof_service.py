@@ -1,35 +1,88 @@
 import os
 import logging
 from typing import Optional, List
-from datetime import datetime
 
-from fastapi import UploadFile, BackgroundTasks
+from fastapi import UploadFile
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
 
-from src.models import Proof, ProofType, OrderStatus
+from src.models import Order, Proof, ProofType, OrderStatus
 from src.core.config import settings
-from src.services.token_service import TokenService
-from src.services.notification_service import NotificationService
+from src.services.token_service import AsyncTokenService, TokenService, invalidate_token_cache
+from src.services.notification_service import NotificationService, build_dual_notification_jobs
+from src.services.proof_blob_service import acquire_stmt, blob_key, hash_upload
+from src.services.proof_snapshot_service import AsyncProofSnapshotService, ProofSnapshotService
+from src.services.proof_variant_service import variants_job
+from src.services.storage_service import FileTooLargeError, StorageService, StoredFile
 
 logger = logging.getLogger(__name__)
 
 
+def _safe_extension(file: UploadFile) -> str:
+    """Image extension for the stored file (never the user-supplied name)."""
+    original = os.path.basename(file.filename or "")
+    _, ext = os.path.splitext(original)
+    ext = (ext or "").lower()
+    allowed = {".jpg", ".jpeg", ".png", ".webp", ".heic", ".heif"}
+    if ext not in allowed:
+        # fallback based on mime
+        if (file.content_type or "").lower() == "image/png":
+            ext = ".png"
+        else:
+            ext = ".jpg"
+    return ext
+
+
+def _hash_upload(file: UploadFile) -> tuple[str, int]:
+    """(SHA-256, size) of the spooled upload; blocking, raises FileTooLargeError."""
+    return hash_upload(file.file, max_size=settings.UPLOAD_MAX_FILE_SIZE)
+
+
+def _store_upload(storage: StorageService, key: str, file: UploadFile) -> StoredFile:
+    """Stream the upload into storage in chunks (SHA-256 + size computed on the fly).
+
+    Blocking; the async service runs it in a threadpool.
+    """
+    try:
+        return storage.save_upload(
+            key,
+            file.file,
+            content_type=file.content_type or "application/octet-stream",
+            max_size=settings.UPLOAD_MAX_FILE_SIZE,
+        )
+    except FileTooLargeError:
+        raise
+    except Exception as e:
+        raise IOError(f"Failed to save file: {e}") from e
+
+
+def _already_uploaded(proof: Proof, proof_type: ProofType, sha256: str) -> Optional[dict]:
+    """Response for a retried upload of the same file (None for a different file)."""
+    if proof.sha256 != sha256:
+        return None
+    return {
+        "status": "success",
+        "proof_id": proof.id,
+        "proof_type": proof_type,
+        "message": f"{proof_type.value} proof already uploaded.",
+    }
+
+
 class ProofService:
     """Service for managing proof uploads."""
 
     def __init__(self, db: Session):
         self.db = db
-        self.upload_dir = settings.LOCAL_UPLOAD_DIR
+        self.storage = StorageService()
         self.token_service = TokenService(db)
         self.notification_service = NotificationService(db)
-        # Ensure the upload directory exists
-        os.makedirs(self.upload_dir, exist_ok=True)
 
     async def create_proof(
         self,
         token: str,
         file: UploadFile,
-        background_tasks: BackgroundTasks,
         proof_type: ProofType = ProofType.AFTER,
     ) -> dict:
         """
@@ -41,6 +94,8 @@ class ProofService:
         if not order:
             raise ValueError("Invalid or expired token.")
 
+        sha256, size = _hash_upload(file)
+
         # Check if same proof_type already exists for this order
         existing_proof = (
             self.db.query(Proof)
@@ -48,38 +103,26 @@ class ProofService:
             .first()
         )
         if existing_proof:
+            retried = _already_uploaded(existing_proof, proof_type, sha256)
+            if retried:
+                return retried
             raise ValueError(f"{proof_type.value} proof already uploaded for this order.")
 
-        # Generate unique & safe filename (avoid user-supplied names)
-        timestamp = datetime.utcnow().strftime("%Y%m%d_%H%M%S")
-        original = os.path.basename(file.filename or "")
-        _, ext = os.path.splitext(original)
-        ext = (ext or "").lower()
-        allowed = {".jpg", ".jpeg", ".png", ".webp", ".heic", ".heif"}
-        if ext not in allowed:
-            # fallback based on mime
-            if (file.content_type or "").lower() == "image/png":
-                ext = ".png"
-            else:
-                ext = ".jpg"
-        safe_filename = f"{order.id}_{proof_type.value}_{timestamp}{ext}"
-        file_path = os.path.join(self.upload_dir, safe_filename)
-
-        # Save file
+        # Stream file to storage unless the same bytes are already there
         try:
-            contents = await file.read()
-            with open(file_path, "wb") as buffer:
-                buffer.write(contents)
-        except Exception as e:
+            file_key = self._acquire_blob(sha256, size, file)
+        except IOError as e:
+            self.db.rollback()
             logger.error(f"Failed to save file for order {order.id}: {e}")
-            raise IOError(f"Failed to save file: {e}") from e
+            raise
 
         # Create proof record
         proof = Proof(
             order_id=order.id,
             proof_type=proof_type,
-            file_path=safe_filename,  # Store relative path
-            file_size=len(contents),
+            file_path=file_key,  # Store storage key (shared by identical uploads)
+            file_size=size,
+            sha256=sha256,
             mime_type=file.content_type,
         )
         self.db.add(proof)
@@ -88,19 +131,18 @@ class ProofService:
         if proof_type == ProofType.AFTER:
             order.status = OrderStatus.PROOF_UPLOADED
             self.token_service.invalidate_token_after_proof(token)
+            # Queued in the same transaction; delivered by the notification worker
+            self.notification_service.enqueue_dual_notification(order)
 
+        self._enqueue_variants(order, proof)
         self.db.commit()
         self.db.refresh(proof)
+        # has_*_proof / proof list changed for every proof type
+        invalidate_token_cache(token)
+        ProofSnapshotService(self.db, self.storage).publish_quietly(token)
 
         logger.info(f"Created {proof_type.value} proof {proof.id} for order {order.id}")
 
-        # Trigger notifications only for AFTER proof (non-blocking)
-        if proof_type == ProofType.AFTER:
-            await self.notification_service.send_dual_notification(
-                order=order,
-                background_tasks=background_tasks,
-            )
-
         return {
             "status": "success",
             "proof_id": proof.id,
@@ -113,7 +155,6 @@ class ProofService:
         order: Order,
         file_key: str,
         proof_type: ProofType,
-        background_tasks: BackgroundTasks,
     ) -> dict:
         """
         Create proof record from a file key (for S3/presigned uploads).
@@ -144,19 +185,17 @@ class ProofService:
             # Get token from order
             if order.qr_token:
                 self.token_service.invalidate_token_after_proof(order.qr_token.token)
+            self.notification_service.enqueue_dual_notification(order)
 
+        self._enqueue_variants(order, proof)
         self.db.commit()
         self.db.refresh(proof)
+        if order.qr_token:
+            invalidate_token_cache(order.qr_token.token)
+            ProofSnapshotService(self.db, self.storage).publish_quietly(order.qr_token.token)
 
         logger.info(f"Created {proof_type.value} proof {proof.id} from key for order {order.id}")
 
-        # Trigger notifications only for AFTER proof (non-blocking)
-        if proof_type == ProofType.AFTER:
-            await self.notification_service.send_dual_notification(
-                order=order,
-                background_tasks=background_tasks,
-            )
-
         return {
             "status": "success",
             "proof_id": proof.id,
@@ -164,6 +203,22 @@ class ProofService:
             "message": f"{proof_type.value} proof uploaded successfully.",
         }
 
+    def _acquire_blob(self, sha256: str, size: int, file: UploadFile) -> str:
+        """Reference the blob for these bytes (no commit), storing it if new; returns its key."""
+        dialect = self.db.get_bind().dialect.name
+        ref_count, file_key = self.db.execute(
+            acquire_stmt(dialect, sha256, blob_key(sha256, _safe_extension(file)), size, file.content_type)
+        ).one()
+        if ref_count == 1:
+            _store_upload(self.storage, file_key, file)
+        return file_key
+
+    def _enqueue_variants(self, order: Order, proof: Proof) -> None:
+        """Queue thumbnail / medium rendering in the proof's transaction."""
+        if settings.PROOF_VARIANTS_ENABLED:
+            self.db.flush()
+            self.db.add(variants_job(order.organization_id, proof.id))
+
     def get_proofs_by_order_id(self, order_id: int) -> List[Proof]:
         """Get all proofs for a specific order."""
         return self.db.query(Proof).filter(Proof.order_id == order_id).all()
@@ -174,3 +229,137 @@ class ProofService:
         if proof_type:
             query = query.filter(Proof.proof_type == proof_type)
         return query.first()
+
+
+class AsyncProofService:
+    """Async (AsyncSession) variant of ProofService for the public router.
+
+    Notifications are written to the outbox in the same transaction as the proof
+    and delivered by the notification worker.
+    """
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+        self.storage = StorageService()
+        self.token_service = AsyncTokenService(db)
+
+    async def _ensure_no_duplicate(self, order_id: int, proof_type: ProofType) -> None:
+        result = await self.db.execute(
+            select(Proof.id)
+            .where(Proof.order_id == order_id, Proof.proof_type == proof_type)
+            .limit(1)
+        )
+        if result.scalar_one_or_none() is not None:
+            raise ValueError(f"{proof_type.value} proof already uploaded for this order.")
+
+    async def _acquire_blob(self, sha256: str, size: int, file: UploadFile) -> str:
+        """Async counterpart of ProofService._acquire_blob."""
+        dialect = self.db.get_bind().dialect.name
+        result = await self.db.execute(
+            acquire_stmt(dialect, sha256, blob_key(sha256, _safe_extension(file)), size, file.content_type)
+        )
+        ref_count, file_key = result.one()
+        if ref_count == 1:
+            # Postgres holds the blob row lock until commit, so concurrent
+            # uploads of the same bytes wait here instead of writing twice
+            await run_in_threadpool(_store_upload, self.storage, file_key, file)
+        return file_key
+
+    async def _finalize(
+        self,
+        qr_token,
+        proof: Proof,
+        proof_type: ProofType,
+    ) -> dict:
+        """Persist proof + state changes (notifications, variants job) in one transaction."""
+        order = qr_token.order
+        self.db.add(proof)
+
+        # Only update status, invalidate token, and send notifications for AFTER proof
+        if proof_type == ProofType.AFTER:
+            order.status = OrderStatus.PROOF_UPLOADED
+            qr_token.is_valid = False
+            self.db.add_all(build_dual_notification_jobs(order))
+
+        if settings.PROOF_VARIANTS_ENABLED:
+            await self.db.flush()
+            self.db.add(variants_job(order.organization_id, proof.id))
+
+        await self.db.commit()
+        invalidate_token_cache(qr_token.token)
+        await AsyncProofSnapshotService(self.db, self.storage).publish_quietly(qr_token.token)
+
+        logger.info(f"Created {proof_type.value} proof {proof.id} for order {order.id}")
+
+        return {
+            "status": "success",
+            "proof_id": proof.id,
+            "proof_type": proof_type,
+            "message": f"{proof_type.value} proof uploaded successfully.",
+        }
+
+    async def create_proof(
+        self,
+        token: str,
+        file: UploadFile,
+        proof_type: ProofType = ProofType.AFTER,
+    ) -> dict:
+        """Async counterpart of ProofService.create_proof."""
+        qr_token = await self.token_service.get_valid_token(token)
+        if not qr_token:
+            raise ValueError("Invalid or expired token.")
+        order = qr_token.order
+
+        # Hash before storing anything (blocking I/O off the event loop)
+        sha256, size = await run_in_threadpool(_hash_upload, file)
+
+        result = await self.db.execute(
+            select(Proof)
+            .where(Proof.order_id == order.id, Proof.proof_type == proof_type)
+            .limit(1)
+        )
+        existing_proof = result.scalar_one_or_none()
+        if existing_proof is not None:
+            retried = _already_uploaded(existing_proof, proof_type, sha256)
+            if retried:
+                return retried
+            raise ValueError(f"{proof_type.value} proof already uploaded for this order.")
+
+        try:
+            file_key = await self._acquire_blob(sha256, size, file)
+        except IOError as e:
+            await self.db.rollback()
+            logger.error(f"Failed to save file for order {order.id}: {e}")
+            raise
+
+        proof = Proof(
+            order_id=order.id,
+            proof_type=proof_type,
+            file_path=file_key,  # Store storage key (shared by identical uploads)
+            file_size=size,
+            sha256=sha256,
+            mime_type=file.content_type,
+        )
+        return await self._finalize(qr_token, proof, proof_type)
+
+    async def create_proof_from_key(
+        self,
+        token: str,
+        file_key: str,
+        proof_type: ProofType,
+    ) -> dict:
+        """Async counterpart of ProofService.create_proof_from_key."""
+        qr_token = await self.token_service.get_valid_token(token)
+        if not qr_token:
+            raise ValueError("Invalid or expired token.")
+
+        await self._ensure_no_duplicate(qr_token.order_id, proof_type)
+
+        proof = Proof(
+            order_id=qr_token.order_id,
+            proof_type=proof_type,
+            file_path=file_key,  # Store storage key
+            file_size=0,  # Size is unknown for presigned uploads
+            mime_type="image/jpeg",  # Default, could be passed from client
+        )
+        return await self._finalize(qr_token, proof, proof_type)
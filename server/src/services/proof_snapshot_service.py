@@ -0,0 +1,265 @@
+"""
+Public proof page snapshots.
+
+The /public/proof/{token} payload only changes when a proof is added, the
+order is edited or the organization's branding changes, so it is rendered once and published to
+storage as an immutable JSON object: the key carries a hash of the body and
+the object is stored with a long-lived Cache-Control. The token row points
+at the current object (qr_tokens.proof_snapshot_key); with
+PROOF_SNAPSHOT_REDIRECT the endpoint redirects there, so the CDN / bucket
+absorbs the fan-out after each AlimTalk.
+
+A branding change clears the pointers of the organization in the same
+transaction (the endpoint falls back to building the payload) and queues a
+PROOF_SNAPSHOTS job that republishes them; order edits (PATCH, upsert
+imports) do the same for the edited orders' tokens (republish_later).
+Deleting an order or replacing its token deletes the token's object
+(discard). Publishing after a proof upload is best effort: a failure only
+leaves the previous pointer in place.
+Nothing is published while the storage provider hands out expiring
+(presigned) file URLs: the snapshot would outlive them.
+"""
+
+import hashlib
+import logging
+from typing import Iterable, Optional
+
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+
+from src.core.config import settings
+from src.models import BackgroundJob, JobKind, Order, Proof, QRToken
+from src.schemas import ProofItem, PublicProofResponse
+from src.services.job_service import JobService, refresh_lock
+from src.services.storage_service import StorageService
+from src.services.token_service import (
+    ResolvedToken,
+    TokenService,
+    eager_token_stmt,
+    resolved_snapshot,
+    invalidate_token_cache,
+)
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_CONTENT_TYPE = "application/json"
+SNAPSHOT_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+
+def public_proof_response(resolved: Optional[ResolvedToken]) -> Optional[PublicProofResponse]:
+    """Public proof page body for a resolved token (None when there is no proof yet)."""
+    proof_data = TokenService.build_proof_payload(resolved) if resolved else None
+    if not proof_data:
+        return None
+    return PublicProofResponse(
+        order_number=proof_data["order_number"],
+        context=proof_data["context"],
+        organization_name=proof_data["organization_name"],
+        organization_logo=proof_data["organization_logo"],
+        hide_saegim=proof_data.get("hide_saegim", False),
+        asset_meta=proof_data.get("asset_meta"),
+        proofs=[ProofItem(**p) for p in proof_data["proofs"]],
+        # Backward compatibility
+        proof_url=proof_data.get("proof_url"),
+        uploaded_at=proof_data.get("uploaded_at"),
+    )
+
+
+def render_snapshot(resolved: ResolvedToken) -> Optional[tuple[str, bytes]]:
+    """(storage key, JSON body) of a token's snapshot; None without proofs."""
+    response = public_proof_response(resolved)
+    if response is None:
+        return None
+    body = response.model_dump_json().encode()
+    digest = hashlib.sha256(body).hexdigest()[:16]
+    return f"public/proof/{resolved.token}/{digest}.json", body
+
+
+def _fresh_token_stmt(token: str):
+    # The caller's session may still hold the order graph from before its commit
+    return eager_token_stmt(token).execution_options(populate_existing=True)
+
+
+class ProofSnapshotService:
+    """Publish / republish public proof snapshots."""
+
+    def __init__(self, db: Session, storage: Optional[StorageService] = None):
+        self.db = db
+        self.storage = storage
+
+    def publish(self, token: str) -> Optional[str]:
+        """Render and upload one token's snapshot, point the token at it and commit.
+
+        Returns the storage key (None when the order has no proof yet or the
+        provider's file URLs expire).
+        """
+        storage = self.storage or StorageService()
+        if not storage.stable_urls:
+            return None
+        qr_token = self.db.execute(_fresh_token_stmt(token)).unique().scalars().first()
+        if qr_token is None or qr_token.order is None:
+            return None
+        rendered = render_snapshot(resolved_snapshot(qr_token))
+        if rendered is None:
+            return None
+        key, body = rendered
+
+        old_key = qr_token.proof_snapshot_key
+        if key != old_key:
+            storage.save_bytes(key, body, SNAPSHOT_CONTENT_TYPE, cache_control=SNAPSHOT_CACHE_CONTROL)
+            qr_token.proof_snapshot_key = key
+            self.db.commit()
+            if old_key:
+                storage.delete_file(old_key)
+        invalidate_token_cache(token)
+        return key
+
+    def publish_quietly(self, token: str) -> None:
+        """publish() for upload paths: failures are logged, never raised."""
+        if not settings.PROOF_SNAPSHOT_ENABLED:
+            return
+        try:
+            self.publish(token)
+        except Exception as e:
+            self.db.rollback()
+            logger.warning(f"Proof snapshot publish failed for token {token[:8]}...: {e}")
+
+    def unpublish_organization(self, organization_id: int) -> list[tuple[str, str]]:
+        """Clear the snapshot pointers of an organization's tokens (no commit).
+
+        Returns [(token, stale storage key)]; evict the tokens from the
+        resolution cache once the caller has committed.
+        """
+        return self._unpublish(QRToken.order_id.in_(select(Order.id).where(Order.organization_id == organization_id)))
+
+    def unpublish_orders(self, order_ids: list[int]) -> list[tuple[str, str]]:
+        """unpublish_organization for some orders' tokens (no commit)."""
+        if not order_ids:
+            return []
+        return self._unpublish(QRToken.order_id.in_(order_ids))
+
+    def _unpublish(self, token_filter) -> list[tuple[str, str]]:
+        rows = self.db.execute(
+            select(QRToken.id, QRToken.token, QRToken.proof_snapshot_key)
+            .where(token_filter)
+            .where(QRToken.proof_snapshot_key.isnot(None))
+            .with_for_update()
+        ).all()
+        if rows:
+            self.db.execute(
+                update(QRToken)
+                .where(QRToken.id.in_([row.id for row in rows]))
+                .values(proof_snapshot_key=None)
+                .execution_options(synchronize_session="fetch")
+            )
+        return [(row.token, row.proof_snapshot_key) for row in rows]
+
+    def enqueue_republish(
+        self,
+        organization_id: int,
+        stale_keys: list[str],
+        tokens: Optional[list[str]] = None,
+    ) -> BackgroundJob:
+        """Queue a PROOF_SNAPSHOTS job (tokens: only these, default: the whole organization)."""
+        params = {"stale_keys": stale_keys}
+        if tokens is not None:
+            params["tokens"] = tokens
+        return JobService(self.db).enqueue(organization_id, JobKind.PROOF_SNAPSHOTS, params)
+
+    def republish_later(self, organization_id: int, unpublished: list[tuple[str, str]]) -> None:
+        """After the commit of unpublish_*: evict the tokens and queue their republish."""
+        if not unpublished:
+            return
+        for token, _ in unpublished:
+            invalidate_token_cache(token)
+        self.enqueue_republish(
+            organization_id,
+            [key for _, key in unpublished],
+            tokens=[token for token, _ in unpublished],
+        )
+
+    def discard(self, keys: Iterable[Optional[str]]) -> None:
+        """Delete snapshot objects no token points at any more (after the commit).
+
+        Failures are logged: the object is unreferenced either way.
+        """
+        storage = self.storage or StorageService()
+        for key in keys:
+            if not key:
+                continue
+            try:
+                storage.delete_file(key)
+            except Exception as e:
+                logger.warning(f"Proof snapshot delete failed for {key}: {e}")
+
+    def run_republish(self, job: BackgroundJob) -> None:
+        """Republish the job's snapshots (PROOF_SNAPSHOTS job): params tokens, or the whole organization."""
+        params = job.params or {}
+        storage = self.storage or StorageService()
+        for key in params.get("stale_keys", []):
+            storage.delete_file(key)
+
+        stmt = (
+            select(QRToken.token)
+            .join(Order, Order.id == QRToken.order_id)
+            .where(Order.organization_id == job.organization_id)
+            .where(select(Proof.id).where(Proof.order_id == Order.id).exists())
+            .order_by(QRToken.id)
+        )
+        if params.get("tokens") is not None:
+            stmt = stmt.where(QRToken.token.in_(params["tokens"]))
+        tokens = list(self.db.scalars(stmt))
+        job.total_rows = len(tokens)
+        failed = 0
+        for idx, token in enumerate(tokens, start=1):
+            try:
+                self.publish(token)
+            except Exception as e:
+                self.db.rollback()
+                failed += 1
+                logger.warning(f"Proof snapshot republish failed for token {token[:8]}...: {e}")
+            job.processed_rows = idx
+            refresh_lock(self.db, job)
+            self.db.commit()
+        job.result = {"published_count": len(tokens) - failed, "failed_count": failed}
+
+
+class AsyncProofSnapshotService:
+    """Async (AsyncSession) variant of ProofSnapshotService.publish for the public router."""
+
+    def __init__(self, db: AsyncSession, storage: Optional[StorageService] = None):
+        self.db = db
+        self.storage = storage
+
+    async def publish_quietly(self, token: str) -> None:
+        """Publish one token's snapshot after a proof upload; failures are logged."""
+        if not settings.PROOF_SNAPSHOT_ENABLED:
+            return
+        storage = self.storage or StorageService()
+        if not storage.stable_urls:
+            return
+        try:
+            result = await self.db.execute(_fresh_token_stmt(token))
+            qr_token = result.unique().scalars().first()
+            if qr_token is None or qr_token.order is None:
+                return
+            rendered = render_snapshot(resolved_snapshot(qr_token))
+            if rendered is None:
+                return
+            key, body = rendered
+
+            old_key = qr_token.proof_snapshot_key
+            if key != old_key:
+                await run_in_threadpool(
+                    storage.save_bytes, key, body, SNAPSHOT_CONTENT_TYPE, SNAPSHOT_CACHE_CONTROL
+                )
+                qr_token.proof_snapshot_key = key
+                await self.db.commit()
+                if old_key:
+                    await run_in_threadpool(storage.delete_file, old_key)
+            invalidate_token_cache(token)
+        except Exception as e:
+            await self.db.rollback()
+            logger.warning(f"Proof snapshot publish failed for token {token[:8]}...: {e}")
@@ -0,0 +1,171 @@
+"""
+Proof image variants (thumbnail / medium) for the public proof page.
+
+Originals are phone-camera sized. Every proof upload queues a
+PROOF_VARIANTS job in the same transaction; the job worker decodes the
+original once in its process pool (render_variants), writes downscaled
+copies (PROOF_VARIANT_FORMAT, EXIF orientation applied, metadata such as
+GPS stripped) next to it in storage and records their keys in
+proofs.variants. The proof page lists them as thumbnail_url / medium_url;
+proof_url keeps pointing at the original, so clients fall back to it until
+the job has run. Files Pillow cannot decode (e.g. HEIC) are skipped.
+Identical uploads share one original (proof_blob_service), so a proof whose
+file already has variants reuses them without rendering.
+
+Pillow is only needed by the job worker.
+"""
+
+import io
+import logging
+import os
+from concurrent.futures import Executor
+from datetime import datetime, timezone
+from typing import Optional
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from src.core.config import settings
+from src.models import BackgroundJob, JobKind, JobStatus, Proof
+from src.services.proof_snapshot_service import ProofSnapshotService
+from src.services.storage_service import StorageService
+from src.services.token_service import invalidate_token_cache
+
+logger = logging.getLogger(__name__)
+
+VARIANT_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+_FORMATS = {
+    # format -> (Pillow format, extension, content type)
+    "webp": ("WEBP", "webp", "image/webp"),
+    "jpeg": ("JPEG", "jpg", "image/jpeg"),
+}
+
+
+class UnsupportedImageError(Exception):
+    """The original cannot be decoded (unknown format, truncated file)."""
+
+
+def variant_sizes() -> dict[str, int]:
+    """Variant name -> longest edge in pixels."""
+    return {"thumbnail": settings.PROOF_THUMBNAIL_SIZE, "medium": settings.PROOF_MEDIUM_SIZE}
+
+
+def variant_keys(file_path: str) -> dict[str, str]:
+    """Variant name -> storage key for an original, at the current settings."""
+    ext = _FORMATS[settings.PROOF_VARIANT_FORMAT][1]
+    stem = os.path.splitext(file_path)[0]
+    # Size in the key: changing a size setting never reuses a cached URL
+    return {name: f"{stem}.{name}-{size}.{ext}" for name, size in variant_sizes().items()}
+
+
+def render_variants(data: bytes, sizes: dict[str, int], fmt: str, quality: int) -> dict[str, bytes]:
+    """Encode downscaled copies of an image (runs in a worker process).
+
+    Images already smaller than a size are re-encoded, not upscaled.
+    """
+    from PIL import Image, ImageOps, UnidentifiedImageError
+
+    pil_format = _FORMATS[fmt][0]
+    try:
+        image = Image.open(io.BytesIO(data))
+        # JPEG: let the decoder downscale by 1/2..1/8 up front
+        image.draft("RGB", (max(sizes.values()),) * 2)
+        image = ImageOps.exif_transpose(image)
+        image.load()
+    except (UnidentifiedImageError, OSError) as e:
+        raise UnsupportedImageError(str(e)) from e
+    if pil_format == "JPEG" or image.mode not in ("RGB", "RGBA"):
+        image = image.convert("RGBA" if pil_format == "WEBP" and "A" in image.getbands() else "RGB")
+    if pil_format == "WEBP":
+        save_options = {"quality": quality, "method": 4}
+    else:
+        save_options = {"quality": quality, "optimize": True, "progressive": True}
+
+    out: dict[str, bytes] = {}
+    # Largest first so each step downsamples the previous one
+    for name, size in sorted(sizes.items(), key=lambda item: -item[1]):
+        image.thumbnail((size, size), Image.LANCZOS)
+        buf = io.BytesIO()
+        image.save(buf, format=pil_format, **save_options)
+        out[name] = buf.getvalue()
+    return out
+
+
+def variants_job(organization_id: int, proof_id: int) -> BackgroundJob:
+    """PROOF_VARIANTS job for a proof (caller adds it to the proof's transaction)."""
+    return BackgroundJob(
+        organization_id=organization_id,
+        kind=JobKind.PROOF_VARIANTS,
+        status=JobStatus.PENDING,
+        params={"proof_id": proof_id},
+        processed_rows=0,
+        attempts=0,
+    )
+
+
+class ProofVariantService:
+    """Render and store proof variants (job worker side)."""
+
+    def __init__(self, db: Session, storage: Optional[StorageService] = None):
+        self.db = db
+        self.storage = storage
+
+    def run(self, job: BackgroundJob, pool: Optional[Executor] = None) -> None:
+        """Render and store the variants of the job's proof (PROOF_VARIANTS job)."""
+        proof = self.db.get(Proof, (job.params or {}).get("proof_id"))
+        if proof is None:
+            job.result = {"skipped": "PROOF_NOT_FOUND"}
+            return
+
+        storage = self.storage or StorageService()
+        keys = variant_keys(proof.file_path)
+        if proof.sha256:
+            shared = self.db.scalars(
+                select(Proof.variants)
+                .where(Proof.sha256 == proof.sha256, Proof.file_path == proof.file_path)
+                .where(Proof.id != proof.id, Proof.variants.isnot(None))
+            ).all()
+            if keys in shared:
+                proof.variants = keys
+                proof.variants_at = datetime.now(timezone.utc)
+                job.result = {"reused": True}
+                self.db.commit()
+                self._republish(proof, storage)
+                return
+
+        fmt = settings.PROOF_VARIANT_FORMAT
+        content_type = _FORMATS[fmt][2]
+        sizes = variant_sizes()
+
+        with storage.open_file(proof.file_path) as f:
+            data = f.read()
+        args = (data, sizes, fmt, settings.PROOF_VARIANT_QUALITY)
+        try:
+            rendered = pool.submit(render_variants, *args).result() if pool else render_variants(*args)
+        except UnsupportedImageError as e:
+            logger.info(f"Proof {proof.id}: no variants ({e})")
+            job.result = {"skipped": "UNSUPPORTED_IMAGE"}
+            return
+
+        variants = {}
+        for name, body in rendered.items():
+            storage.save_bytes(keys[name], body, content_type, cache_control=VARIANT_CACHE_CONTROL)
+            variants[name] = keys[name]
+
+        proof.variants = variants
+        proof.variants_at = datetime.now(timezone.utc)
+        job.processed_rows = job.total_rows = len(variants)
+        job.result = {
+            "original_size": len(data),
+            "variant_sizes": {name: len(body) for name, body in rendered.items()},
+        }
+        self.db.commit()
+        self._republish(proof, storage)
+
+    def _republish(self, proof: Proof, storage: StorageService) -> None:
+        # The proof page payload changed: evict and republish it
+        token = proof.order.qr_token.token if proof.order and proof.order.qr_token else None
+        if token:
+            invalidate_token_cache(token)
+            ProofSnapshotService(self.db, storage).publish_quietly(token)
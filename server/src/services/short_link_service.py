@@ -1,16 +1,225 @@
-import secrets
-from typing import Optional
+"""
+Short links (/s/{code}) for SMS / AlimTalk.
 
+Codes are a keyed permutation (4-round Feistel network, HMAC-SHA256 rounds
+keyed from ENCRYPTION_KEY) of the order id, encoded in _ALPHABET: distinct
+orders always get distinct codes, so no lookup or retry is needed and links
+can be created in bulk (create_public_proof_links) in the same transaction
+that issues tokens. Consecutive order ids still yield unrelated-looking
+codes.
+
+New codes are always 8 characters: a permutation of the 40-bit id space
+(2**40 codes, more than the 32**7 ~ 2**35 of the random 7-character codes
+issued before), so a guessed code hits a real link about as rarely as
+before. Legacy random codes are 7 or 9 characters and keep working (existing
+links keep their code); none of them can collide with a new code.
+Rotating ENCRYPTION_KEY changes the permutation, which only keeps codes
+unique among codes issued under one key.
+
+Resolution is read-only (unknown codes are mostly rejected by
+short_code_guard without a query, see lookup_guard; misses on codes of
+orders that already exist are not negative-cached, since their link may be
+created any moment): resolved links are kept in an in-process cache
+(SHORT_LINK_CACHE_TTL_SECONDS) and clicks are only counted in memory
+(_click_buffer), then written by run_click_flusher as one batched UPDATE
+every SHORT_LINK_CLICK_FLUSH_SECONDS. Click metrics are best effort: a
+worker that dies loses at most one flush interval of clicks.
+"""
+
+import asyncio
+import hashlib
+import hmac
+import logging
+import threading
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Callable, Optional
+
+from sqlalchemy import bindparam, func, select, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
+from src.core.config import settings
+from src.core.security import short_code_key
+from src.models.order import Order
 from src.models.short_link import ShortLink
+from src.services.lookup_guard import short_code_guard
+from src.utils.ttl_cache import TTLCache
+
+logger = logging.getLogger(__name__)
 
 
 _ALPHABET = "23456789ABCDEFGHJKLMNPQRSTUVWXYZ"  # no ambiguous 0/O/1/I
+_BITS_PER_CHAR = 5  # len(_ALPHABET) == 32
+_FEISTEL_ROUNDS = 4
+
+_CODE_LENGTH = 8
+_CODE_BITS = _CODE_LENGTH * _BITS_PER_CHAR  # permutation domain: order ids below 2**40
+
+
+def _permute(value: int, bits: int) -> int:
+    """Keyed bijection on [0, 2**bits) (balanced Feistel network; bits is even)."""
+    half = bits // 2
+    mask = (1 << half) - 1
+    key = short_code_key()
+    left, right = value >> half, value & mask
+    for round_no in range(_FEISTEL_ROUNDS):
+        digest = hmac.new(key, f"{bits}:{round_no}:{right}".encode(), hashlib.sha256).digest()
+        left, right = right, left ^ (int.from_bytes(digest[:8], "big") & mask)
+    return (left << half) | right
+
+
+def _unpermute(value: int, bits: int) -> int:
+    """Inverse of _permute."""
+    half = bits // 2
+    mask = (1 << half) - 1
+    key = short_code_key()
+    left, right = value >> half, value & mask
+    for round_no in reversed(range(_FEISTEL_ROUNDS)):
+        digest = hmac.new(key, f"{bits}:{round_no}:{left}".encode(), hashlib.sha256).digest()
+        left, right = right ^ (int.from_bytes(digest[:8], "big") & mask), left
+    return (left << half) | right
+
+
+def _encode(value: int, length: int) -> str:
+    chars = []
+    for _ in range(length):
+        chars.append(_ALPHABET[value & 31])
+        value >>= _BITS_PER_CHAR
+    return "".join(reversed(chars))
+
+
+def order_code(order_id: int) -> str:
+    """Short code for an order (unique per order by construction)."""
+    if not 0 <= order_id < (1 << _CODE_BITS):
+        raise ValueError(f"ORDER_ID_OUT_OF_RANGE: {order_id}")
+    return _encode(_permute(order_id, _CODE_BITS), _CODE_LENGTH)
+
+
+def code_order_id(code: str) -> Optional[int]:
+    """Order id an order_code() code was derived from (None for any other string)."""
+    if len(code) != _CODE_LENGTH or any(ch not in _ALPHABET for ch in code):
+        return None
+    value = 0
+    for ch in code:
+        value = (value << _BITS_PER_CHAR) | _ALPHABET.index(ch)
+    return _unpermute(value, _CODE_BITS)
+
+
+@dataclass(frozen=True)
+class ResolvedShortLink:
+    """Immutable short link snapshot (safe to share across sessions/requests)."""
+    id: int
+    code: str
+    target_path: str
+    target_token: str
+
+
+_short_link_cache = TTLCache(
+    max_entries=settings.SHORT_LINK_CACHE_MAX_ENTRIES,
+    ttl_seconds=settings.SHORT_LINK_CACHE_TTL_SECONDS,
+)
+
+
+def invalidate_short_link_cache(code: Optional[str]) -> None:
+    """Drop a code from the resolution cache (call after retargeting a link)."""
+    if code:
+        _short_link_cache.pop(code)
+
+
+def _snapshot(link: ShortLink) -> ResolvedShortLink:
+    return ResolvedShortLink(
+        id=link.id,
+        code=link.code,
+        target_path=link.target_path,
+        target_token=link.target_token,
+    )
+
+
+class ClickBuffer:
+    """Thread-safe in-memory click counters: link id -> (clicks, last click time)."""
+
+    def __init__(self):
+        self._clicks: dict[int, tuple[int, datetime]] = {}
+        self._lock = threading.Lock()
+
+    def record(self, link_id: int, clicks: int = 1, at: Optional[datetime] = None) -> None:
+        at = at or datetime.now(timezone.utc)
+        with self._lock:
+            count, last = self._clicks.get(link_id, (0, at))
+            self._clicks[link_id] = (count + clicks, max(last, at))
 
+    def drain(self) -> dict[int, tuple[int, datetime]]:
+        """Take all pending counters (the buffer starts over empty)."""
+        with self._lock:
+            pending, self._clicks = self._clicks, {}
+        return pending
 
-def _generate_code(length: int = 7) -> str:
-    return "".join(_ALPHABET[secrets.randbelow(len(_ALPHABET))] for _ in range(length))
+    def restore(self, pending: dict[int, tuple[int, datetime]]) -> None:
+        """Merge counters back after a failed flush."""
+        for link_id, (count, at) in pending.items():
+            self.record(link_id, count, at)
+
+    def __len__(self) -> int:
+        return len(self._clicks)
+
+
+_click_buffer = ClickBuffer()
+
+_table = ShortLink.__table__
+_flush_clicks_stmt = (
+    update(_table)
+    .where(_table.c.id == bindparam("link_id"))
+    .values(
+        click_count=_table.c.click_count + bindparam("clicks"),
+        last_clicked_at=bindparam("clicked_at"),
+    )
+)
+
+
+async def flush_clicks(db: AsyncSession) -> int:
+    """Write buffered clicks as one batched UPDATE and commit. Returns links updated.
+
+    On failure the counters go back into the buffer for the next flush.
+    """
+    pending = _click_buffer.drain()
+    if not pending:
+        return 0
+    try:
+        await db.execute(
+            _flush_clicks_stmt,
+            [
+                {"link_id": link_id, "clicks": count, "clicked_at": at}
+                for link_id, (count, at) in pending.items()
+            ],
+        )
+        await db.commit()
+    except Exception:
+        await db.rollback()
+        _click_buffer.restore(pending)
+        raise
+    return len(pending)
+
+
+async def run_click_flusher(session_factory: Callable[[], AsyncSession], interval: float) -> None:
+    """Flush buffered clicks every `interval` seconds until cancelled."""
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            async with session_factory() as db:
+                await flush_clicks(db)
+        except Exception as e:
+            logger.warning(f"Short link click flush failed ({len(_click_buffer)} links pending): {e}")
+
+
+def _insert_for(db: Session):
+    dialect = db.get_bind().dialect.name
+    if dialect == "postgresql":
+        return postgresql.insert
+    if dialect == "sqlite":
+        return sqlite.insert
+    raise ValueError(f"UPSERT_UNSUPPORTED: {dialect}")
 
 
 class ShortLinkService:
@@ -35,41 +244,89 @@ class ShortLinkService:
                 existing.target_token = token
                 self.db.commit()
                 self.db.refresh(existing)
+                invalidate_short_link_cache(existing.code)
             return existing
 
-        # create unique code (retry a few times on collision)
-        for _ in range(12):
-            code = _generate_code(7)
-            if not self.db.query(ShortLink).filter(ShortLink.code == code).first():
-                link = ShortLink(code=code, order_id=order_id, target_token=token, target_path="/p")
-                self.db.add(link)
-                self.db.commit()
-                self.db.refresh(link)
-                return link
-
-        # last resort
-        code = _generate_code(9)
-        link = ShortLink(code=code, order_id=order_id, target_token=token, target_path="/p")
-        self.db.add(link)
+        self.create_public_proof_links({order_id: token})
         self.db.commit()
-        self.db.refresh(link)
-        return link
+        return self.get_existing_for_order(order_id)
+
+    def create_public_proof_links(self, tokens: dict[int, str]) -> None:
+        """Create (or retarget) the links of many orders in one statement; no commit.
+
+        tokens: {order_id: token}. Orders that already have a link keep its code.
+        Returned codes are dropped from the resolution cache right away, so a
+        rolled-back retarget only costs a cache miss.
+        """
+        if not tokens:
+            return
+        insert = _insert_for(self.db)
+        stmt = insert(ShortLink.__table__)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["order_id"],
+            set_={"target_token": stmt.excluded.target_token},
+        )
+        codes = self.db.execute(
+            stmt.returning(ShortLink.__table__.c.code),
+            [
+                {
+                    "code": order_code(order_id),
+                    "order_id": order_id,
+                    "target_token": token,
+                    "target_path": "/p",
+                    "click_count": 0,
+                }
+                for order_id, token in tokens.items()
+            ],
+        )
+
+        for code in codes.scalars():
+            short_code_guard.add(code)
+            invalidate_short_link_cache(code)
 
-    def resolve(self, code: str) -> Optional[ShortLink]:
+    def resolve(self, code: str) -> Optional[ResolvedShortLink]:
+        """Resolve a code (read-only; the click is counted in the buffer)."""
         if not code:
             return None
-        link = self.db.query(ShortLink).filter(ShortLink.code == code).first()
-        if not link:
-            return None
+        resolved = _short_link_cache.get(code)
+        if resolved is None:
+            link = self.db.query(ShortLink).filter(ShortLink.code == code).first()
+            if not link:
+                return None
+            resolved = _snapshot(link)
+            _short_link_cache.set(code, resolved)
+        _click_buffer.record(resolved.id)
+        return resolved
 
-        # best-effort metrics
-        link.click_count = int(link.click_count or 0) + 1
-        # use server timestamp
-        try:
-            from sqlalchemy import func
 
-            link.last_clicked_at = func.now()
-        except Exception:
-            pass
-        self.db.commit()
-        return link
+class AsyncShortLinkService:
+    """Async (AsyncSession) variant of ShortLinkService for the public router."""
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def resolve(self, code: str) -> Optional[ResolvedShortLink]:
+        """Resolve a code (read-only; the click is counted in the buffer)."""
+        if not code:
+            return None
+        resolved = _short_link_cache.get(code)
+        if resolved is None:
+            if not await short_code_guard.may_exist(self.db, code):
+                return None
+            result = await self.db.execute(select(ShortLink).where(ShortLink.code == code))
+            link = result.scalars().first()
+            if not link:
+                await self._record_miss(code)
+                return None
+            resolved = _snapshot(link)
+            _short_link_cache.set(code, resolved)
+        _click_buffer.record(resolved.id)
+        return resolved
+
+    async def _record_miss(self, code: str) -> None:
+        # A code of an existing order may get its link from another worker
+        # any moment: negative-caching it would 404 that link until the TTL.
+        order_id = code_order_id(code)
+        if order_id is not None and order_id <= (await self.db.scalar(select(func.max(Order.id))) or 0):
+            return
+        short_code_guard.record_miss(code)
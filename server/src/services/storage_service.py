@@ -6,10 +6,13 @@ Supports:
 - S3/S3-compatible storage (production)
 """
 
+import io
 import os
 import uuid
 import shutil
+import hashlib
 import logging
+import tempfile
 from abc import ABC, abstractmethod
 from datetime import datetime
 from typing import Optional, BinaryIO
@@ -36,11 +39,55 @@ class StoredFile:
     url: str
     size: int
     content_type: str
+    sha256: Optional[str] = None
+
+
+# Read/write granularity for streamed uploads (peak memory per upload ~= one chunk)
+UPLOAD_CHUNK_SIZE = 256 * 1024
+
+
+class FileTooLargeError(Exception):
+    """Raised while streaming an upload as soon as it exceeds the size cap."""
+
+    def __init__(self, max_size: int):
+        super().__init__(f"File exceeds maximum size of {max_size} bytes")
+        self.max_size = max_size
+
+
+class HashingReader:
+    """File-like wrapper that hashes (SHA-256) and counts bytes as they are read.
+
+    Raises FileTooLargeError as soon as more than max_size bytes have been read,
+    so providers abort mid-stream instead of after buffering the whole file.
+    """
+
+    def __init__(self, raw: BinaryIO, max_size: Optional[int] = None):
+        self._raw = raw
+        self.max_size = max_size
+        self.size = 0
+        self._hasher = hashlib.sha256()
+
+    def read(self, size: int = -1) -> bytes:
+        data = self._raw.read(size)
+        if data:
+            self.size += len(data)
+            if self.max_size is not None and self.size > self.max_size:
+                raise FileTooLargeError(self.max_size)
+            self._hasher.update(data)
+        return data
+
+    @property
+    def sha256(self) -> str:
+        return self._hasher.hexdigest()
 
 
 class StorageProvider(ABC):
     """Abstract storage provider interface."""
 
+    # False when get_file_url() returns expiring (presigned) URLs, which must
+    # not end up in cached or published responses
+    stable_urls: bool = True
+
     @abstractmethod
     def generate_presigned_upload(
         self,
@@ -51,6 +98,22 @@ class StorageProvider(ABC):
         """Generate presigned URL for client-side upload."""
         pass
 
+    @abstractmethod
+    def save_file(
+        self,
+        key: str,
+        file: BinaryIO,
+        content_type: str,
+        cache_control: Optional[str] = None,
+    ) -> StoredFile:
+        """Stream a file-like object into storage (read in chunks)."""
+        pass
+
+    @abstractmethod
+    def open_file(self, key: str) -> BinaryIO:
+        """Open a stored file for reading (seekable; caller closes)."""
+        pass
+
     @abstractmethod
     def get_file_url(self, key: str) -> str:
         """Get public URL for a stored file."""
@@ -95,13 +158,30 @@ class LocalStorageProvider(StorageProvider):
             expires_in=300,
         )
 
-    def save_file(self, key: str, file: BinaryIO, content_type: str) -> StoredFile:
-        """Save file to local storage (used for direct uploads)."""
+    def save_file(
+        self,
+        key: str,
+        file: BinaryIO,
+        content_type: str,
+        cache_control: Optional[str] = None,
+    ) -> StoredFile:
+        """Save file to local storage (used for direct uploads).
+
+        cache_control is ignored: /uploads is served by StaticFiles.
+        """
         file_path = os.path.join(self.upload_dir, key)
         os.makedirs(os.path.dirname(file_path), exist_ok=True)
 
-        with open(file_path, "wb") as f:
-            shutil.copyfileobj(file, f)
+        # Write aside and rename: readers of a shared (content-addressed) key
+        # never see a partial file
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(file_path), prefix=".upload-")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                shutil.copyfileobj(file, f, UPLOAD_CHUNK_SIZE)
+            os.replace(tmp_path, file_path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
 
         size = os.path.getsize(file_path)
 
@@ -112,6 +192,9 @@ class LocalStorageProvider(StorageProvider):
             content_type=content_type,
         )
 
+    def open_file(self, key: str) -> BinaryIO:
+        return open(os.path.join(self.upload_dir, key), "rb")
+
     def get_file_url(self, key: str) -> str:
         return f"{self.base_url}/uploads/{key}"
 
@@ -151,6 +234,7 @@ class S3StorageProvider(StorageProvider):
         self.bucket = bucket
         self.region = region
         self.cdn_url = cdn_url.rstrip("/") if cdn_url else None
+        self.stable_urls = self.cdn_url is not None
         self.presigned_expires = presigned_expires
         self.max_file_size = max_file_size
 
@@ -200,6 +284,46 @@ class S3StorageProvider(StorageProvider):
             expires_in=self.presigned_expires,
         )
 
+    def save_file(
+        self,
+        key: str,
+        file: BinaryIO,
+        content_type: str,
+        cache_control: Optional[str] = None,
+    ) -> StoredFile:
+        """Stream file to S3 (multipart for large bodies; never fully buffered)."""
+        extra_args = {"ContentType": content_type}
+        if cache_control:
+            extra_args["CacheControl"] = cache_control
+        self.s3_client.upload_fileobj(
+            file,
+            self.bucket,
+            key,
+            ExtraArgs=extra_args,
+        )
+        size = getattr(file, "size", None)
+        if size is None:
+            head = self.s3_client.head_object(Bucket=self.bucket, Key=key)
+            size = int(head.get("ContentLength", 0))
+
+        return StoredFile(
+            key=key,
+            url=self.get_file_url(key),
+            size=size,
+            content_type=content_type,
+        )
+
+    def open_file(self, key: str) -> BinaryIO:
+        """Download to a temp file (S3 bodies are not seekable)."""
+        tmp = tempfile.TemporaryFile()
+        try:
+            self.s3_client.download_fileobj(self.bucket, key, tmp)
+        except Exception:
+            tmp.close()
+            raise
+        tmp.seek(0)
+        return tmp
+
     def get_file_url(self, key: str) -> str:
         """Get URL for a stored file (CDN or S3 direct)."""
         if self.cdn_url:
@@ -267,11 +391,53 @@ def get_storage_provider() -> StorageProvider:
     return _storage_provider
 
 
+# Private artifacts (exports, staged imports): never publicly served
+_private_storage_provider: Optional[StorageProvider] = None
+
+
+def get_private_storage_provider() -> StorageProvider:
+    """Storage for files with PII (singleton).
+
+    Local: LOCAL_PRIVATE_DIR, outside the /uploads static mount. S3:
+    S3_PRIVATE_BUCKET (default S3_BUCKET) without the CDN, so get_file_url()
+    only ever returns short-lived presigned URLs.
+    """
+    global _private_storage_provider
+
+    if _private_storage_provider is not None:
+        return _private_storage_provider
+
+    if settings.STORAGE_DRIVER.lower() == "s3":
+        bucket = settings.S3_PRIVATE_BUCKET or settings.S3_BUCKET
+        if not bucket:
+            raise ValueError("S3_BUCKET is required when STORAGE_DRIVER=s3")
+
+        _private_storage_provider = S3StorageProvider(
+            bucket=bucket,
+            region=settings.S3_REGION,
+            access_key=settings.S3_ACCESS_KEY,
+            secret_key=settings.S3_SECRET_KEY,
+            endpoint_url=settings.S3_ENDPOINT_URL,
+            presigned_expires=settings.S3_PRESIGNED_URL_EXPIRES,
+            max_file_size=settings.S3_MAX_FILE_SIZE,
+        )
+    else:
+        _private_storage_provider = LocalStorageProvider(
+            upload_dir=settings.LOCAL_PRIVATE_DIR,
+            base_url=settings.APP_BASE_URL,
+        )
+
+    return _private_storage_provider
+
+
 class StorageService:
-    """High-level storage service for application use."""
+    """High-level storage service for application use.
 
-    def __init__(self):
-        self.provider = get_storage_provider()
+    private=True selects the private provider (exports, staged imports).
+    """
+
+    def __init__(self, private: bool = False):
+        self.provider = get_private_storage_provider() if private else get_storage_provider()
 
     def create_presigned_upload(
         self,
@@ -282,10 +448,54 @@ class StorageService:
         """Create a presigned upload URL for client-side upload."""
         return self.provider.generate_presigned_upload(filename, content_type, folder)
 
+    def save_upload(
+        self,
+        key: str,
+        file: BinaryIO,
+        content_type: str,
+        max_size: Optional[int] = None,
+    ) -> StoredFile:
+        """Stream an upload into storage, hashing and size-checking on the fly.
+
+        Blocking; call from a threadpool on async paths.
+        On FileTooLargeError any partially written object is removed.
+        """
+        reader = HashingReader(file, max_size=max_size)
+        try:
+            stored = self.provider.save_file(key, reader, content_type)
+        except FileTooLargeError:
+            self.provider.delete_file(key)
+            raise
+
+        stored.size = reader.size
+        stored.sha256 = reader.sha256
+        return stored
+
+    def save_bytes(
+        self,
+        key: str,
+        data: bytes,
+        content_type: str,
+        cache_control: Optional[str] = None,
+    ) -> StoredFile:
+        """Store a small in-memory object (blocking)."""
+        stored = self.provider.save_file(key, io.BytesIO(data), content_type, cache_control=cache_control)
+        stored.size = len(data)
+        return stored
+
+    def open_file(self, key: str) -> BinaryIO:
+        """Open a stored file for reading (blocking; caller closes)."""
+        return self.provider.open_file(key)
+
     def get_file_url(self, key: str) -> str:
         """Get the URL for a stored file."""
         return self.provider.get_file_url(key)
 
+    @property
+    def stable_urls(self) -> bool:
+        """True when get_file_url() results do not expire."""
+        return self.provider.stable_urls
+
     def delete_file(self, key: str) -> bool:
         """Delete a file from storage."""
         return self.provider.delete_file(key)
@@ -1,10 +1,134 @@
 import secrets
+from dataclasses import dataclass
+from functools import cached_property
 from datetime import datetime
-from typing import Optional
-from sqlalchemy.orm import Session
+from typing import Iterable, Optional
+from sqlalchemy import delete, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, joinedload
 
 from src.models import QRToken, Order
 from src.core.config import settings
+from src.services.lookup_guard import token_guard
+from src.services.storage_service import StorageService
+from src.utils.http_cache import latest, strong_etag
+from src.utils.ttl_cache import TTLCache
+
+
+# Sort: BEFORE first, then AFTER, then others
+_PROOF_TYPE_ORDER = {"BEFORE": 0, "AFTER": 1, "RECEIPT": 2, "DAMAGE": 3, "OTHER": 4}
+
+
+@dataclass(frozen=True)
+class ResolvedProof:
+    """Immutable proof snapshot (safe to share across sessions/requests)."""
+    id: int
+    proof_type: str
+    file_path: str
+    uploaded_at: Optional[datetime]
+    variants_at: Optional[datetime] = None
+    thumbnail_path: Optional[str] = None
+    medium_path: Optional[str] = None
+
+
+@dataclass(frozen=True)
+class ResolvedToken:
+    """Immutable snapshot of token -> order -> organization -> proofs.
+
+    Built from a single eager-loaded query and kept in the in-process cache,
+    so repeated public scans of the same QR label don't hit the DB.
+    """
+    token: str
+    is_valid: bool
+    order_id: int
+    order_number: str
+    context: Optional[str]
+    asset_meta: Optional[dict]
+    organization_name: str
+    organization_logo: Optional[str]
+    hide_saegim: bool
+    proofs: tuple[ResolvedProof, ...]
+    proof_snapshot_key: Optional[str] = None
+    # Row versions (updated_at, falling back to created_at) for Last-Modified
+    order_updated_at: Optional[datetime] = None
+    organization_updated_at: Optional[datetime] = None
+    revoked_at: Optional[datetime] = None
+
+    def has_proof_type(self, proof_type: str) -> bool:
+        return any(p.proof_type == proof_type for p in self.proofs)
+
+    @cached_property
+    def etag(self) -> str:
+        """Strong ETag over every field the public responses are built from."""
+        return strong_etag(self)
+
+    @cached_property
+    def last_modified(self) -> Optional[datetime]:
+        return latest(
+            self.order_updated_at,
+            self.organization_updated_at,
+            self.revoked_at,
+            *(p.uploaded_at for p in self.proofs),
+            *(p.variants_at for p in self.proofs),
+        )
+
+
+_token_cache = TTLCache(
+    max_entries=settings.TOKEN_CACHE_MAX_ENTRIES,
+    ttl_seconds=settings.TOKEN_CACHE_TTL_SECONDS,
+)
+
+
+def invalidate_token_cache(token: Optional[str]) -> None:
+    """Drop a token from the resolution cache (call after any token/proof write)."""
+    if token:
+        _token_cache.pop(token)
+
+
+def eager_token_stmt(token: str):
+    """Single statement: token -> order -> organization + proofs."""
+    order_path = joinedload(QRToken.order)
+    return (
+        select(QRToken)
+        .options(
+            order_path.joinedload(Order.organization),
+            order_path.joinedload(Order.proofs),
+        )
+        .where(QRToken.token == token)
+    )
+
+
+def resolved_snapshot(qr_token: QRToken) -> ResolvedToken:
+    order = qr_token.order
+    org = order.organization
+    proofs = tuple(
+        ResolvedProof(
+            id=p.id,
+            proof_type=p.proof_type.value,
+            file_path=p.file_path,
+            uploaded_at=p.uploaded_at,
+            variants_at=p.variants_at,
+            thumbnail_path=(p.variants or {}).get("thumbnail"),
+            medium_path=(p.variants or {}).get("medium"),
+        )
+        for p in order.proofs
+    )
+    return ResolvedToken(
+        token=qr_token.token,
+        is_valid=bool(qr_token.is_valid),
+        order_id=order.id,
+        order_number=order.order_number,
+        context=order.context,
+        asset_meta=order.asset_meta,
+        organization_name=(org.brand_name or org.name),
+        organization_logo=(org.brand_logo_url or org.logo_url),
+        hide_saegim=bool(org.hide_saegim),
+        proofs=proofs,
+        proof_snapshot_key=qr_token.proof_snapshot_key,
+        order_updated_at=order.updated_at or order.created_at,
+        organization_updated_at=org.updated_at or org.created_at,
+        revoked_at=qr_token.revoked_at,
+    )
 
 
 class TokenService:
@@ -29,62 +153,128 @@ class TokenService:
         self.db.add(qr_token)
         self.db.commit()
         self.db.refresh(qr_token)
+        token_guard.add(token)
 
         return qr_token
 
+    def create_tokens_for_orders(
+        self,
+        order_ids: list[int],
+        replace_order_ids: Iterable[int] = (),
+    ) -> tuple[dict[int, str], list[tuple[str, Optional[str]]]]:
+        """Issue tokens for many orders: one DELETE (replaced tokens) + one INSERT.
+
+        Does not commit. Returns ({order_id: token}, [(replaced token, its
+        proof snapshot key)]); once the caller has committed, evict the replaced
+        tokens from the resolution cache and delete their snapshots.
+        """
+        replaced: list[tuple[str, Optional[str]]] = []
+        replace_ids = list(replace_order_ids)
+        if replace_ids:
+            replaced = [
+                tuple(row) for row in self.db.execute(
+                    delete(QRToken)
+                    .where(QRToken.order_id.in_(replace_ids))
+                    .returning(QRToken.token, QRToken.proof_snapshot_key)
+                )
+            ]
+
+        tokens: dict[int, str] = {}
+        issued: set[str] = set()
+        for order_id in order_ids:
+            token = self.generate_token()
+            while token in issued:
+                token = self.generate_token()
+            issued.add(token)
+            tokens[order_id] = token
+            token_guard.add(token)
+
+        if tokens:
+            self.db.execute(
+                insert(QRToken),
+                [{"token": token, "order_id": order_id, "is_valid": True} for order_id, token in tokens.items()],
+            )
+        return tokens, replaced
+
     def get_token(self, token: str) -> Optional[QRToken]:
         """Get a QR token by its value."""
         return self.db.query(QRToken).filter(QRToken.token == token).first()
 
+    def get_token_eager(self, token: str) -> Optional[QRToken]:
+        """Get a QR token with order, organization and proofs loaded in one statement."""
+        return self.db.execute(eager_token_stmt(token)).unique().scalars().first()
+
+    def resolve(self, token: str) -> Optional[ResolvedToken]:
+        """Resolve a token to a cached read-only snapshot (public read endpoints).
+
+        Invalid (revoked/used) tokens are cached too, since the public proof page
+        must keep working after the upload token has been consumed.
+        """
+        if not token:
+            return None
+        cached = _token_cache.get(token)
+        if cached is not None:
+            return cached
+
+        qr_token = self.get_token_eager(token)
+        if not qr_token or qr_token.order is None:
+            return None
+
+        resolved = resolved_snapshot(qr_token)
+        _token_cache.set(token, resolved)
+        return resolved
+
     def validate_token(self, token: str) -> bool:
         """Check if a token is valid (exists and not revoked)."""
         qr_token = self.get_token(token)
         return qr_token is not None and qr_token.is_valid
 
     def get_order_by_token(self, token: str) -> Optional[Order]:
-        """Get the order associated with a token."""
-        qr_token = self.get_token(token)
+        """Get the order associated with a token (uncached; used by write paths)."""
+        qr_token = self.get_token_eager(token)
         if qr_token and qr_token.is_valid:
             return qr_token.order
         return None
 
     def get_proof_by_token(self, token: str) -> Optional[dict]:
         """Get proof data by token for public proof page. Returns multiple proofs."""
-        qr_token = self.get_token(token)
-        if not qr_token:
+        resolved = self.resolve(token)
+        if not resolved:
             return None
+        return self.build_proof_payload(resolved)
 
-        order = qr_token.order
-        proofs = order.proofs  # Now a list
-
-        if not proofs:
+    @staticmethod
+    def build_proof_payload(resolved: ResolvedToken) -> Optional[dict]:
+        """Build the public proof page payload from a resolved snapshot."""
+        if not resolved.proofs:
             return None
 
-        # Build proof items list
+        # Build proof items list (URLs from the configured storage provider)
+        storage = StorageService()
         proof_items = []
-        for proof in proofs:
+        for proof in resolved.proofs:
             proof_items.append({
                 "id": proof.id,
-                "proof_type": proof.proof_type.value,
-                "proof_url": f"/uploads/{proof.file_path}",
+                "proof_type": proof.proof_type,
+                "proof_url": storage.get_file_url(proof.file_path),
+                "thumbnail_url": storage.get_file_url(proof.thumbnail_path) if proof.thumbnail_path else None,
+                "medium_url": storage.get_file_url(proof.medium_path) if proof.medium_path else None,
                 "uploaded_at": proof.uploaded_at,
             })
 
-        # Sort: BEFORE first, then AFTER, then others
-        type_order = {"BEFORE": 0, "AFTER": 1, "RECEIPT": 2, "DAMAGE": 3, "OTHER": 4}
-        proof_items.sort(key=lambda p: type_order.get(p["proof_type"], 5))
+        proof_items.sort(key=lambda p: _PROOF_TYPE_ORDER.get(p["proof_type"], 5))
 
         # Backward compatibility: first AFTER proof or first proof
         after_proof = next((p for p in proof_items if p["proof_type"] == "AFTER"), None)
         primary_proof = after_proof or proof_items[0]
 
         return {
-            "order_number": order.order_number,
-            "context": order.context,
-            "organization_name": (order.organization.brand_name or order.organization.name),
-            "organization_logo": (order.organization.brand_logo_url or order.organization.logo_url),
-            "hide_saegim": bool(order.organization.hide_saegim),
-            "asset_meta": order.asset_meta,
+            "order_number": resolved.order_number,
+            "context": resolved.context,
+            "organization_name": resolved.organization_name,
+            "organization_logo": resolved.organization_logo,
+            "hide_saegim": resolved.hide_saegim,
+            "asset_meta": resolved.asset_meta,
             "proofs": proof_items,
             # Backward compatibility
             "proof_url": primary_proof["proof_url"],
@@ -98,6 +288,7 @@ class TokenService:
             qr_token.is_valid = False
             qr_token.revoked_at = datetime.utcnow()
             self.db.commit()
+            invalidate_token_cache(token)
             return True
         return False
 
@@ -107,3 +298,65 @@ class TokenService:
         if qr_token:
             qr_token.is_valid = False
             self.db.commit()
+        invalidate_token_cache(token)
+
+
+class AsyncTokenService:
+    """Async (AsyncSession) variant of TokenService for the public router.
+
+    Only the public-path operations are provided. Relationships are always
+    eager-loaded because lazy loading is not available on AsyncSession.
+    """
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def get_token_eager(self, token: str) -> Optional[QRToken]:
+        """Get a QR token with order, organization and proofs loaded in one statement."""
+        result = await self.db.execute(eager_token_stmt(token))
+        return result.unique().scalars().first()
+
+    async def resolve(self, token: str) -> Optional[ResolvedToken]:
+        """Resolve a token to a cached read-only snapshot (see TokenService.resolve)."""
+        if not token:
+            return None
+        cached = _token_cache.get(token)
+        if cached is not None:
+            return cached
+        if not await token_guard.may_exist(self.db, token):
+            return None
+
+        qr_token = await self.get_token_eager(token)
+        if not qr_token:
+            token_guard.record_miss(token)
+            return None
+        if qr_token.order is None:
+            return None
+
+        resolved = resolved_snapshot(qr_token)
+        _token_cache.set(token, resolved)
+        return resolved
+
+    async def get_valid_token(self, token: str) -> Optional[QRToken]:
+        """Get a valid token with its order graph loaded (uncached; used by write paths)."""
+        if not await token_guard.may_exist(self.db, token):
+            return None
+        qr_token = await self.get_token_eager(token)
+        if qr_token is None:
+            token_guard.record_miss(token)
+        if qr_token and qr_token.is_valid and qr_token.order is not None:
+            return qr_token
+        return None
+
+    async def get_order_by_token(self, token: str) -> Optional[Order]:
+        """Get the order associated with a valid token (uncached)."""
+        qr_token = await self.get_valid_token(token)
+        return qr_token.order if qr_token else None
+
+    async def get_proof_by_token(self, token: str) -> Optional[dict]:
+        """Get proof data by token for public proof page (cached snapshot)."""
+        resolved = await self.resolve(token)
+        if not resolved:
+            return None
+        # Snapshot -> payload is pure; reuse the sync implementation.
+        return TokenService.build_proof_payload(resolved)
@@ -1,3 +1,5 @@
 from .rate_limiter import limiter, get_rate_limit
+from .ttl_cache import TTLCache
+from .cursor import encode_cursor, decode_cursor
 
-__all__ = ["limiter", "get_rate_limit"]
+__all__ = ["limiter", "get_rate_limit", "TTLCache", "encode_cursor", "decode_cursor"]
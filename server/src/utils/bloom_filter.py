@@ -0,0 +1,50 @@
+import hashlib
+import math
+import os
+import threading
+
+
+class BloomFilter:
+    """In-process Bloom filter over strings (no false negatives).
+
+    Sized for `capacity` keys at `error_rate` false positives; past capacity
+    the false positive rate grows, so callers rebuild with a larger capacity.
+    Positions come from one salted BLAKE2b digest (double hashing); the salt
+    is random per instance so outsiders cannot craft colliding keys.
+    """
+
+    def __init__(self, capacity: int, error_rate: float = 0.001):
+        capacity = max(1, capacity)
+        self.capacity = capacity
+        self.num_bits = max(8, math.ceil(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.num_hashes = max(1, round(self.num_bits / capacity * math.log(2)))
+        self._bits = bytearray((self.num_bits + 7) // 8)
+        self._salt = os.urandom(16)
+        self._count = 0
+        self._lock = threading.Lock()
+
+    def _positions(self, key: str) -> list[int]:
+        digest = hashlib.blake2b(key.encode(), digest_size=16, salt=self._salt).digest()
+        h1 = int.from_bytes(digest[:8], "big")
+        h2 = int.from_bytes(digest[8:], "big") | 1
+        return [(h1 + i * h2) % self.num_bits for i in range(self.num_hashes)]
+
+    def add(self, key: str) -> None:
+        positions = self._positions(key)
+        with self._lock:
+            added = False
+            for pos in positions:
+                mask = 1 << (pos & 7)
+                if not self._bits[pos >> 3] & mask:
+                    self._bits[pos >> 3] |= mask
+                    added = True
+            # Re-adding a key (or a false positive) does not count towards capacity
+            if added:
+                self._count += 1
+
+    def __contains__(self, key: str) -> bool:
+        bits = self._bits
+        return all(bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(key))
+
+    def __len__(self) -> int:
+        return self._count
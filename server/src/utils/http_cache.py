@@ -0,0 +1,53 @@
+import hashlib
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Optional
+
+from fastapi import Request
+
+
+def strong_etag(*parts) -> str:
+    """Strong ETag over the values a representation is built from."""
+    digest = hashlib.sha256(repr(parts).encode()).hexdigest()[:32]
+    return f'"{digest}"'
+
+
+def _utc(dt: datetime) -> datetime:
+    # SQLite hands back naive timestamps; they are stored as UTC
+    return dt.replace(tzinfo=timezone.utc) if dt.tzinfo is None else dt.astimezone(timezone.utc)
+
+
+def latest(*timestamps: Optional[datetime]) -> Optional[datetime]:
+    """Most recent of the given timestamps (None when all are missing)."""
+    values = [_utc(t) for t in timestamps if t is not None]
+    return max(values) if values else None
+
+
+def cache_headers(cache_control: str, etag: str, last_modified: Optional[datetime] = None) -> dict[str, str]:
+    headers = {"Cache-Control": cache_control, "ETag": etag}
+    if last_modified is not None:
+        headers["Last-Modified"] = format_datetime(_utc(last_modified).replace(microsecond=0), usegmt=True)
+    return headers
+
+
+def is_not_modified(request: Request, etag: str, last_modified: Optional[datetime] = None) -> bool:
+    """True when the client's cached copy is current (answer 304).
+
+    If-None-Match takes precedence over If-Modified-Since (RFC 9110 13.2.2)
+    and uses the weak comparison.
+    """
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        if if_none_match.strip() == "*":
+            return True
+        tags = {t.strip().removeprefix("W/") for t in if_none_match.split(",")}
+        return etag in tags
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since and last_modified is not None:
+        try:
+            since = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+        return _utc(last_modified).replace(microsecond=0) <= _utc(since)
+    return False
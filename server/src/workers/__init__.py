@@ -0,0 +1,4 @@
+from .notification_worker import NotificationOutboxWorker
+from .job_worker import BackgroundJobWorker
+
+__all__ = ["NotificationOutboxWorker", "BackgroundJobWorker"]
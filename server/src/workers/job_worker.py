@@ -0,0 +1,248 @@
+"""
+Background job worker (order CSV exports and imports, proof snapshots and image variants).
+
+Claims one PENDING job at a time with SELECT ... FOR UPDATE SKIP LOCKED (so
+several worker processes can run side by side) and runs its handler. CPU-bound
+work inside handlers (Fernet encrypts / decrypts, image resizing) is fanned out
+to a process pool owned by the worker. When idle it deletes expired job files
+(JobService.purge_expired_files) about once an hour.
+
+Quick jobs (proof variants / snapshots, which a customer's page is waiting
+on) are claimed before exports and imports. A worker only runs the kinds in
+JOB_WORKER_KINDS (empty = all), so deployments run a dedicated proof worker
+(JOB_WORKER_KINDS=PROOF_VARIANTS,PROOF_SNAPSHOTS) that a long export can
+never hold up.
+
+Usage:
+    cd server
+    python -m src.workers.job_worker
+"""
+
+import logging
+import os
+import socket
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Optional
+
+from sqlalchemy import and_, case, or_
+from sqlalchemy.orm import Session
+
+from src.core.config import settings
+from src.core.database import SessionLocal
+from src.models import BackgroundJob, JobKind, JobStatus
+from src.services.export_service import ExportService, decrypt_pool_size
+from src.services.import_service import ImportService
+from src.services.job_service import LOCK_OWNER_KEY, JobLostError, JobService, refresh_lock
+from src.services.proof_snapshot_service import ProofSnapshotService
+from src.services.proof_variant_service import ProofVariantService
+
+logger = logging.getLogger(__name__)
+
+PURGE_INTERVAL_SECONDS = 3600
+
+# Claimed first: short, and a public proof page is waiting on them
+PRIORITY_KINDS = (JobKind.PROOF_VARIANTS, JobKind.PROOF_SNAPSHOTS)
+
+
+def configured_kinds() -> Optional[list[JobKind]]:
+    """JOB_WORKER_KINDS as JobKinds (None = all kinds)."""
+    names = [name.strip().upper() for name in settings.JOB_WORKER_KINDS.split(",") if name.strip()]
+    return [JobKind(name) for name in names] or None
+
+
+def _run_order_export(db: Session, job: BackgroundJob, pool: Optional[Executor]) -> None:
+    ExportService(db).run_order_export(job, pool=pool)
+
+
+def _run_order_import(db: Session, job: BackgroundJob, pool: Optional[Executor]) -> None:
+    ImportService(db).run_order_import(job, pool=pool)
+
+
+def _run_proof_snapshots(db: Session, job: BackgroundJob, pool: Optional[Executor]) -> None:
+    ProofSnapshotService(db).run_republish(job)
+
+
+def _run_proof_variants(db: Session, job: BackgroundJob, pool: Optional[Executor]) -> None:
+    ProofVariantService(db).run(job, pool=pool)
+
+
+# JobKind -> handler(db, job, pool); handlers set result/file_key, the worker sets status
+JOB_HANDLERS: dict[JobKind, Callable[[Session, BackgroundJob, Optional[Executor]], None]] = {
+    JobKind.ORDER_EXPORT: _run_order_export,
+    JobKind.ORDER_IMPORT: _run_order_import,
+    JobKind.PROOF_SNAPSHOTS: _run_proof_snapshots,
+    JobKind.PROOF_VARIANTS: _run_proof_variants,
+}
+
+
+class BackgroundJobWorker:
+    """Polls background_jobs and runs claimed jobs one at a time."""
+
+    def __init__(
+        self,
+        session_factory: Callable[[], Session] = SessionLocal,
+        poll_interval: Optional[float] = None,
+        lock_timeout: Optional[int] = None,
+        max_attempts: Optional[int] = None,
+        worker_id: Optional[str] = None,
+        pool: Optional[Executor] = None,
+        kinds: Optional[list[JobKind]] = None,
+    ):
+        self.session_factory = session_factory
+        self.poll_interval = poll_interval if poll_interval is not None else settings.JOB_WORKER_POLL_SECONDS
+        self.lock_timeout = lock_timeout or settings.JOB_LOCK_TIMEOUT_SECONDS
+        self.max_attempts = max_attempts or settings.JOB_MAX_ATTEMPTS
+        self.worker_id = worker_id or f"{socket.gethostname()}:{os.getpid()}"
+        self.pool = pool
+        self.kinds = kinds if kinds is not None else configured_kinds()
+        self._stopping = False
+        self._next_purge = 0.0
+
+    def claim(self) -> Optional[int]:
+        """Lock and mark the oldest runnable job as RUNNING. Returns its id."""
+        now = datetime.now(timezone.utc)
+        stale_before = now - timedelta(seconds=self.lock_timeout)
+
+        db = self.session_factory()
+        try:
+            while True:
+                q = db.query(BackgroundJob)
+                if self.kinds:
+                    q = q.filter(BackgroundJob.kind.in_(self.kinds))
+                job = (
+                    q.filter(
+                        or_(
+                            BackgroundJob.status == JobStatus.PENDING,
+                            # Worker died mid-run: take the job over
+                            and_(
+                                BackgroundJob.status == JobStatus.RUNNING,
+                                BackgroundJob.locked_at < stale_before,
+                            ),
+                        )
+                    )
+                    .order_by(
+                        case((BackgroundJob.kind.in_(PRIORITY_KINDS), 0), else_=1),
+                        BackgroundJob.created_at,
+                        BackgroundJob.id,
+                    )
+                    .limit(1)
+                    .with_for_update(skip_locked=True)
+                    .first()
+                )
+                if job is None:
+                    db.commit()
+                    return None
+                if (job.attempts or 0) >= self.max_attempts:
+                    job.status = JobStatus.FAILED
+                    job.error = job.error or "ABANDONED: worker lost the job too many times"
+                    job.finished_at = now
+                    job.locked_at = None
+                    db.commit()
+                    continue
+                job.status = JobStatus.RUNNING
+                job.attempts = (job.attempts or 0) + 1
+                job.locked_at = now
+                job.locked_by = self.worker_id
+                job.started_at = now
+                job.error = None
+                db.commit()
+                return job.id
+        finally:
+            db.close()
+
+    def run_job(self, job_id: int) -> None:
+        db = self.session_factory()
+        try:
+            job = db.query(BackgroundJob).filter(BackgroundJob.id == job_id).first()
+            if job is None or job.status != JobStatus.RUNNING or job.locked_by != self.worker_id:
+                return
+            db.info[LOCK_OWNER_KEY] = self.worker_id
+            handler = JOB_HANDLERS.get(job.kind)
+            error = None
+            try:
+                if handler is None:
+                    raise ValueError(f"UNSUPPORTED_JOB_KIND: {job.kind}")
+                handler(db, job, self.pool)
+            except JobLostError:
+                logger.warning(f"Job {job_id} was taken over by another worker; dropping this run")
+                return
+            except Exception as e:
+                db.rollback()
+                logger.exception(f"Job {job_id} failed: {e}")
+                error = str(e)[:2000]
+            # Only the owner may write the outcome (refresh before touching job fields)
+            try:
+                refresh_lock(db, job)
+            except JobLostError:
+                logger.warning(f"Job {job_id} was taken over by another worker; dropping this run")
+                return
+            if error is None:
+                job.status = JobStatus.DONE
+            else:
+                job.status = JobStatus.FAILED
+                job.error = error
+            job.finished_at = datetime.now(timezone.utc)
+            job.locked_at = None
+            db.commit()
+        finally:
+            db.close()
+
+    def run_once(self) -> bool:
+        """Claim and run one job. Returns True if a job was run."""
+        job_id = self.claim()
+        if job_id is None:
+            return False
+        self.run_job(job_id)
+        return True
+
+    @property
+    def handles_files(self) -> bool:
+        """Runs exports / imports, so it has the private storage mounted."""
+        return not self.kinds or any(kind in self.kinds for kind in (JobKind.ORDER_EXPORT, JobKind.ORDER_IMPORT))
+
+    def purge_expired_files(self) -> None:
+        db = self.session_factory()
+        try:
+            JobService(db).purge_expired_files()
+        finally:
+            db.close()
+
+    def run_forever(self) -> None:
+        owns_pool = self.pool is None
+        if owns_pool:
+            self.pool = ProcessPoolExecutor(max_workers=decrypt_pool_size())
+        kinds = ",".join(kind.value for kind in self.kinds) if self.kinds else "all"
+        logger.info(f"Job worker {self.worker_id} started (kinds={kinds}, decrypt processes={decrypt_pool_size()})")
+        try:
+            while not self._stopping:
+                try:
+                    ran = self.run_once()
+                except Exception as e:
+                    logger.exception(f"Job poll failed: {e}")
+                    ran = False
+                if not ran:
+                    if self.handles_files and time.monotonic() >= self._next_purge:
+                        self._next_purge = time.monotonic() + PURGE_INTERVAL_SECONDS
+                        try:
+                            self.purge_expired_files()
+                        except Exception as e:
+                            logger.exception(f"Job file purge failed: {e}")
+                    time.sleep(self.poll_interval)
+        finally:
+            if owns_pool:
+                self.pool.shutdown()
+                self.pool = None
+
+    def stop(self) -> None:
+        self._stopping = True
+
+
+def main() -> None:
+    logging.basicConfig(level=logging.INFO)
+    BackgroundJobWorker().run_forever()
+
+
+if __name__ == "__main__":
+    main()
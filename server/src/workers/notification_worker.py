@@ -0,0 +1,175 @@
+"""
+Notification outbox worker.
+
+Claims due outbox jobs with SELECT ... FOR UPDATE SKIP LOCKED (so several
+worker processes can run side by side) and delivers them with bounded
+concurrency. AlimTalk jobs are processed one per DB session; SMS jobs of a
+claimed batch are sent together as multi-recipient provider calls.
+
+Usage:
+    cd server
+    python -m src.workers.notification_worker
+"""
+
+import asyncio
+import logging
+import os
+import socket
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Optional
+
+from sqlalchemy import and_, or_
+from sqlalchemy.orm import Session
+
+from src.core.config import settings
+from src.core.database import SessionLocal
+from src.integrations.messaging.factory import close_providers, init_providers
+from src.models import Notification, NotificationChannel, NotificationOutbox, OutboxStatus
+from src.services.notification_service import NotificationService
+
+logger = logging.getLogger(__name__)
+
+
+class NotificationOutboxWorker:
+    """Polls the notification outbox and delivers due jobs."""
+
+    def __init__(
+        self,
+        session_factory: Callable[[], Session] = SessionLocal,
+        concurrency: Optional[int] = None,
+        batch_size: Optional[int] = None,
+        poll_interval: Optional[float] = None,
+        lock_timeout: Optional[int] = None,
+        worker_id: Optional[str] = None,
+    ):
+        self.session_factory = session_factory
+        self.concurrency = concurrency or settings.NOTIFICATION_WORKER_CONCURRENCY
+        self.batch_size = batch_size or settings.NOTIFICATION_WORKER_BATCH_SIZE
+        self.poll_interval = poll_interval if poll_interval is not None else settings.NOTIFICATION_WORKER_POLL_SECONDS
+        self.lock_timeout = lock_timeout or settings.NOTIFICATION_OUTBOX_LOCK_TIMEOUT_SECONDS
+        self.worker_id = worker_id or f"{socket.gethostname()}:{os.getpid()}"
+        self._semaphore = asyncio.Semaphore(self.concurrency)
+        self._stopping = False
+
+    def claim_batch(self) -> list[tuple[int, NotificationChannel]]:
+        """Lock and mark up to batch_size due jobs as PROCESSING. Returns (job id, channel)."""
+        now = datetime.now(timezone.utc)
+        stale_before = now - timedelta(seconds=self.lock_timeout)
+
+        db = self.session_factory()
+        try:
+            jobs = (
+                db.query(NotificationOutbox)
+                .filter(
+                    or_(
+                        and_(
+                            NotificationOutbox.status == OutboxStatus.PENDING,
+                            NotificationOutbox.next_attempt_at <= now,
+                        ),
+                        # Worker died mid-delivery: take the job over
+                        and_(
+                            NotificationOutbox.status == OutboxStatus.PROCESSING,
+                            NotificationOutbox.locked_at < stale_before,
+                        ),
+                    )
+                )
+                .order_by(NotificationOutbox.next_attempt_at, NotificationOutbox.id)
+                .limit(self.batch_size)
+                .with_for_update(skip_locked=True)
+                .all()
+            )
+            for job in jobs:
+                job.status = OutboxStatus.PROCESSING
+                job.locked_at = now
+                job.locked_by = self.worker_id
+                job.attempts = (job.attempts or 0) + 1
+            db.commit()
+            if not jobs:
+                return []
+            return (
+                db.query(NotificationOutbox.id, Notification.channel)
+                .join(Notification, Notification.id == NotificationOutbox.notification_id)
+                .filter(NotificationOutbox.id.in_([job.id for job in jobs]))
+                .order_by(NotificationOutbox.id)
+                .all()
+            )
+        finally:
+            db.close()
+
+    async def _process(self, job_id: int) -> None:
+        async with self._semaphore:
+            db = self.session_factory()
+            try:
+                job = db.query(NotificationOutbox).filter(NotificationOutbox.id == job_id).first()
+                if job is None or job.status != OutboxStatus.PROCESSING or job.locked_by != self.worker_id:
+                    return
+                await NotificationService(db).process_job(job)
+            except Exception as e:
+                # Left PROCESSING; reclaimed after the lock timeout
+                db.rollback()
+                logger.exception(f"Outbox job {job_id} crashed: {e}")
+            finally:
+                db.close()
+
+    async def _process_sms(self, job_ids: list[int]) -> None:
+        """SMS jobs go out as multi-recipient provider calls in one session."""
+        async with self._semaphore:
+            db = self.session_factory()
+            try:
+                jobs = (
+                    db.query(NotificationOutbox)
+                    .filter(
+                        NotificationOutbox.id.in_(job_ids),
+                        NotificationOutbox.status == OutboxStatus.PROCESSING,
+                        NotificationOutbox.locked_by == self.worker_id,
+                    )
+                    .all()
+                )
+                await NotificationService(db).process_sms_batch(jobs)
+            except Exception as e:
+                db.rollback()
+                logger.exception(f"Outbox SMS batch {job_ids} crashed: {e}")
+            finally:
+                db.close()
+
+    async def run_once(self) -> int:
+        """Claim and process one batch. Returns the number of jobs claimed."""
+        claimed = self.claim_batch()
+        sms_ids = [job_id for job_id, channel in claimed if channel == NotificationChannel.SMS]
+        tasks = [self._process(job_id) for job_id, channel in claimed if channel != NotificationChannel.SMS]
+        if sms_ids:
+            tasks.append(self._process_sms(sms_ids))
+        if tasks:
+            await asyncio.gather(*tasks)
+        return len(claimed)
+
+    async def run_forever(self) -> None:
+        logger.info(
+            f"Notification worker {self.worker_id} started "
+            f"(concurrency={self.concurrency}, batch_size={self.batch_size})"
+        )
+        init_providers()
+        try:
+            while not self._stopping:
+                try:
+                    claimed = await self.run_once()
+                except Exception as e:
+                    logger.exception(f"Outbox poll failed: {e}")
+                    claimed = 0
+                # Drain backlog without sleeping; idle otherwise
+                if claimed < self.batch_size:
+                    await asyncio.sleep(self.poll_interval)
+        finally:
+            await close_providers()
+
+    def stop(self) -> None:
+        self._stopping = True
+
+
+def main() -> None:
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(NotificationOutboxWorker().run_forever())
+
+
+if __name__ == "__main__":
+    main()
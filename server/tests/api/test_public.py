@@ -6,7 +6,7 @@ import pytest
 from fastapi.testclient import TestClient
 from sqlalchemy.orm import Session
 
-from src.models import Order, QRToken, ProofType
+from src.models import Order, Proof, QRToken, ProofType
 
 
 class TestGetOrderByToken:
@@ -36,7 +36,7 @@ class TestGetOrderByToken:
         self, client: TestClient, db: Session, test_token: QRToken
     ):
         """Inactive token should return 404."""
-        test_token.is_active = False
+        test_token.is_valid = False
         db.commit()
 
         response = client.get(f"/api/v1/public/order/{test_token.token}")
@@ -48,9 +48,12 @@ class TestGetProof:
     """Tests for GET /api/v1/public/proof/{token}"""
 
     def test_valid_token_returns_proof_data(
-        self, client: TestClient, test_token: QRToken
+        self, client: TestClient, db: Session, test_token: QRToken
     ):
         """Valid token should return proof data."""
+        db.add(Proof(order_id=test_token.order_id, proof_type=ProofType.AFTER, file_path="proof.jpg"))
+        db.commit()
+
         response = client.get(f"/api/v1/public/proof/{test_token.token}")
 
         assert response.status_code == 200
@@ -169,3 +172,33 @@ class TestShortLink:
 
         # FastAPI returns 404 for missing path parameter
         assert response.status_code in [404, 422]
+
+
+class TestConditionalGet:
+    """Tests for ETag / Last-Modified handling on public endpoints"""
+
+    def test_proof_revalidates_with_304(
+        self, client: TestClient, db: Session, test_order: Order
+    ):
+        """Matching If-None-Match / If-Modified-Since should return 304 without a body."""
+        from src.models import Proof
+
+        db.add(QRToken(token="etag-token", order_id=test_order.id, is_valid=True))
+        db.add(Proof(order_id=test_order.id, proof_type=ProofType.AFTER, file_path="a.jpg"))
+        db.commit()
+
+        first = client.get("/api/v1/public/proof/etag-token")
+        assert first.status_code == 200
+        assert first.headers["cache-control"] == "public, max-age=60, must-revalidate"
+
+        by_etag = client.get("/api/v1/public/proof/etag-token", headers={"If-None-Match": first.headers["etag"]})
+        assert by_etag.status_code == 304
+        assert by_etag.content == b""
+
+        by_date = client.get(
+            "/api/v1/public/proof/etag-token", headers={"If-Modified-Since": first.headers["last-modified"]}
+        )
+        assert by_date.status_code == 304
+
+        stale = client.get("/api/v1/public/proof/etag-token", headers={"If-None-Match": '"other"'})
+        assert stale.status_code == 200
@@ -5,7 +5,10 @@ Pytest fixtures for Saegim API tests.
 import os
 import pytest
 from typing import Generator
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker, Session
 from fastapi.testclient import TestClient
 
@@ -13,17 +16,25 @@ from fastapi.testclient import TestClient
 os.environ["APP_ENV"] = "test"
 os.environ["POSTGRES_DB"] = "prooflink_test"
 os.environ["JWT_SECRET"] = "test-jwt-secret-key-at-least-32-chars!"
-os.environ["ENCRYPTION_KEY"] = "test-encryption-key-32-bytes!!!"
+os.environ["ENCRYPTION_KEY"] = "test-encryption-key-32-bytes!!!!"
 os.environ["ADMIN_API_KEY"] = "test-admin-api-key-secure"
 os.environ["MESSAGING_PROVIDER"] = "mock"
 
 from src.api.main import app
-from src.core.database import Base, get_db
+from src.core.database import Base, get_db, get_async_db
 from src.models import Organization, Order, QRToken, Proof, Notification
+from src.services.storage_service import LocalStorageProvider, StorageService
+
+
+@compiles(JSONB, "sqlite")
+def _compile_jsonb_sqlite(type_, compiler, **kw):
+    """SQLite has no JSONB; store those columns as JSON."""
+    return "JSON"
 
 
 # Test database URL (use SQLite for speed)
 TEST_DATABASE_URL = "sqlite:///./test.db"
+TEST_ASYNC_DATABASE_URL = "sqlite+aiosqlite:///./test.db"
 
 # Create test engine
 engine = create_engine(
@@ -31,9 +42,29 @@ engine = create_engine(
     connect_args={"check_same_thread": False}
 )
 
+
+
+@event.listens_for(engine, "connect")
+def _sqlite_connect(dbapi_connection, connection_record):
+    # pysqlite's own transaction handling would let RELEASE of an outermost
+    # SAVEPOINT commit (strict imports rely on savepoints inside one transaction)
+    dbapi_connection.isolation_level = None
+    # Readers must not block the async engine's writers on the same file
+    dbapi_connection.execute("PRAGMA journal_mode=WAL")
+
+
+@event.listens_for(engine, "begin")
+def _sqlite_begin(conn):
+    conn.exec_driver_sql("BEGIN")
+
+
 # Create test session factory
 TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Async engine/session for the public router (same SQLite file)
+async_engine = create_async_engine(TEST_ASYNC_DATABASE_URL)
+TestingAsyncSessionLocal = async_sessionmaker(bind=async_engine, autoflush=False, expire_on_commit=False)
+
 
 def override_get_db():
     """Override database dependency for tests."""
@@ -44,8 +75,15 @@ def override_get_db():
         db.close()
 
 
-# Override the dependency
+async def override_get_async_db():
+    """Override async database dependency for tests."""
+    async with TestingAsyncSessionLocal() as db:
+        yield db
+
+
+# Override the dependencies
 app.dependency_overrides[get_db] = override_get_db
+app.dependency_overrides[get_async_db] = override_get_async_db
 
 
 @pytest.fixture(scope="session", autouse=True)
@@ -78,13 +116,20 @@ def client() -> Generator[TestClient, None, None]:
         yield c
 
 
+@pytest.fixture
+def storage(tmp_path) -> StorageService:
+    """Storage service backed by a per-test local directory."""
+    service = StorageService()
+    service.provider = LocalStorageProvider(upload_dir=str(tmp_path), base_url="http://testserver")
+    return service
+
+
 @pytest.fixture
 def test_organization(db: Session) -> Organization:
     """Create a test organization."""
     org = Organization(
         name="Test Organization",
         brand_name="TestBrand",
-        slug="test-org",
     )
     db.add(org)
     db.commit()
@@ -118,7 +163,7 @@ def test_token(db: Session, test_order: Order) -> QRToken:
     token = QRToken(
         order_id=test_order.id,
         token=secrets.token_urlsafe(12),
-        is_active=True,
+        is_valid=True,
     )
     db.add(token)
     db.commit()
@@ -0,0 +1,104 @@
+"""
+Tests for SQL-aggregated analytics.
+
+Expected values are what the previous per-row Python implementation
+computed for the same dataset.
+"""
+
+from datetime import date, datetime, timedelta
+
+from sqlalchemy.orm import Session
+
+from src.core.security import encrypt_phone
+from src.models import (
+    Notification,
+    NotificationChannel,
+    NotificationStatus,
+    NotificationType,
+    Order,
+    OrderStatus,
+    Organization,
+    Proof,
+    ProofType,
+    QRToken,
+)
+from src.services.admin_service import AdminService
+
+
+def _order(db: Session, org: Organization, number: str, status: OrderStatus, created_at: datetime, proof_after_minutes=None) -> Order:
+    order = Order(
+        organization_id=org.id,
+        order_number=number,
+        sender_name="Sender",
+        sender_phone_encrypted=encrypt_phone("+821012345678"),
+        status=status,
+        created_at=created_at,
+    )
+    db.add(order)
+    db.flush()
+    db.add(QRToken(token=f"ana-{org.id}-{number}", order_id=order.id, created_at=created_at))
+    if proof_after_minutes is not None:
+        db.add(Proof(
+            order_id=order.id,
+            proof_type=ProofType.AFTER,
+            file_path=f"{number}.jpg",
+            uploaded_at=created_at + timedelta(minutes=proof_after_minutes),
+        ))
+    return order
+
+
+def _notification(db: Session, order: Order, channel: NotificationChannel, status: NotificationStatus, created_at: datetime) -> None:
+    db.add(Notification(
+        order_id=order.id,
+        type=NotificationType.SENDER,
+        channel=channel,
+        status=status,
+        phone_hash="x" * 64,
+        created_at=created_at,
+    ))
+
+
+class TestAnalytics:
+    """Tests for AdminService.get_analytics"""
+
+    def test_aggregates_match_per_row_computation(self, db: Session, test_organization: Organization):
+        # Timestamps are UTC; KST = UTC+9
+        o1 = _order(db, test_organization, "A-1", OrderStatus.PROOF_UPLOADED, datetime(2026, 3, 1, 1, 0), 30)  # KST 3/1
+        o2 = _order(db, test_organization, "A-2", OrderStatus.COMPLETED, datetime(2026, 3, 1, 16, 0), 120)  # KST 3/2
+        _order(db, test_organization, "A-3", OrderStatus.TOKEN_ISSUED, datetime(2026, 3, 2, 3, 0))
+        o4 = _order(db, test_organization, "A-4", OrderStatus.NOTIFIED, datetime(2026, 3, 2, 3, 0), 45)
+        _order(db, test_organization, "A-5", OrderStatus.COMPLETED, datetime(2026, 3, 5, 3, 0), 10)  # out of range
+
+        _notification(db, o1, NotificationChannel.ALIMTALK, NotificationStatus.SENT, datetime(2026, 3, 1, 2, 0))
+        _notification(db, o1, NotificationChannel.SMS, NotificationStatus.FAILED, datetime(2026, 3, 1, 2, 0))
+        _notification(db, o2, NotificationChannel.ALIMTALK, NotificationStatus.FALLBACK_SENT, datetime(2026, 3, 1, 18, 30))
+        _notification(db, o4, NotificationChannel.SMS, NotificationStatus.MOCK_SENT, datetime(2026, 3, 2, 4, 0))
+        _notification(db, o4, NotificationChannel.ALIMTALK, NotificationStatus.PENDING, datetime(2026, 3, 2, 4, 0))
+        db.commit()
+
+        result = AdminService(db).get_analytics(test_organization.id, date(2026, 3, 1), date(2026, 3, 3))
+
+        assert (result["total_orders"], result["total_proofs"]) == (4, 3)
+        assert result["proof_completion_rate"] == 0.75
+        assert (result["total_notifications"], result["notification_success_rate"]) == (5, 0.6)
+        assert result["channel_breakdown"] == {"alimtalk_sent": 2, "alimtalk_failed": 0, "sms_sent": 1, "sms_failed": 1}
+        assert result["proof_timing"] == {
+            "avg_minutes": 65.0,
+            "min_minutes": 30.0,
+            "max_minutes": 120.0,
+            "median_minutes": 45.0,
+        }
+        assert result["daily_trends"] == [
+            {"date": "2026-03-01", "orders": 1, "proofs": 1, "notifications_sent": 1, "notifications_failed": 1},
+            {"date": "2026-03-02", "orders": 3, "proofs": 2, "notifications_sent": 2, "notifications_failed": 0},
+            {"date": "2026-03-03", "orders": 0, "proofs": 0, "notifications_sent": 0, "notifications_failed": 0},
+        ]
+
+    def test_even_count_median(self, db: Session, test_organization: Organization):
+        _order(db, test_organization, "M-1", OrderStatus.PROOF_UPLOADED, datetime(2026, 4, 1, 1, 0), 10)
+        _order(db, test_organization, "M-2", OrderStatus.PROOF_UPLOADED, datetime(2026, 4, 1, 1, 0), 20)
+        db.commit()
+
+        result = AdminService(db).get_analytics(test_organization.id, date(2026, 4, 1), date(2026, 4, 1))
+
+        assert result["proof_timing"]["median_minutes"] == 15.0
@@ -0,0 +1,59 @@
+"""
+Tests for the org_daily_stats rollup.
+"""
+
+import io
+
+from sqlalchemy.orm import Session
+
+from src.models import Order, OrderStatus, OrgDailyStats
+from src.services.daily_stats_service import COUNTERS, DailyStatsService
+from src.services.order_import import OrderImporter, iter_csv_rows
+
+
+def _snapshot(db: Session, organization_id: int) -> dict:
+    db.expire_all()
+    rows = db.query(OrgDailyStats).filter(OrgDailyStats.organization_id == organization_id).all()
+    return {row.day: {name: getattr(row, name) for name in COUNTERS} for row in rows}
+
+
+class TestDailyStatsRollup:
+    """Tests for incremental maintenance and rebuild"""
+
+    def test_order_writes_update_rollup(self, db: Session, test_order: Order):
+        """Creating and completing an order should update today's counters."""
+        before = _snapshot(db, test_order.organization_id)
+        [(day, counts)] = before.items()
+        assert counts["orders_created"] >= 1
+
+        test_order.status = OrderStatus.PROOF_UPLOADED
+        db.commit()
+
+        after = _snapshot(db, test_order.organization_id)
+        assert after[day]["orders_completed"] == counts["orders_completed"] + 1
+
+    def test_rebuild_matches_incremental(self, db: Session, test_order: Order):
+        """Rebuilding from raw tables should reproduce the incremental rollup."""
+        incremental = _snapshot(db, test_order.organization_id)
+
+        DailyStatsService(db).rebuild(organization_id=test_order.organization_id)
+        db.commit()
+
+        assert _snapshot(db, test_order.organization_id) == incremental
+
+    def test_strict_import_applies_deltas_at_commit(self, db: Session, test_order: Order):
+        """A strict import leaves the rollup row alone until its final commit."""
+        organization_id = test_order.organization_id
+        [(day, counts)] = _snapshot(db, organization_id).items()
+        seen = []
+
+        def on_batch(result):
+            seen.append(_snapshot(db, organization_id)[day]["orders_created"])
+
+        rows = iter_csv_rows(io.BytesIO(
+            "order_number,sender_name,sender_phone\nDEFER-1,김철수,010-1111-0001\nDEFER-2,김철수,010-1111-0002".encode()
+        ))
+        OrderImporter(db, organization_id, strict=True, batch_size=1, on_batch=on_batch).run(rows)
+
+        assert seen == [counts["orders_created"]] * 2
+        assert _snapshot(db, organization_id)[day]["orders_created"] == counts["orders_created"] + 2
@@ -0,0 +1,72 @@
+"""
+Tests for background order export jobs.
+"""
+
+import csv
+import io
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy.orm import Session
+
+from src.core.config import settings
+from src.models import JobKind, JobStatus, Order
+from src.services.export_service import ExportService
+from src.services.job_service import JobService
+from src.services.storage_service import StorageService
+
+
+class TestOrderExportJob:
+    """Tests for ExportService"""
+
+    def test_export_job_writes_csv_to_storage(self, db: Session, test_order: Order, storage: StorageService, tmp_path):
+        service = ExportService(db, storage=storage)
+        job = service.enqueue_order_export(test_order.organization_id)
+        assert job.kind == JobKind.ORDER_EXPORT
+        assert job.status == JobStatus.PENDING
+
+        service.run_order_export(job, chunk_rows=1)
+        db.commit()
+
+        rows = list(csv.reader(io.StringIO((tmp_path / job.file_key).read_text(encoding="utf-8"))))
+        assert rows[0][0] == "order_id"
+        assert [r[1] for r in rows[1:]] == ["TEST-001"]
+        assert rows[1][5] == "+821012345678"  # decrypted
+        assert job.processed_rows == job.total_rows == 1
+        assert job.result["rows"] == 1
+
+    def test_download_is_authenticated_path(self, db: Session, test_order: Order, storage: StorageService):
+        service = ExportService(db, storage=storage)
+        job = service.enqueue_order_export(test_order.organization_id)
+        service.run_order_export(job)
+        job.status = JobStatus.DONE
+        db.commit()
+
+        assert JobService.to_out(job)["download_url"] == f"/api/v1/admin/jobs/{job.id}/download"
+        f, filename = JobService(db, storage=storage).open_download(job.id, organization_id=test_order.organization_id)
+        with f:
+            assert f.read().decode("utf-8").startswith("order_id")
+        assert filename == job.result["filename"]
+
+        with pytest.raises(HTTPException) as exc:
+            JobService(db, storage=storage).open_download(job.id, organization_id=test_order.organization_id + 1)
+        assert exc.value.status_code == 404
+
+    def test_purge_expired_files(self, db: Session, test_order: Order, storage: StorageService, tmp_path):
+        service = ExportService(db, storage=storage)
+        job = service.enqueue_order_export(test_order.organization_id)
+        service.run_order_export(job)
+        job.status = JobStatus.DONE
+        job.finished_at = datetime.now(timezone.utc) - timedelta(hours=settings.EXPORT_RETENTION_HOURS + 1)
+        db.commit()
+        key = job.file_key
+
+        assert JobService(db, storage=storage).purge_expired_files() >= 1
+        db.refresh(job)
+        assert job.file_key is None
+        assert job.result["expired"] is True
+        assert not (tmp_path / key).exists()
+        with pytest.raises(HTTPException) as exc:
+            JobService(db, storage=storage).open_download(job.id)
+        assert exc.value.status_code == 410
@@ -0,0 +1,97 @@
+"""
+Tests for background order import jobs.
+"""
+
+import io
+
+import pytest
+from sqlalchemy.orm import Session
+
+from src.models import JobKind, JobStatus, Order, Organization
+from src.services.import_service import ImportService
+from src.services.job_service import LOCK_OWNER_KEY, JobLostError, refresh_lock
+from src.services.order_import import ImportAbortedError
+from src.services.storage_service import StorageService
+
+CSV = "\n".join([
+    "order_number,sender_name,sender_phone",
+    "JOB-1,김철수,010-1111-0001",
+    "JOB-2,김철수,",
+    "JOB-3,김철수,010-1111-0003",
+]).encode("utf-8")
+
+
+def _order_numbers(db: Session, organization_id: int) -> list[str]:
+    return sorted(n for (n,) in db.query(Order.order_number).filter(Order.organization_id == organization_id))
+
+
+class TestOrderImportJob:
+    """Tests for ImportService"""
+
+    def test_import_job_reports_progress_and_errors(self, db: Session, test_organization: Organization, storage: StorageService):
+        service = ImportService(db, storage=storage)
+        job = service.enqueue_order_import(test_organization.id, io.BytesIO(CSV), filename="orders.csv")
+        assert job.kind == JobKind.ORDER_IMPORT
+        assert job.status == JobStatus.PENDING
+
+        service.run_order_import(job, batch_size=1)
+        db.commit()
+
+        assert job.processed_rows == job.total_rows == 3
+        assert job.result["created_count"] == 2
+        assert job.result["errors"] == [{"row": 2, "message": "SENDER_PHONE_REQUIRED"}]
+        assert _order_numbers(db, test_organization.id) == ["JOB-1", "JOB-3"]
+        assert not storage.file_exists(job.params["file_key"])  # staged upload removed
+
+    def test_strict_import_job_inserts_nothing(self, db: Session, test_organization: Organization, storage: StorageService):
+        service = ImportService(db, storage=storage)
+        job = service.enqueue_order_import(test_organization.id, io.BytesIO(CSV), filename="orders.csv", strict=True)
+
+        with pytest.raises(ImportAbortedError):
+            service.run_order_import(job, batch_size=1)
+
+        assert job.result["error_count"] == 1
+        assert _order_numbers(db, test_organization.id) == []
+
+    def test_reclaimed_job_resumes_after_committed_rows(self, db: Session, test_organization: Organization, storage: StorageService):
+        service = ImportService(db, storage=storage)
+        job = service.enqueue_order_import(test_organization.id, io.BytesIO(CSV), filename="orders.csv")
+        # State left by a worker that died after committing the first batch
+        job.processed_rows = 1
+        job.result = {"created_count": 1, "error_count": 0, "errors": []}
+        db.commit()
+
+        service.run_order_import(job, batch_size=1)
+        db.commit()
+
+        assert job.result["created_count"] == 2
+        assert job.result["errors"] == [{"row": 2, "message": "SENDER_PHONE_REQUIRED"}]
+        assert _order_numbers(db, test_organization.id) == ["JOB-3"]
+
+    def test_lost_lock_stops_import_and_keeps_upload(self, db: Session, test_organization: Organization, storage: StorageService, tmp_path):
+        service = ImportService(db, storage=storage)
+        job = service.enqueue_order_import(test_organization.id, io.BytesIO(CSV), filename="orders.csv")
+        job.status = JobStatus.RUNNING
+        job.locked_by = "worker-b"  # reclaimed by another worker
+        db.commit()
+
+        db.info[LOCK_OWNER_KEY] = "worker-a"
+        try:
+            with pytest.raises(JobLostError):
+                service.run_order_import(job)
+        finally:
+            del db.info[LOCK_OWNER_KEY]
+
+        db.refresh(job)
+        assert (tmp_path / job.params["file_key"]).exists()  # the new owner still needs it
+        assert job.file_key == job.params["file_key"]
+        assert _order_numbers(db, test_organization.id) == []
+
+        db.info[LOCK_OWNER_KEY] = "worker-b"
+        try:
+            refresh_lock(db, job)
+            db.commit()
+        finally:
+            del db.info[LOCK_OWNER_KEY]
+        db.refresh(job)
+        assert job.locked_at is not None
@@ -0,0 +1,74 @@
+"""
+Tests for the Bloom filter lookup guard.
+"""
+
+import asyncio
+
+from sqlalchemy.orm import Session
+
+from src.core.config import settings
+from src.models import Order, QRToken
+from src.services.lookup_guard import LookupGuard
+from src.utils.bloom_filter import BloomFilter
+from tests.conftest import TestingAsyncSessionLocal
+
+
+class TestLookupGuard:
+    """Tests for LookupGuard"""
+
+    def test_bloom_filter_has_no_false_negatives(self):
+        bloom = BloomFilter(1000, error_rate=0.01)
+        keys = [f"key-{i}" for i in range(1000)]
+        for key in keys:
+            bloom.add(key)
+
+        assert all(key in bloom for key in keys)
+        assert sum(f"other-{i}" in bloom for i in range(1000)) < 50
+
+    async def test_guard_rejects_unknown_and_catches_up(self, db: Session, test_order: Order, monkeypatch):
+        db.add(QRToken(token="guard-known", order_id=test_order.id, is_valid=True))
+        db.commit()
+        guard = LookupGuard("qr_tokens", QRToken.id, QRToken.token)
+        async with TestingAsyncSessionLocal() as adb:
+            await guard.rebuild(adb)
+
+            assert await guard.may_exist(adb, "guard-known")
+            assert not await guard.may_exist(adb, "never-issued")
+
+            # Issued by another worker: visible after the next catch-up
+            other = Order(organization_id=test_order.organization_id, order_number="GUARD-2", sender_name="s", sender_phone_encrypted="x")
+            db.add(other)
+            db.flush()
+            db.add(QRToken(token="other-worker", order_id=other.id, is_valid=True))
+            db.commit()
+            monkeypatch.setattr(settings, "LOOKUP_GUARD_SYNC_SECONDS", 0.0)
+            assert await guard.may_exist(adb, "other-worker")
+
+            guard.record_miss("ghost")
+            assert not await guard.may_exist(adb, "ghost")
+
+    async def test_throttled_misses_share_one_catch_up(self, db: Session, test_order: Order, monkeypatch):
+        guard = LookupGuard("qr_tokens", QRToken.id, QRToken.token)
+        async with TestingAsyncSessionLocal() as adb:
+            await guard.rebuild(adb)
+
+            # Issued elsewhere right after the last sync: a throttled miss must still find it
+            db.add(QRToken(token="late-issued", order_id=test_order.id, is_valid=True))
+            db.commit()
+            monkeypatch.setattr(settings, "LOOKUP_GUARD_SYNC_SECONDS", 0.2)
+            syncs = []
+            real_sync = guard.sync
+
+            async def counting_sync(session):
+                syncs.append(session)
+                await real_sync(session)
+
+            monkeypatch.setattr(guard, "sync", counting_sync)
+            results = await asyncio.gather(
+                guard.may_exist(adb, "late-issued"),
+                guard.may_exist(adb, "never-issued-1"),
+                guard.may_exist(adb, "never-issued-2"),
+            )
+
+            assert results == [True, False, False]
+            assert len(syncs) == 1
@@ -0,0 +1,53 @@
+"""
+Tests for pooled messaging provider connections.
+"""
+
+import httpx
+import pytest
+
+from src.core.config import settings
+from src.integrations.messaging import factory
+from src.integrations.messaging.kakao_i_connect import KakaoIConnectProvider
+
+
+@pytest.fixture
+def kakao_settings(monkeypatch):
+    monkeypatch.setattr(settings, "MESSAGING_PROVIDER", "kakao")
+    monkeypatch.setattr(settings, "KAKAOI_BASE_URL", "https://kakao.test")
+    monkeypatch.setattr(settings, "KAKAOI_ACCESS_TOKEN", "token")
+    monkeypatch.setattr(factory, "_primary_provider", None)
+    monkeypatch.setattr(factory, "_sms_provider", None)
+
+
+class TestProviderPooling:
+    """Tests for provider singletons and their shared HTTP client"""
+
+    async def test_factory_reuses_provider_until_closed(self, kakao_settings):
+        provider = factory.get_primary_provider()
+        client = provider.client
+        assert factory.get_primary_provider() is provider
+        assert provider.client is client
+
+        await factory.close_providers()
+        assert client.is_closed
+        assert factory.get_primary_provider() is not provider
+
+        await factory.close_providers()
+
+    async def test_sends_share_one_client(self):
+        requests = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            requests.append(request)
+            return httpx.Response(200, json={"request_id": f"r{len(requests)}"})
+
+        client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        provider = KakaoIConnectProvider("https://kakao.test", "token", client=client)
+
+        for phone in ("01011112222", "01033334444"):
+            await provider.send_alimtalk(phone=phone, message="hi", sender_key="key", template_code="tpl")
+
+        assert len(requests) == 2
+        assert provider.client is client
+        await provider.aclose()
+        assert client.is_closed
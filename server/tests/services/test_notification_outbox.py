@@ -0,0 +1,39 @@
+"""
+Tests for the notification outbox (enqueue + worker delivery).
+"""
+
+from sqlalchemy.orm import Session
+
+from src.models import NotificationOutbox, NotificationStatus, Order, OutboxStatus
+from src.services.notification_service import NotificationService
+from src.workers import NotificationOutboxWorker
+from tests.conftest import TestingSessionLocal
+
+
+class TestNotificationOutbox:
+    """Tests for outbox enqueue and worker processing"""
+
+    def test_enqueue_creates_pending_job(self, db: Session, test_order: Order):
+        """Enqueue should only write PENDING rows (no provider call)."""
+        jobs = NotificationService(db).enqueue_dual_notification(test_order)
+        db.commit()
+
+        # Only the sender has a phone on the fixture order
+        assert len(jobs) == 1
+        assert jobs[0].status == OutboxStatus.PENDING
+        assert jobs[0].notification.status == NotificationStatus.PENDING
+
+    async def test_worker_delivers_job(self, db: Session, test_order: Order):
+        """Worker should claim due jobs and mark them delivered."""
+        [job] = NotificationService(db).enqueue_dual_notification(test_order)
+        db.commit()
+
+        worker = NotificationOutboxWorker(session_factory=TestingSessionLocal, worker_id="test")
+        assert await worker.run_once() >= 1
+        assert await worker.run_once() == 0
+
+        db.expire_all()
+        job = db.query(NotificationOutbox).filter(NotificationOutbox.id == job.id).one()
+        assert job.status == OutboxStatus.DONE
+        assert job.attempts == 1
+        assert job.notification.status == NotificationStatus.MOCK_SENT
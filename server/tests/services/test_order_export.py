@@ -0,0 +1,52 @@
+"""
+Tests for the streamed CSV order export.
+"""
+
+import csv
+import io
+from datetime import datetime
+
+from sqlalchemy.orm import Session
+
+from src.core.security import encrypt_phone
+from src.models import Order, OrderStatus, Organization, Proof, ProofType, QRToken
+from src.services.admin_service import AdminService
+
+
+class TestOrderCsvExport:
+    """Tests for AdminService.iter_orders_csv"""
+
+    def test_chunks_rows_and_flags(self, db: Session, test_organization: Organization):
+        orders = []
+        for i in range(5):
+            order = Order(
+                organization_id=test_organization.id,
+                order_number=f"EXP-{i}",
+                sender_name="Sender",
+                sender_phone_encrypted=encrypt_phone("+821012345678"),
+                status=OrderStatus.PROOF_UPLOADED if i == 0 else OrderStatus.TOKEN_ISSUED,
+                created_at=datetime(2026, 2, 1, 0, i),
+            )
+            db.add(order)
+            orders.append(order)
+        db.flush()
+        db.add(QRToken(token=f"exp-{test_organization.id}-0", order_id=orders[0].id))
+        db.add(QRToken(token=f"exp-{test_organization.id}-1", order_id=orders[1].id, is_valid=False))
+        db.add(Proof(order_id=orders[0].id, proof_type=ProofType.AFTER, file_path="exp.jpg"))
+        db.commit()
+
+        service = AdminService(db)
+        chunks = list(service.iter_orders_csv(test_organization.id, chunk_rows=2))
+        assert len(chunks) == 3  # header with rows 1-2, rows 3-4, row 5
+
+        rows = list(csv.reader(io.StringIO("".join(chunks))))
+        assert rows[0] == list(AdminService.EXPORT_HEADER)
+        assert [r[1] for r in rows[1:]] == [f"EXP-{i}" for i in reversed(range(5))]  # newest first
+        by_number = {r[1]: r for r in rows[1:]}
+        assert (by_number["EXP-0"][8], by_number["EXP-0"][9]) == ("Y", "Y")
+        assert (by_number["EXP-1"][8], by_number["EXP-1"][9]) == ("N", "N")  # revoked token
+        assert by_number["EXP-0"][5] == "+821012345678"
+        assert by_number["EXP-0"][10] == "2026-02-01 09:00:00"  # KST
+
+        filtered = service.export_orders_csv(test_organization.id, status="proof_uploaded")
+        assert [r[1] for r in csv.reader(io.StringIO(filtered))][1:] == ["EXP-0"]
@@ -0,0 +1,107 @@
+"""
+Tests for the batched CSV order importer.
+"""
+
+import io
+
+import pytest
+from sqlalchemy.orm import Session
+
+from src.models import Order, Organization
+from src.services.order_import import ENCODING_SAMPLE_BYTES, CsvEncodingError, ImportAbortedError, OrderImporter, iter_csv_rows
+
+
+def _csv(*lines: str, encoding: str = "utf-8") -> io.BytesIO:
+    return io.BytesIO("\n".join(("order_number,sender_name,sender_phone,recipient_phone",) + lines).encode(encoding))
+
+
+class TestOrderImporter:
+    """Tests for OrderImporter"""
+
+    def test_batches_keep_row_errors(self, db: Session, test_organization: Organization):
+        rows = iter_csv_rows(_csv(
+            "IMP-1,김철수,010-1111-0001,010-2222-0001",
+            ",김철수,010-1111-0002,",
+            "IMP-3,김철수,010-1111-0003,",
+        ))
+
+        result = OrderImporter(db, test_organization.id, batch_size=2).run(rows)
+
+        assert result.processed == 3
+        assert result.errors == [{"row": 2, "message": "ORDER_NUMBER_REQUIRED"}]
+        numbers = [o.order_number for o in db.query(Order).filter(Order.id.in_(result.created_ids))]
+        assert sorted(numbers) == ["IMP-1", "IMP-3"]
+
+    def test_strict_rolls_back_everything(self, db: Session, test_organization: Organization):
+        rows = iter_csv_rows(_csv(
+            "STRICT-1,김철수,010-1111-0001,",
+            "STRICT-2,김철수,,",
+        ))
+
+        with pytest.raises(ImportAbortedError) as exc:
+            OrderImporter(db, test_organization.id, strict=True, batch_size=1).run(rows)
+
+        assert exc.value.row == 2
+        assert db.query(Order).filter(Order.order_number.like("STRICT-%")).count() == 0
+
+    def test_strict_batch_failure_names_the_bad_row(self, db: Session, test_organization: Organization):
+        rows = iter_csv_rows(_csv(
+            "SROW-1,김철수,010-1111-0001,",
+            "SROW-2,김철수,010-1111-0002,",
+            "SROW-1,김철수,010-1111-0003,",
+        ))
+
+        with pytest.raises(ImportAbortedError) as exc:
+            OrderImporter(db, test_organization.id, strict=True, batch_size=10).run(rows)
+
+        assert exc.value.row == 3
+        assert db.query(Order).filter(Order.order_number.like("SROW-%")).count() == 0
+
+    def test_cp949_upload(self, db: Session, test_organization: Organization):
+        rows = list(iter_csv_rows(_csv("CP-1,홍길동,01099998888,", encoding="cp949")))
+
+        assert rows[0]["sender_name"] == "홍길동"
+
+    def test_cp949_after_ascii_sample(self):
+        ascii_rows = [f"ASC-{i},Kim,01011110000," for i in range(ENCODING_SAMPLE_BYTES // 20)]
+        rows = list(iter_csv_rows(_csv(*ascii_rows, "CP-2,홍길동,01099998888,", encoding="cp949")))
+
+        assert rows[-1]["sender_name"] == "홍길동"
+        assert len(rows) == len(ascii_rows) + 1
+
+    def test_undecodable_upload_fails_instead_of_replacing(self):
+        data = _csv("U-1,김철수,01011110001,").getvalue() + b"\nU-2,\xff\xfe,01011110002,"
+
+        with pytest.raises(CsvEncodingError):
+            list(iter_csv_rows(io.BytesIO(data)))
+
+    def test_duplicate_order_number_is_row_error(self, db: Session, test_organization: Organization):
+        rows = [{"order_number": "DUP-1", "sender_name": "김철수", "sender_phone": "010-1111-0001"}] * 2
+
+        result = OrderImporter(db, test_organization.id).run(rows)
+
+        assert len(result.created_ids) == 1
+        assert result.errors == [{"row": 2, "message": "DUPLICATE_ORDER_NUMBER"}]
+
+    def test_upsert_rerun_reports_updated_and_unchanged(self, db: Session, test_organization: Organization):
+        first = iter_csv_rows(_csv("UP-1,김철수,010-1111-0001,", "UP-2,김철수,010-1111-0002,"))
+        created = OrderImporter(db, test_organization.id, mode="upsert").run(first).created_ids
+        assert len(created) == 2
+
+        rerun = iter_csv_rows(_csv("UP-1,김철수,010-1111-0001,", "UP-2,김철수,010-1111-0002,010-2222-0002", "UP-3,김철수,010-1111-0003,"))
+        result = OrderImporter(db, test_organization.id, mode="upsert").run(rerun)
+
+        assert len(result.created_ids) == 1
+        assert result.updated_ids == [created[1]]
+        assert result.unchanged == 1
+        assert db.get(Order, created[1]).recipient_phone_index is not None
+
+    def test_skip_mode_leaves_existing_orders(self, db: Session, test_organization: Organization):
+        OrderImporter(db, test_organization.id).run(iter_csv_rows(_csv("SKIP-1,김철수,010-1111-0001,")))
+
+        result = OrderImporter(db, test_organization.id, mode="skip").run(
+            iter_csv_rows(_csv("SKIP-1,홍길동,010-1111-0001,"))
+        )
+
+        assert (result.created_ids, result.updated_ids, result.unchanged) == ([], [], 1)
+        assert db.query(Order).filter(Order.order_number == "SKIP-1").one().sender_name == "김철수"
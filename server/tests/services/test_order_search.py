@@ -0,0 +1,34 @@
+"""
+Tests for the admin order search (q filter).
+"""
+
+from sqlalchemy.orm import Session
+
+from src.core.security import encrypt_phone
+from src.models import Order, Organization
+from src.services.admin_service import AdminService
+
+
+class TestOrderSearch:
+    """Tests for search_orders via list_orders"""
+
+    def test_substring_match_across_columns(self, db: Session, test_organization: Organization):
+        """q matches any searchable column, case-insensitively, with LIKE wildcards taken literally."""
+        for number, context in (("HALL-1", "서울추모공원 장례식장"), ("HALL-2", "100% 생화"), ("HALL-3", None)):
+            db.add(Order(
+                organization_id=test_organization.id,
+                order_number=number,
+                sender_name="Sender",
+                sender_phone_encrypted=encrypt_phone("+821012345678"),
+                context=context,
+            ))
+        db.commit()
+
+        def search(q: str, **kwargs) -> list[str]:
+            page = AdminService(db).list_orders(organization_id=test_organization.id, q=q, limit=100, **kwargs)
+            return [o.order_number for o in page["items"]]
+
+        assert search("추모공원") == ["HALL-1"]
+        assert search("100%") == ["HALL-2"]
+        assert search("hall-3") == ["HALL-3"]
+        assert search("hall-2", sort="relevance")[0] == "HALL-2"
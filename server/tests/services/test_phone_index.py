@@ -0,0 +1,54 @@
+"""
+Tests for phone blind-index lookup and backfill.
+"""
+
+from sqlalchemy.orm import Session
+
+from src.core.security import encrypt_phone, hash_phone
+from src.models import Notification, NotificationChannel, NotificationStatus, NotificationType, Order, Organization
+from src.schemas.order import OrderCreate
+from src.services.admin_service import AdminService
+from src.services.phone_index_service import PhoneIndexService
+
+
+class TestPhoneIndex:
+    """Tests for PhoneIndexService"""
+
+    def test_lookup_matches_any_phone_format(self, db: Session, test_organization: Organization):
+        order = AdminService(db).create_order(
+            OrderCreate(order_number="PHONE-1", sender_name="Sender", sender_phone="010-5555-0101"),
+            test_organization.id,
+        )
+
+        result = PhoneIndexService(db).lookup("+82 10 5555 0101", organization_id=test_organization.id)
+
+        assert [o.id for o in result["orders"]] == [order.id]
+
+    def test_backfill_indexes_legacy_rows(self, db: Session, test_organization: Organization):
+        """Rows written before the index existed become findable after backfill."""
+        phone = "+821055550202"
+        order = Order(
+            organization_id=test_organization.id,
+            order_number="PHONE-LEGACY",
+            sender_name="Sender",
+            sender_phone_encrypted=encrypt_phone(phone),
+        )
+        db.add(order)
+        db.flush()
+        db.add(Notification(
+            order_id=order.id,
+            type=NotificationType.SENDER,
+            channel=NotificationChannel.SMS,
+            status=NotificationStatus.SENT,
+            phone_hash=hash_phone(phone),  # legacy unkeyed digest
+        ))
+        db.commit()
+
+        service = PhoneIndexService(db)
+        assert service.lookup(phone)["orders"] == []
+
+        service.backfill(organization_id=test_organization.id)
+
+        result = service.lookup(phone)
+        assert [o.id for o in result["orders"]] == [order.id]
+        assert len(result["notifications"]) == 1
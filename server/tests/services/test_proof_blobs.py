@@ -0,0 +1,56 @@
+"""
+Tests for content-addressed proof storage.
+"""
+
+import io
+
+import pytest
+from fastapi import UploadFile
+from sqlalchemy.orm import Session
+from starlette.datastructures import Headers
+
+from src.models import Order, Proof, ProofBlob, ProofType, QRToken
+from src.services.admin_service import AdminService
+from src.services.proof_blob_service import collect_garbage
+from src.services.proof_service import ProofService
+from src.services.storage_service import StorageService
+
+
+def _upload(data: bytes, filename: str = "photo.jpg") -> UploadFile:
+    return UploadFile(io.BytesIO(data), filename=filename, headers=Headers({"content-type": "image/jpeg"}))
+
+
+class TestProofBlobs:
+    """Tests for deduplicated proof uploads"""
+
+    async def test_identical_uploads_share_one_file(self, db: Session, test_order: Order, storage: StorageService):
+        db.add(QRToken(token="blob-token", order_id=test_order.id, is_valid=True))
+        db.commit()
+        service = ProofService(db)
+        service.storage = storage
+
+        first = await service.create_proof("blob-token", _upload(b"same bytes"), ProofType.BEFORE)
+        retried = await service.create_proof("blob-token", _upload(b"same bytes"), ProofType.BEFORE)
+        assert retried["proof_id"] == first["proof_id"]
+        with pytest.raises(ValueError):
+            await service.create_proof("blob-token", _upload(b"other bytes"), ProofType.BEFORE)
+
+        await service.create_proof("blob-token", _upload(b"same bytes", "copy.png"), ProofType.DAMAGE)
+        proofs = db.query(Proof).filter(Proof.order_id == test_order.id).all()
+        assert len(proofs) == 2
+        assert proofs[0].file_path == proofs[1].file_path
+        assert proofs[0].file_path.startswith("proofs/sha256/")
+        blob = db.query(ProofBlob).one()
+        assert (blob.ref_count, blob.file_size) == (2, len(b"same bytes"))
+        with storage.open_file(blob.file_key) as f:
+            assert f.read() == b"same bytes"
+
+        AdminService(db).delete_order(test_order.id)
+        db.refresh(blob)
+        assert blob.ref_count == 0
+        assert storage.file_exists(blob.file_key)
+
+        key = blob.file_key
+        assert collect_garbage(db, storage) == 1
+        assert not storage.file_exists(key)
+        assert db.query(ProofBlob).count() == 0
@@ -0,0 +1,126 @@
+"""
+Tests for published public proof snapshots.
+"""
+
+import json
+
+from sqlalchemy.orm import Session
+
+from src.models import BackgroundJob, JobKind, Order, Proof, ProofType, QRToken, ShortLink
+from src.schemas.admin import OrderUpdate, OrganizationUpdate
+from src.services import proof_snapshot_service
+from src.services.admin_service import AdminService
+from src.services.proof_snapshot_service import ProofSnapshotService
+from src.services.short_link_service import ShortLinkService
+from src.services.storage_service import StorageService
+
+
+def _read(storage: StorageService, key: str) -> dict:
+    with storage.open_file(key) as f:
+        return json.load(f)
+
+
+class TestProofSnapshots:
+    """Tests for ProofSnapshotService"""
+
+    def test_publish_and_republish_after_branding_change(self, db: Session, test_order: Order, storage: StorageService):
+        db.add(QRToken(token="snapshot-token", order_id=test_order.id, is_valid=False))
+        db.add(Proof(order_id=test_order.id, proof_type=ProofType.AFTER, file_path="a.jpg"))
+        db.commit()
+
+        service = ProofSnapshotService(db, storage)
+        key = service.publish("snapshot-token")
+        assert key.startswith("public/proof/snapshot-token/")
+        assert _read(storage, key)["organization_name"] == "TestBrand"
+        assert service.publish("snapshot-token") == key  # unchanged body, same object
+
+        AdminService(db).update_organization(test_order.organization_id, OrganizationUpdate(brand_name="NewBrand"))
+        token = db.query(QRToken).filter(QRToken.token == "snapshot-token").one()
+        assert token.proof_snapshot_key is None
+        job = (
+            db.query(BackgroundJob)
+            .filter(BackgroundJob.organization_id == test_order.organization_id)
+            .filter(BackgroundJob.kind == JobKind.PROOF_SNAPSHOTS)
+            .one()
+        )
+
+        service.run_republish(job)
+        db.commit()
+
+        db.refresh(token)
+        assert job.result == {"published_count": 1, "failed_count": 0}
+        assert _read(storage, token.proof_snapshot_key)["organization_name"] == "NewBrand"
+        assert not storage.file_exists(key)
+
+    def test_order_edit_republishes_and_delete_drops_snapshot(self, db: Session, test_order: Order, storage: StorageService, monkeypatch):
+        monkeypatch.setattr(proof_snapshot_service, "StorageService", lambda: storage)
+        db.add(QRToken(token="edit-token", order_id=test_order.id, is_valid=True))
+        db.add(Proof(order_id=test_order.id, proof_type=ProofType.AFTER, file_path="a.jpg"))
+        db.commit()
+        key = ProofSnapshotService(db).publish("edit-token")
+
+        admin = AdminService(db)
+        admin.update_order(test_order.id, OrderUpdate(context="Edited"))
+        token = db.query(QRToken).filter(QRToken.token == "edit-token").one()
+        assert token.proof_snapshot_key is None
+        job = db.query(BackgroundJob).filter(BackgroundJob.organization_id == test_order.organization_id).one()
+        assert (job.kind, job.params["tokens"]) == (JobKind.PROOF_SNAPSHOTS, ["edit-token"])
+
+        ProofSnapshotService(db).run_republish(job)
+        db.commit()
+        db.refresh(token)
+        assert _read(storage, token.proof_snapshot_key)["context"] == "Edited"
+        assert not storage.file_exists(key)
+
+        republished = token.proof_snapshot_key
+        admin.delete_order(test_order.id, scope_org_id=test_order.organization_id)
+        assert not storage.file_exists(republished)
+
+    def test_token_replacement_drops_snapshot(self, db: Session, test_order: Order, storage: StorageService, monkeypatch):
+        monkeypatch.setattr(proof_snapshot_service, "StorageService", lambda: storage)
+        db.add(QRToken(token="replaced-token", order_id=test_order.id, is_valid=True))
+        db.add(Proof(order_id=test_order.id, proof_type=ProofType.AFTER, file_path="a.jpg"))
+        db.commit()
+        key = ProofSnapshotService(db).publish("replaced-token")
+
+        AdminService(db).bulk_generate_tokens([test_order.id], test_order.organization_id, force=True)
+
+        assert not storage.file_exists(key)
+
+    def test_upsert_import_unpublishes_updated_orders(self, db: Session, test_order: Order, storage: StorageService, monkeypatch):
+        monkeypatch.setattr(proof_snapshot_service, "StorageService", lambda: storage)
+        db.add(QRToken(token="upsert-token", order_id=test_order.id, is_valid=True))
+        db.add(Proof(order_id=test_order.id, proof_type=ProofType.AFTER, file_path="a.jpg"))
+        db.commit()
+        ProofSnapshotService(db).publish("upsert-token")
+
+        rows = [{
+            "order_number": test_order.order_number,
+            "context": "Upserted",
+            "sender_name": test_order.sender_name,
+            "sender_phone": "010-1234-5678",
+        }]
+        result = AdminService(db).import_orders_csv(rows, test_order.organization_id, mode="upsert")
+
+        assert result.updated_ids == [test_order.id]
+        token = db.query(QRToken).filter(QRToken.token == "upsert-token").one()
+        assert token.proof_snapshot_key is None
+        job = db.query(BackgroundJob).filter(BackgroundJob.organization_id == test_order.organization_id).one()
+        assert job.params["tokens"] == ["upsert-token"]
+
+    def test_single_reissue_drops_snapshot_and_retargets_link(self, db: Session, test_order: Order, storage: StorageService, monkeypatch):
+        monkeypatch.setattr(proof_snapshot_service, "StorageService", lambda: storage)
+        db.add(QRToken(token="reissued-token", order_id=test_order.id, is_valid=True))
+        db.add(Proof(order_id=test_order.id, proof_type=ProofType.AFTER, file_path="a.jpg"))
+        db.commit()
+        key = ProofSnapshotService(db).publish("reissued-token")
+        ShortLinkService(db).get_or_create_public_proof(test_order.id, "reissued-token")
+
+        result = AdminService(db).issue_token(test_order.id, scope_org_id=test_order.organization_id, force=True)
+
+        assert result["token"] != "reissued-token"
+        assert not storage.file_exists(key)
+        assert db.query(QRToken).filter(QRToken.order_id == test_order.id).one().token == result["token"]
+        link = db.query(ShortLink).filter(ShortLink.order_id == test_order.id).one()
+        db.refresh(link)
+        assert link.target_token == result["token"]
@@ -0,0 +1,95 @@
+"""
+Tests for proof image variants.
+"""
+
+import io
+
+import pytest
+from sqlalchemy.orm import Session
+
+from src.models import BackgroundJob, JobKind, JobStatus, Order, Proof, ProofType, QRToken
+from src.services.admin_service import AdminService
+from src.services.export_service import ExportService
+from src.services.proof_variant_service import ProofVariantService, variants_job
+from src.services.storage_service import StorageService
+from src.services.token_service import TokenService
+from src.workers.job_worker import BackgroundJobWorker
+from tests.conftest import TestingSessionLocal
+
+Image = pytest.importorskip("PIL.Image")
+
+
+def _proof(db: Session, order: Order, storage: StorageService, key: str, data: bytes) -> Proof:
+    storage.save_bytes(key, data, "image/jpeg")
+    proof = Proof(order_id=order.id, proof_type=ProofType.AFTER, file_path=key)
+    db.add(proof)
+    db.commit()
+    return proof
+
+
+class TestProofVariants:
+    """Tests for ProofVariantService"""
+
+    def test_variants_are_downscaled_and_listed(self, db: Session, test_order: Order, storage: StorageService):
+        buf = io.BytesIO()
+        Image.new("RGB", (4000, 3000), "white").save(buf, format="JPEG")
+        db.add(QRToken(token="variant-token", order_id=test_order.id, is_valid=False))
+        proof = _proof(db, test_order, storage, "variant.jpg", buf.getvalue())
+
+        job = variants_job(test_order.organization_id, proof.id)
+        ProofVariantService(db, storage).run(job)
+
+        db.refresh(proof)
+        with storage.open_file(proof.variants["thumbnail"]) as f:
+            thumbnail = Image.open(f)
+            assert (thumbnail.format, max(thumbnail.size)) == ("WEBP", 320)
+        assert job.result["variant_sizes"]["medium"] < job.result["original_size"]
+
+        item = TokenService(db).get_proof_by_token("variant-token")["proofs"][0]
+        assert item["thumbnail_url"] == StorageService().get_file_url(proof.variants["thumbnail"])
+        assert item["proof_url"] == StorageService().get_file_url("variant.jpg")
+
+        detail = AdminService(db).get_order_detail(test_order.id, scope_org_id=test_order.organization_id)
+        assert detail["thumbnail_url"] == item["thumbnail_url"]
+        assert detail["medium_url"] == StorageService().get_file_url(proof.variants["medium"])
+
+    def test_storing_variants_moves_last_modified(self, db: Session, test_order: Order, storage: StorageService):
+        buf = io.BytesIO()
+        Image.new("RGB", (800, 600), "white").save(buf, format="JPEG")
+        db.add(QRToken(token="variant-lm-token", order_id=test_order.id, is_valid=False))
+        proof = _proof(db, test_order, storage, "variant-lm.jpg", buf.getvalue())
+        before = TokenService(db).resolve("variant-lm-token").last_modified
+
+        ProofVariantService(db, storage).run(variants_job(test_order.organization_id, proof.id))
+
+        after = TokenService(db).resolve("variant-lm-token")
+        assert after.proofs[-1].thumbnail_path is not None
+        assert after.last_modified > before
+
+    def test_undecodable_upload_is_skipped(self, db: Session, test_order: Order, storage: StorageService):
+        proof = _proof(db, test_order, storage, "broken.jpg", b"not an image")
+
+        job = variants_job(test_order.organization_id, proof.id)
+        ProofVariantService(db, storage).run(job)
+
+        assert job.result == {"skipped": "UNSUPPORTED_IMAGE"}
+        assert proof.variants is None
+
+    def test_variant_jobs_are_claimed_first_and_by_their_own_worker(self, db: Session, test_order: Order):
+        db.query(BackgroundJob).filter(BackgroundJob.status == JobStatus.PENDING).update({"status": JobStatus.DONE})
+        db.commit()
+        export = ExportService(db).enqueue_order_export(test_order.organization_id)  # queued first
+        job = variants_job(test_order.organization_id, 0)
+        db.add(job)
+        db.commit()
+
+        exports_only = BackgroundJobWorker(TestingSessionLocal, worker_id="exports", kinds=[JobKind.ORDER_EXPORT])
+        proofs_only = BackgroundJobWorker(TestingSessionLocal, worker_id="proofs", kinds=[JobKind.PROOF_VARIANTS])
+        assert not proofs_only.handles_files
+        assert BackgroundJobWorker(TestingSessionLocal, worker_id="any").claim() == job.id
+        db.query(BackgroundJob).filter(BackgroundJob.id == job.id).update({"status": JobStatus.PENDING})
+        db.commit()
+
+        assert exports_only.claim() == export.id
+        assert proofs_only.claim() == job.id
+        assert proofs_only.claim() is None
@@ -0,0 +1,73 @@
+"""
+Tests for reminder candidate selection.
+"""
+
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy.orm import Session
+
+from src.core.security import encrypt_phone
+from src.models import (
+    Notification,
+    NotificationChannel,
+    NotificationOutbox,
+    NotificationStatus,
+    NotificationType,
+    Order,
+    OrderStatus,
+    Organization,
+    QRToken,
+)
+from src.services.admin_service import AdminService
+
+
+def _order(db: Session, org: Organization, number: str, status: OrderStatus, token_age: timedelta, valid: bool = True) -> Order:
+    order = Order(
+        organization_id=org.id,
+        order_number=number,
+        sender_name="Sender",
+        sender_phone_encrypted=encrypt_phone("+821012345678"),
+        status=status,
+    )
+    db.add(order)
+    db.flush()
+    db.add(QRToken(
+        token=f"rem-{org.id}-{number}",
+        order_id=order.id,
+        is_valid=valid,
+        created_at=datetime.now(timezone.utc) - token_age,
+    ))
+    return order
+
+
+class TestReminderCandidates:
+    """Tests for get_pending_reminders / send_reminders"""
+
+    def test_candidates_and_reminder_counts(self, db: Session, test_organization: Organization):
+        old = timedelta(hours=48)
+        fresh = _order(db, test_organization, "R-A", OrderStatus.TOKEN_ISSUED, old)
+        reminded = _order(db, test_organization, "R-B", OrderStatus.TOKEN_ISSUED, old + timedelta(hours=1))
+        _order(db, test_organization, "R-C", OrderStatus.TOKEN_ISSUED, timedelta(hours=1))  # too recent
+        _order(db, test_organization, "R-D", OrderStatus.PROOF_UPLOADED, old)  # already done
+        _order(db, test_organization, "R-E", OrderStatus.TOKEN_ISSUED, old, valid=False)  # revoked
+        db.add(Notification(
+            order_id=reminded.id,
+            type=NotificationType.REMINDER,
+            channel=NotificationChannel.SMS,
+            status=NotificationStatus.SENT,
+            phone_hash="x" * 64,
+        ))
+        db.commit()
+
+        service = AdminService(db)
+        page = service.get_pending_reminders(test_organization.id, hours_since_token=24, limit=1)
+        assert (page["total"], page["total_pages"]) == (2, 2)
+        assert [o["order_id"] for o in page["orders"]] == [reminded.id]  # oldest token first
+        assert page["orders"][0]["reminder_count"] == 1
+        second = service.get_pending_reminders(test_organization.id, hours_since_token=24, page=2, limit=1)
+        assert [(o["order_id"], o["reminder_count"]) for o in second["orders"]] == [(fresh.id, 0)]
+
+        result = service.send_reminders(test_organization.id, hours_since_token=24, max_reminders=1, chunk_size=1)
+        assert (result["total"], result["sent_count"], result["skipped_count"]) == (2, 1, 1)
+        queued = db.query(NotificationOutbox).filter(NotificationOutbox.order_id.in_([fresh.id, reminded.id])).all()
+        assert [job.order_id for job in queued] == [fresh.id]
@@ -0,0 +1,84 @@
+"""
+Tests for permutation-based short-link codes and buffered click counting.
+"""
+
+import pytest
+from sqlalchemy.orm import Session
+
+from src.models import Order, ShortLink
+from src.services.short_link_service import (
+    _ALPHABET,
+    AsyncShortLinkService,
+    ShortLinkService,
+    code_order_id,
+    flush_clicks,
+    order_code,
+)
+from src.services.lookup_guard import short_code_guard
+from tests.conftest import TestingAsyncSessionLocal
+
+
+class TestShortLinkCodes:
+    """Tests for order_code and ShortLinkService"""
+
+    def test_codes_are_distinct_and_never_legacy_length(self):
+        codes = [order_code(i) for i in range(1, 20001)] + [order_code(2**30), order_code(2**40 - 1)]
+
+        assert len(set(codes)) == len(codes)
+        assert {len(c) for c in codes} == {8}  # legacy codes are 6, 7 or 9 chars
+        assert all(ch in _ALPHABET for c in codes for ch in c)
+        with pytest.raises(ValueError):
+            order_code(2**40)
+        assert [code_order_id(order_code(i)) for i in (0, 1, 12345, 2**40 - 1)] == [0, 1, 12345, 2**40 - 1]
+        assert code_order_id("ABC") is None
+
+    def test_bulk_links_retarget_existing(self, db: Session, test_order: Order):
+        service = ShortLinkService(db)
+        link = service.get_or_create_public_proof(test_order.id, "token-one")
+        assert link.code == order_code(test_order.id)
+
+        service.create_public_proof_links({test_order.id: "token-two"})
+        db.commit()
+
+        stored = db.query(ShortLink).filter(ShortLink.order_id == test_order.id).one()
+        assert (stored.code, stored.target_token) == (link.code, "token-two")
+
+    async def test_resolve_is_read_only_until_flush(self, db: Session, test_order: Order):
+        link = ShortLinkService(db).get_or_create_public_proof(test_order.id, "token-one")
+
+        async with TestingAsyncSessionLocal() as adb:
+            for _ in range(3):
+                resolved = await AsyncShortLinkService(adb).resolve(link.code)
+            assert resolved.target_token == "token-one"
+
+            db.refresh(link)
+            assert link.click_count == 0
+
+            await flush_clicks(adb)
+
+        db.commit()  # end the read snapshot taken above
+        db.refresh(link)
+        assert link.click_count == 3
+        assert link.last_clicked_at is not None
+
+    def test_retarget_evicts_cached_link(self, db: Session, test_order: Order):
+        service = ShortLinkService(db)
+        link = service.get_or_create_public_proof(test_order.id, "token-one")
+        assert service.resolve(link.code).target_token == "token-one"
+
+        service.create_public_proof_links({test_order.id: "token-two"})
+        db.commit()
+
+        assert service.resolve(link.code).target_token == "token-two"
+
+    async def test_miss_on_existing_order_code_is_not_negative_cached(self, db: Session, test_order: Order, monkeypatch):
+        recorded = []
+        monkeypatch.setattr(short_code_guard, "record_miss", recorded.append)
+
+        async with TestingAsyncSessionLocal() as adb:
+            service = AsyncShortLinkService(adb)
+            # No link yet, but another worker may create it any moment
+            assert await service.resolve(order_code(test_order.id)) is None
+            assert await service.resolve(order_code(2**40 - 1)) is None
+
+        assert recorded == [order_code(2**40 - 1)]
@@ -0,0 +1,51 @@
+"""
+Tests for batched SENS SMS sends.
+"""
+
+import json
+
+import httpx
+
+from src.integrations.messaging.naver_sens_sms import NaverSensSmsProvider
+from src.integrations.messaging.types import SmsMessage
+
+
+def _provider(requests: list) -> NaverSensSmsProvider:
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(json.loads(request.content))
+        return httpx.Response(202, json={"requestId": "req-1", "statusCode": "202"})
+
+    return NaverSensSmsProvider(
+        base_url="https://sens.test",
+        access_key="ak",
+        secret_key="sk",
+        service_id="svc",
+        from_no="0212345678",
+        client=httpx.AsyncClient(transport=httpx.MockTransport(handler)),
+    )
+
+
+class TestSendSmsBatch:
+    """Tests for NaverSensSmsProvider.send_sms_batch"""
+
+    async def test_single_request_with_content_overrides(self):
+        """One HTTP call; only recipients with non-default text carry content."""
+        requests: list = []
+        provider = _provider(requests)
+
+        results = await provider.send_sms_batch(
+            messages=[
+                SmsMessage(phone="01000000001", content="hello"),
+                SmsMessage(phone="01000000002", content="hello"),
+                SmsMessage(phone="01000000003", content="other"),
+            ]
+        )
+
+        assert len(requests) == 1
+        assert requests[0]["content"] == "hello"
+        assert requests[0]["messages"] == [
+            {"to": "01000000001"},
+            {"to": "01000000002"},
+            {"to": "01000000003", "content": "other"},
+        ]
+        assert [r.request_id for r in results] == ["req-1"] * 3
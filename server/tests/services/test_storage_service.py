@@ -0,0 +1,33 @@
+"""
+Tests for streamed uploads in the storage service.
+"""
+
+import hashlib
+import io
+
+import pytest
+
+from src.services.storage_service import FileTooLargeError, StorageService
+
+
+class TestSaveUpload:
+    """Tests for StorageService.save_upload"""
+
+    def test_records_size_and_sha256(self, storage: StorageService, tmp_path):
+        """Size and SHA-256 should be computed while streaming."""
+        data = b"\x89PNG\r\n\x1a\n" + b"\x01" * 1000
+
+        stored = storage.save_upload("a.png", io.BytesIO(data), "image/png", max_size=10_000)
+
+        assert stored.size == len(data)
+        assert stored.sha256 == hashlib.sha256(data).hexdigest()
+        assert (tmp_path / "a.png").read_bytes() == data
+
+    def test_aborts_and_cleans_up_when_too_large(self, storage: StorageService, tmp_path):
+        """Exceeding the cap should raise and leave no partial file behind."""
+        data = b"\x00" * 2048
+
+        with pytest.raises(FileTooLargeError):
+            storage.save_upload("big.png", io.BytesIO(data), "image/png", max_size=1024)
+
+        assert not (tmp_path / "big.png").exists()
@@ -0,0 +1,71 @@
+"""
+Tests for cached token resolution.
+"""
+
+import secrets
+
+from sqlalchemy.orm import Session
+
+from src.models import Order, OrderStatus, QRToken
+from src.services.admin_service import AdminService
+from src.services.token_service import TokenService, invalidate_token_cache
+
+
+def _make_token(db: Session, order: Order) -> QRToken:
+    qr_token = QRToken(order_id=order.id, token=secrets.token_urlsafe(12), is_valid=True)
+    db.add(qr_token)
+    db.commit()
+    db.refresh(qr_token)
+    return qr_token
+
+
+class TestResolveToken:
+    """Tests for TokenService.resolve"""
+
+    def test_resolve_returns_snapshot(self, db: Session, test_order: Order):
+        """Resolve should return an immutable snapshot with org branding."""
+        qr_token = _make_token(db, test_order)
+
+        resolved = TokenService(db).resolve(qr_token.token)
+
+        assert resolved is not None
+        assert resolved.order_id == test_order.id
+        assert resolved.organization_name == "TestBrand"
+        assert resolved.is_valid is True
+        assert resolved.proofs == ()
+
+    def test_resolve_is_cached_until_invalidated(self, db: Session, test_order: Order):
+        """Second resolve should come from cache; invalidation should refresh it."""
+        qr_token = _make_token(db, test_order)
+        service = TokenService(db)
+
+        first = service.resolve(qr_token.token)
+        assert service.resolve(qr_token.token) is first
+
+        service.invalidate_token_after_proof(qr_token.token)
+
+        refreshed = service.resolve(qr_token.token)
+        assert refreshed is not first
+        assert refreshed.is_valid is False
+
+    def test_unknown_token_is_not_cached(self, db: Session):
+        """Unknown tokens resolve to None."""
+        invalidate_token_cache("does-not-exist")
+        assert TokenService(db).resolve("does-not-exist") is None
+
+
+class TestBulkTokens:
+    """Tests for set-based token issuance"""
+
+    def test_labels_issue_and_force_replace(self, db: Session, test_order: Order):
+        service = AdminService(db)
+        labels = service.get_labels([test_order.id], scope_org_id=test_order.organization_id)
+        token = labels[0]["token"]
+        assert labels[0]["status"] == str(OrderStatus.TOKEN_ISSUED)
+        assert service.get_labels([test_order.id], scope_org_id=test_order.organization_id)[0]["token"] == token
+
+        result = service.bulk_generate_tokens([test_order.id], scope_org_id=test_order.organization_id, force=True)
+
+        new_token = result["results"][0]["token"]
+        assert new_token != token
+        assert db.query(QRToken).filter(QRToken.order_id == test_order.id).one().token == new_token